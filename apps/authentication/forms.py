@@ -91,6 +91,14 @@ class CustomUserCreationForm(UserCreationForm):
         self.fields["password1"].help_text = None
         self.fields["password2"].help_text = None
 
+    def clean_email(self):
+        # A validação de unicidade do ModelForm usa o manager padrão, que não
+        # enxerga usuários excluídos logicamente; o e-mail deles segue em uso
+        email = self.cleaned_data["email"]
+        if UserModel.all_objects.filter(email=email).exists():
+            raise ValidationError("Já existe uma conta com este e-mail.")
+        return email
+
 
 class CustomAuthenticationForm(AuthenticationForm):
     username = forms.EmailField(
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:41
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("auth", "0012_alter_user_first_name_max_length"),
+        ("authentication", "0005_alter_usermodel_role"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="usermodel",
+            name="tb_users_email_36c37c_idx",
+        ),
+    ]
@@ -3,10 +3,10 @@ from django.db import models
 from django.db.models import Field
 from django.utils.translation import gettext_lazy as _
 
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, SoftDeleteManager
 
 
-class UserManager(BaseUserManager):
+class UserManager(SoftDeleteManager, BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         """
         Cria e salva um usuário com o e-mail e senha fornecidos.
@@ -65,7 +65,6 @@ class UserModel(AbstractUser, BaseModel):
 
     class Meta:
         db_table = "tb_users"
-        indexes = [models.Index(fields=["email"])]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.email})"
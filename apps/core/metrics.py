@@ -0,0 +1,120 @@
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+
+# Limites superiores dos intervalos dos histogramas (o último é aberto)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+TIME_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class RequestMetrics:
+    """
+    Medições da requisição em andamento
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def record_query(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+
+# Métricas da requisição atual, lidas pela instrumentação dos templates
+current_request_metrics: ContextVar[RequestMetrics | None] = ContextVar(
+    "current_request_metrics", default=None
+)
+
+
+class Histogram:
+    def __init__(self, bounds: tuple):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.maximum = max(self.maximum, value)
+
+    def quantile(self, q: float):
+        """
+        Limite superior do intervalo que contém o quantil `q` (estimativa)
+        """
+        target = q * sum(self.counts)
+        seen = 0
+        for bound, count in zip((*self.bounds, self.maximum), self.counts):
+            seen += count
+            if count and seen >= target:
+                return bound
+        return 0
+
+    def summary(self) -> dict:
+        observations = sum(self.counts)
+        return {
+            "mean": round(self.total / observations, 2) if observations else 0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": round(self.maximum, 2),
+            "buckets": dict(
+                zip([*map(str, self.bounds), "+Inf"], self.counts, strict=True)
+            ),
+        }
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.requests = 0
+        self.queries = Histogram(QUERY_BUCKETS)
+        self.db_ms = Histogram(TIME_BUCKETS_MS)
+        self.template_ms = Histogram(TIME_BUCKETS_MS)
+        self.wall_ms = Histogram(TIME_BUCKETS_MS)
+
+    def summary(self) -> dict:
+        return {
+            "requests": self.requests,
+            "queries": self.queries.summary(),
+            "db_ms": self.db_ms.summary(),
+            "template_ms": self.template_ms.summary(),
+            "wall_ms": self.wall_ms.summary(),
+        }
+
+
+class MetricsRegistry:
+    """
+    Histogramas agregados por nome de view. Cada processo (worker) mantém
+    os seus: a agregação é em memória para não custar I/O por requisição.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._views: dict[str, ViewMetrics] = {}
+
+    def observe(self, view_name: str, metrics: RequestMetrics, wall_time: float):
+        with self._lock:
+            view = self._views.setdefault(view_name, ViewMetrics())
+            view.requests += 1
+            view.queries.observe(metrics.queries)
+            view.db_ms.observe(metrics.db_time * 1000)
+            view.template_ms.observe(metrics.template_time * 1000)
+            view.wall_ms.observe(wall_time * 1000)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: view.summary() for name, view in sorted(self._views.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._views.clear()
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,152 @@
+import functools
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import Template
+
+from apps.core.metrics import RequestMetrics, current_request_metrics, registry
+from apps.core.routers import primary_written, replica_reads
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+def instrument_templates() -> None:
+    """
+    Mede o tempo de renderização dos templates da requisição atual. Só a
+    renderização mais externa é somada (includes e render_to_string dentro
+    de um template não contam duas vezes). O tempo inclui as consultas
+    disparadas pelo próprio template.
+    """
+    if getattr(Template.render, "instrumented", False):
+        return
+
+    original_render = Template.render
+
+    @functools.wraps(original_render)
+    def render(self, context=None, request=None):
+        metrics = current_request_metrics.get()
+        if metrics is None:
+            return original_render(self, context, request)
+
+        metrics.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original_render(self, context, request)
+        finally:
+            metrics.template_depth -= 1
+            if metrics.template_depth == 0:
+                metrics.template_time += time.perf_counter() - started
+
+    render.instrumented = True
+    Template.render = render
+
+
+class RequestMetricsMiddleware:
+    """
+    Registra, por view, a quantidade de consultas, o tempo no banco, o tempo
+    de renderização dos templates e o tempo total da requisição.
+
+    - DEBUG: expõe as medições nos cabeçalhos Server-Timing e X-DB-Queries
+    - Sempre: agrega em histogramas (apps.core.metrics.registry)
+    - Avisa no log quando a view passa de REQUEST_METRICS_QUERY_BUDGET
+
+    Consultas feitas por respostas em streaming, depois que a view retorna,
+    não entram na contagem.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        instrument_templates()
+
+    def __call__(self, request):
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        started = time.perf_counter()
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(metrics.record_query)
+                    )
+                response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+
+        wall_time = time.perf_counter() - started
+        match = request.resolver_match
+        view_name = match.view_name if match else "<não resolvida>"
+
+        registry.observe(view_name, metrics, wall_time)
+
+        query_budget = settings.REQUEST_METRICS_QUERY_BUDGET
+        if metrics.queries > query_budget:
+            logger.warning(
+                "%s executou %d consultas (limite: %d) em %s",
+                view_name,
+                metrics.queries,
+                query_budget,
+                request.path,
+            )
+
+        if settings.DEBUG:
+            response["X-DB-Queries"] = str(metrics.queries)
+            response["Server-Timing"] = ", ".join(
+                [
+                    f"db;dur={metrics.db_time * 1000:.1f}",
+                    f"tpl;dur={metrics.template_time * 1000:.1f}",
+                    f"total;dur={wall_time * 1000:.1f}",
+                ]
+            )
+
+        return response
+
+
+# Presente enquanto o cliente deve ler do primário após uma escrita
+PRIMARY_STICKY_COOKIE = "sinapse_primary"
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Libera as réplicas de leitura (apps.core.routers) para as views de
+    REPLICA_READ_VIEWS em GET/HEAD. Depois de uma requisição que escreve
+    (método não seguro ou escrita pelo ORM), o cliente recebe um cookie
+    que o mantém no primário por REPLICA_STICKY_SECONDS, para ler as
+    próprias escritas mesmo com atraso na replicação.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        reads_token = replica_reads.set(False)
+        written_token = primary_written.set(False)
+        try:
+            response = self.get_response(request)
+            wrote = primary_written.get() or request.method not in SAFE_METHODS
+        finally:
+            replica_reads.reset(reads_token)
+            primary_written.reset(written_token)
+
+        if wrote and settings.DATABASE_REPLICAS:
+            response.set_cookie(
+                PRIMARY_STICKY_COOKIE,
+                "1",
+                max_age=settings.REPLICA_STICKY_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        replica_reads.set(
+            bool(settings.DATABASE_REPLICAS)
+            and request.method in SAFE_METHODS
+            and PRIMARY_STICKY_COOKIE not in request.COOKIES
+            and request.resolver_match.url_name in settings.REPLICA_READ_VIEWS
+        )
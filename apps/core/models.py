@@ -4,6 +4,42 @@ from django.db import models
 from django.db.models import Field
 from django.utils import timezone
 
+# Linhas marcadas por UPDATE em cada lote do soft delete em massa
+SOFT_DELETE_BATCH_SIZE = 1000
+
+
+class SoftDeleteQuerySet(models.QuerySet):
+    def soft_delete(self, batch_size: int = SOFT_DELETE_BATCH_SIZE) -> int:
+        """
+        Marca as linhas do queryset como excluídas em lotes de UPDATE ...
+        WHERE id IN (SELECT ... LIMIT n), sem carregá-las no Python. Cada
+        lote é um comando curto, então os locks não se acumulam; se o
+        processo for interrompido, repetir a chamada continua de onde parou.
+
+        Retorna a quantidade de linhas marcadas
+        """
+        now = timezone.now()
+        pending = self.filter(deleted=False).order_by().values("pk")
+
+        total = 0
+        while True:
+            marked = self.model._base_manager.filter(
+                pk__in=pending[:batch_size]
+            ).update(deleted=True, deleted_at=now, updated_at=now)
+            total += marked
+            if marked < batch_size:
+                return total
+
+
+class SoftDeleteManager(models.Manager.from_queryset(SoftDeleteQuerySet)):
+    """
+    Manager padrão: esconde as linhas excluídas logicamente. O acesso
+    pelas chaves estrangeiras (_base_manager) continua enxergando todas.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted=False)
+
 
 class BaseModel(models.Model):
     id: type[Field] = models.UUIDField(primary_key=True, default=uuid.uuid4)
@@ -12,9 +48,16 @@ class BaseModel(models.Model):
     deleted_at: type[Field] = models.DateTimeField(null=True, blank=True)
     deleted: type[Field] = models.BooleanField(default=False)
 
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
     def soft_delete(self):
+        # UPDATE direto: não passa pelo save() (e pelo full_clean) do modelo
         self.deleted = True
-        self.deleted_at = timezone.now()
+        self.deleted_at = self.updated_at = timezone.now()
+        type(self)._base_manager.filter(pk=self.pk).update(
+            deleted=True, deleted_at=self.deleted_at, updated_at=self.updated_at
+        )
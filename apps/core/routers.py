@@ -0,0 +1,56 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Ligado pelo ReplicaRoutingMiddleware nas views somente leitura
+replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+
+# Marcado quando o ORM escreve no primário durante a requisição
+primary_written: ContextVar[bool] = ContextVar("primary_written", default=False)
+
+
+def mark_primary_written() -> None:
+    """
+    Escritas em SQL direto (connection.cursor()) não passam pelo roteador:
+    quem as faz avisa aqui para o cliente continuar lendo do primário
+    """
+    primary_written.set(True)
+
+
+class ReplicaRouter:
+    """
+    Leituras em réplicas apenas quando liberadas pelo middleware
+    (ReplicaRoutingMiddleware, via `replica_reads`) e fora de transações;
+    todo o resto vai para o primário.
+    Retornar None mantém o comportamento padrão do Django, que segue o
+    banco do objeto de origem nas consultas relacionadas.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if not replicas or not replica_reads.get():
+            return None
+
+        # Dentro de um atomic a leitura precisa enxergar as próprias escritas
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        mark_primary_written()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primário e réplicas têm os mesmos dados
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,207 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection, router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import resolve, reverse
+from django.utils import timezone
+from psycopg_pool import ConnectionPool
+
+from apps.authentication.models import UserModel
+from apps.core.metrics import registry
+from apps.core.middleware import PRIMARY_STICKY_COOKIE, ReplicaRoutingMiddleware
+from apps.core.routers import replica_reads
+from apps.events.models import CategoryModel, EventModel
+
+
+class RequestMetricsMiddlewareTest(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = UserModel.objects.create(
+            email="user@sinapse.local", first_name="A", last_name="B"
+        )
+        # Sessão e usuário garantem consultas mesmo com a listagem em cache
+        self.client.force_login(self.user)
+        self.url = reverse("events_index")
+
+    @override_settings(DEBUG=True)
+    def test_exposes_timings_as_headers_in_debug(self):
+        response = self.client.get(self.url)
+
+        self.assertGreater(int(response["X-DB-Queries"]), 0)
+        self.assertRegex(
+            response["Server-Timing"],
+            r"^db;dur=[\d.]+, tpl;dur=[\d.]+, total;dur=[\d.]+$",
+        )
+
+    def test_aggregates_histograms_per_view(self):
+        for _ in range(3):
+            response = self.client.get(self.url)
+
+        view = registry.snapshot()["events_index"]
+        self.assertNotIn("X-DB-Queries", response)
+        self.assertEqual(view["requests"], 3)
+        self.assertEqual(sum(view["wall_ms"]["buckets"].values()), 3)
+        self.assertGreater(view["template_ms"]["max"], 0)
+
+    @override_settings(REQUEST_METRICS_QUERY_BUDGET=0)
+    def test_warns_when_view_exceeds_query_budget(self):
+        with self.assertLogs("apps.core.middleware", "WARNING") as logs:
+            self.client.get(self.url)
+
+        self.assertIn("events_index executou", logs.output[0])
+
+    def test_metrics_view_is_restricted_to_superusers(self):
+        forbidden = self.client.get(reverse("request_metrics"))
+
+        UserModel.objects.filter(id=self.user.id).update(is_superuser=True)
+        allowed = self.client.get(reverse("request_metrics"))
+
+        self.assertEqual(forbidden.status_code, 403)
+        self.assertEqual(allowed.json()["views"]["request_metrics"]["requests"], 1)
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1", "replica_2"])
+class ReplicaRoutingTest(SimpleTestCase):
+    factory = RequestFactory()
+
+    def read_alias(self, url_name, method="get", cookies=None, args=()):
+        """
+        Banco escolhido para as leituras da view, sem executar a view nem
+        tocar nas réplicas
+        """
+        request = getattr(self.factory, method)(reverse(url_name, args=args))
+        request.resolver_match = resolve(request.path_info)
+        request.COOKIES.update(cookies or {})
+
+        def get_response(request):
+            middleware.process_view(request, None, (), {})
+            return HttpResponse(router.db_for_read(EventModel))
+
+        middleware = ReplicaRoutingMiddleware(get_response)
+        return middleware(request)
+
+    def test_read_only_views_use_replicas(self):
+        response = self.read_alias("events_index")
+
+        self.assertIn(response.content.decode(), {"replica_1", "replica_2"})
+        self.assertNotIn(PRIMARY_STICKY_COOKIE, response.cookies)
+
+    def test_other_views_read_from_primary(self):
+        response = self.read_alias("export_attendance", args=["csv"])
+
+        self.assertEqual(response.content.decode(), "default")
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        written = self.read_alias("events_index", method="post")
+        pinned = self.read_alias("events_index", cookies={PRIMARY_STICKY_COOKIE: "1"})
+
+        self.assertEqual(written.content.decode(), "default")
+        self.assertEqual(written.cookies[PRIMARY_STICKY_COOKIE]["max-age"], 15)
+        self.assertEqual(pinned.content.decode(), "default")
+
+    def test_router_outside_requests(self):
+        self.assertEqual(router.db_for_read(EventModel), "default")
+        self.assertEqual(router.db_for_write(EventModel), "default")
+
+        token = replica_reads.set(True)
+        try:
+            self.assertIn(router.db_for_read(EventModel), {"replica_1", "replica_2"})
+            self.assertFalse(router.allow_migrate("replica_1", "events"))
+        finally:
+            replica_reads.reset(token)
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaStickinessTest(TestCase):
+    """
+    Escritas em SQL direto, feitas em views GET, também prendem o cliente
+    ao primário
+    """
+
+    def setUp(self):
+        teacher = UserModel.objects.create(
+            email="teacher@sinapse.local",
+            first_name="A",
+            last_name="B",
+            role=UserModel.Role.TEACHER,
+        )
+        self.student = UserModel.objects.create(
+            email="student@sinapse.local", first_name="C", last_name="D"
+        )
+        start_date = timezone.now() + timedelta(days=1)
+        self.event = EventModel.objects.create(
+            name="Evento",
+            street="Rua A, 1",
+            city="São Paulo",
+            state="SP",
+            zip_code="01000000",
+            start_date=start_date,
+            end_date=start_date + timedelta(hours=2),
+            category=CategoryModel.objects.get_or_create(name="tecnologia")[0],
+            user=teacher,
+        )
+        self.client.force_login(self.student)
+
+    def test_enrollment_pins_the_client_to_the_primary(self):
+        enrolled = self.client.get(reverse("enroll_event", args=[self.event.id]))
+        canceled = self.client.get(reverse("cancel_enrollment", args=[self.event.id]))
+
+        self.assertFalse(self.event.participants_records.exists())
+        self.assertEqual(enrolled.cookies[PRIMARY_STICKY_COOKIE]["max-age"], 15)
+        self.assertIn(PRIMARY_STICKY_COOKIE, canceled.cookies)
+
+    def test_reads_do_not_pin_the_client(self):
+        response = self.client.get(reverse("event_details", args=[self.event.id]))
+
+        self.assertNotIn(PRIMARY_STICKY_COOKIE, response.cookies)
+
+
+@skipUnless(connection.settings_dict["OPTIONS"].get("pool"), "pool desligado")
+class DatabasePoolTest(TestCase):
+    def checkout_pids(self, total):
+        """
+        Pids das conexões entregues pelo pool a `total` requisições seguidas
+        de outra thread, que devolve a conexão ao final de cada uma
+        """
+
+        def requests():
+            pids = []
+            for _ in range(total):
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT pg_backend_pid()")
+                    pids.append(cursor.fetchone()[0])
+                connection.close()
+            return pids
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(requests).result()
+
+    def test_pool_follows_settings(self):
+        options = connection.settings_dict["OPTIONS"]["pool"]
+        pool = connection.pool
+
+        self.assertIsInstance(pool, ConnectionPool)
+        self.assertEqual(pool.min_size, options["min_size"])
+        self.assertEqual(pool.max_size, options["max_size"])
+        self.assertEqual(pool.max_lifetime, options["max_lifetime"])
+        self.assertEqual(connection.settings_dict["CONN_MAX_AGE"], 0)
+        self.assertTrue(connection.settings_dict["CONN_HEALTH_CHECKS"])
+
+    def test_requests_reuse_pooled_connections(self):
+        pids = self.checkout_pids(20)
+
+        self.assertLessEqual(len(set(pids)), connection.pool.max_size)
+
+    def test_health_check_discards_dead_connections(self):
+        (dead_pid,) = self.checkout_pids(1)
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT pg_terminate_backend(%s)", [dead_pid])
+
+        # Passa por todas as conexões ociosas: a derrubada é descartada na
+        # saída do pool em vez de quebrar a requisição que a recebesse
+        pids = self.checkout_pids(connection.pool.max_size + 1)
+
+        self.assertNotIn(dead_pid, pids)
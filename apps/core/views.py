@@ -0,0 +1,20 @@
+import os
+
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+
+from apps.core.metrics import registry
+
+
+def request_metrics(request):
+    """
+    Histogramas por view do processo que atendeu a requisição (apenas
+    superusuários)
+    """
+    if not request.user.is_superuser:
+        raise PermissionDenied("Acesso restrito a administradores.")
+
+    return JsonResponse(
+        {"pid": os.getpid(), "views": registry.snapshot()},
+        json_dumps_params={"indent": 2, "ensure_ascii": False},
+    )
@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.events.cache import invalidate_events_cache
+from apps.events.models import (
+    ArchivedParticipantModel,
+    EventModel,
+    EventParticipantModel,
+    WaitlistEntryModel,
+)
+
+# Eventos finalizados/cancelados há mais que isso vão para o arquivo
+ARCHIVE_AFTER_MONTHS = 6
+
+# Eventos movidos por transação: cada lote leva todas as inscrições dos
+# seus eventos, então um evento nunca fica dividido entre as duas tabelas
+ARCHIVE_BATCH_SIZE = 50
+
+EVENTS_TABLE = EventModel._meta.db_table
+PARTICIPANTS_TABLE = EventParticipantModel._meta.db_table
+ARCHIVE_TABLE = ArchivedParticipantModel._meta.db_table
+WAITLIST_TABLE = WaitlistEntryModel._meta.db_table
+
+PARTICIPANT_COLUMNS = (
+    "id, event_id, user_id, status, attended_at, "
+    "created_at, updated_at, deleted, deleted_at"
+)
+
+# Marca um lote de eventos e move as inscrições deles em um único comando.
+# SKIP LOCKED deixa execuções simultâneas pegarem lotes diferentes.
+ARCHIVE_SQL = f"""
+    WITH batch AS (
+        SELECT id
+        FROM {EVENTS_TABLE}
+        WHERE archived_at IS NULL
+          AND status IN (%(finished)s, %(canceled)s)
+          AND end_date < %(before)s
+        ORDER BY end_date
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    ),
+    marked AS (
+        UPDATE {EVENTS_TABLE} e
+        SET archived_at = %(now)s
+        FROM batch
+        WHERE e.id = batch.id
+        RETURNING e.id
+    ),
+    moved AS (
+        DELETE FROM {PARTICIPANTS_TABLE} p
+        USING marked
+        WHERE p.event_id = marked.id
+        RETURNING p.*
+    ),
+    archived AS (
+        INSERT INTO {ARCHIVE_TABLE} ({PARTICIPANT_COLUMNS}, archived_at)
+        SELECT {PARTICIPANT_COLUMNS}, %(now)s
+        FROM moved
+        RETURNING 1
+    ),
+    waitlist AS (
+        DELETE FROM {WAITLIST_TABLE} w
+        USING marked
+        WHERE w.event_id = marked.id
+    )
+    SELECT (SELECT COUNT(*) FROM marked), (SELECT COUNT(*) FROM archived)
+"""
+
+
+def archive_events(
+    months: int = ARCHIVE_AFTER_MONTHS,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+    now=None,
+):
+    """
+    Move para o arquivo as inscrições dos eventos finalizados ou cancelados
+    há mais de `months` meses, um lote de eventos por transação. A lista de
+    espera desses eventos, sem utilidade, é descartada.
+
+    Gera (eventos, inscrições) a cada lote arquivado
+    """
+    now = now or timezone.now()
+    params = {
+        "now": now,
+        "before": now - timedelta(days=30 * months),
+        "finished": EventModel.Status.FINISHED,
+        "canceled": EventModel.Status.CANCELED,
+        "limit": batch_size,
+    }
+
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(ARCHIVE_SQL, params)
+            events, participations = cursor.fetchone()
+
+        if not events:
+            return
+
+        invalidate_events_cache()
+        yield events, participations
+
+
+def event_participations(event):
+    """
+    Inscrições do evento na tabela em que estão: a quente ou, se o evento já
+    foi arquivado, o arquivo. Os dois modelos têm os mesmos campos de leitura.
+    """
+    if event.archived_at:
+        return ArchivedParticipantModel.objects.filter(event=event)
+    return EventParticipantModel.objects.filter(event=event)
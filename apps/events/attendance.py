@@ -0,0 +1,82 @@
+import uuid
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.events.cache import invalidate_events_cache
+from apps.events.models import EventParticipantModel
+
+ATTENDANCE_STATUSES = (
+    EventParticipantModel.ParticipationStatus.PRESENT,
+    EventParticipantModel.ParticipationStatus.ABSENT,
+)
+
+# Prefixo dos campos da chamada no formulário: status_<id da inscrição>
+STATUS_FIELD_PREFIX = "status_"
+
+
+def parse_attendance(data) -> dict[uuid.UUID, str]:
+    """
+    Extrai {id da inscrição: status} do POST da lista de chamada, ignorando
+    campos malformados. Aceita também o formato antigo, de um participante
+    por envio (participant_id + status).
+    """
+    entries = [
+        (name.removeprefix(STATUS_FIELD_PREFIX), value)
+        for name, value in data.items()
+        if name.startswith(STATUS_FIELD_PREFIX)
+    ]
+    if data.get("participant_id"):
+        entries.append((data["participant_id"], data.get("status")))
+
+    statuses = {}
+    for participant_id, status in entries:
+        if status not in ATTENDANCE_STATUSES:
+            continue
+        try:
+            statuses[uuid.UUID(participant_id)] = status
+        except ValueError:
+            continue
+    return statuses
+
+
+def mark_attendance(event, statuses: dict, now=None) -> int:
+    """
+    Aplica a chamada inteira em uma transação. Só as inscrições cujo status
+    mudou são gravadas, em um único bulk_update, todas com o mesmo horário
+    de confirmação de presença.
+
+    Retorna quantas inscrições foram alteradas
+    """
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        records = (
+            event.participants_records.filter(id__in=statuses)
+            .select_for_update()
+            .only("id", "event_id", "status", "attended_at")
+        )
+
+        changed = []
+        for record in records:
+            status = statuses[record.id]
+            if record.status == status:
+                continue
+
+            record.status = status
+            record.attended_at = (
+                now
+                if status == EventParticipantModel.ParticipationStatus.PRESENT
+                else None
+            )
+            record.updated_at = now
+            changed.append(record)
+
+        # bulk_update não dispara os sinais de post_save
+        if changed:
+            EventParticipantModel.objects.bulk_update(
+                changed, ["status", "attended_at", "updated_at"]
+            )
+            invalidate_events_cache()
+
+    return len(changed)
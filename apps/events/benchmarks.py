@@ -0,0 +1,327 @@
+import io
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from pathlib import Path
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from django.db.backends.signals import connection_created
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from apps.authentication.models import UserModel
+from apps.events.enrollment import unenroll_user
+from apps.events.models import CategoryModel, EventModel, EventParticipantModel
+
+BASELINE_PATH = Path(__file__).resolve().parent / "benchmark_baseline.json"
+
+# Folga aceita sobre o p95 da linha de base antes de acusar regressão
+LATENCY_TOLERANCE = 1.5
+
+DEFAULT_DATASET = {
+    "teachers": 20,
+    "students": 500,
+    "events": 200,
+    "participants": 60,
+}
+
+
+class BenchmarkDataset:
+    """
+    Massa de dados determinística (mesma semente, mesmos dados) criada para
+    o benchmark e removida ao final por `delete()`.
+    """
+
+    def __init__(self, teachers, students, events, participants, seed=42):
+        self.rng = random.Random(seed)
+        self.suffix = uuid.uuid4().hex[:8]
+        now = timezone.now()
+
+        self.teachers = self._create_users(teachers, UserModel.Role.TEACHER)
+        self.students = self._create_users(students, UserModel.Role.STUDENT)
+        categories = list(CategoryModel.objects.all()) or [
+            CategoryModel.objects.create(name="benchmark")
+        ]
+
+        # Metade futura (inscrições abertas), metade finalizada com chamada;
+        # bulk_create ignora o full_clean, que recusaria datas no passado
+        new_events = []
+        for i in range(events):
+            finished = i % 2 == 1
+            start_date = now + timedelta(days=-2 if finished else 2, minutes=i)
+            new_events.append(
+                EventModel(
+                    name=f"Benchmark {i}",
+                    description="Evento criado pelo benchmark de views",
+                    topics=self.rng.sample(["python", "django", "dados", "web"], 2),
+                    street="Rua do Benchmark, 1",
+                    city="São Paulo",
+                    state="SP",
+                    zip_code="01000000",
+                    start_date=start_date,
+                    end_date=start_date + timedelta(hours=2),
+                    status=(
+                        EventModel.Status.FINISHED
+                        if finished
+                        else EventModel.Status.OPEN
+                    ),
+                    category=self.rng.choice(categories),
+                    user=self.teachers[i % len(self.teachers)],
+                )
+            )
+        self.events = EventModel.objects.bulk_create(new_events)
+
+        participations = []
+        for event in self.events:
+            finished = event.status == EventModel.Status.FINISHED
+            for student in self.rng.sample(
+                self.students, min(participants, len(self.students))
+            ):
+                participations.append(
+                    EventParticipantModel(
+                        event=event,
+                        user=student,
+                        status=(
+                            self.rng.choice(["PRESENT", "PRESENT", "ABSENT"])
+                            if finished
+                            else "PENDING"
+                        ),
+                        attended_at=now if finished else None,
+                    )
+                )
+        EventParticipantModel.objects.bulk_create(participations, batch_size=2000)
+        EventModel.objects.filter(
+            id__in=[event.id for event in self.events]
+        ).recount_participants()
+
+        self.open_event = self.events[0]
+        self.finished_event = self.events[1]
+        self.teacher = self.open_event.user
+        self.student = (
+            EventParticipantModel.objects.filter(
+                event=self.finished_event, status="PRESENT"
+            )
+            .first()
+            .user
+        )
+        # Estudante ainda não inscrito no evento aberto, para a inscrição
+        enrolled = set(
+            self.open_event.participants_records.values_list("user_id", flat=True)
+        )
+        self.newcomer = next(s for s in self.students if s.id not in enrolled)
+
+    def _create_users(self, total, role):
+        users = [
+            UserModel(
+                email=f"bench-{role.lower()}-{i}-{self.suffix}@sinapse.local",
+                first_name=role.title(),
+                last_name=f"Benchmark {i}",
+                role=role,
+            )
+            for i in range(total)
+        ]
+        for user in users:
+            user.set_unusable_password()
+        return UserModel.objects.bulk_create(users, batch_size=2000)
+
+    def delete(self):
+        EventModel.objects.filter(id__in=[event.id for event in self.events]).delete()
+        UserModel.objects.filter(
+            email__endswith=f"-{self.suffix}@sinapse.local"
+        ).delete()
+
+
+class ViewBenchmark:
+    def __init__(self, name, user, url, method="get", after=None):
+        self.name = name
+        self.user = user
+        self.url = url
+        self.method = method
+        # Desfaz o efeito da requisição (fora da medição)
+        self.after = after
+
+
+def dataset_views(dataset) -> list[ViewBenchmark]:
+    open_id, finished_id = dataset.open_event.id, dataset.finished_event.id
+    return [
+        ViewBenchmark("events", dataset.student, reverse("events_index")),
+        ViewBenchmark(
+            "event_details",
+            dataset.student,
+            reverse("event_details", args=[open_id]),
+        ),
+        ViewBenchmark(
+            "enroll_event",
+            dataset.newcomer,
+            reverse("enroll_event", args=[open_id]),
+            after=lambda: unenroll_user(open_id, dataset.newcomer.id),
+        ),
+        ViewBenchmark(
+            "event_attendance",
+            dataset.finished_event.user,
+            reverse("event_attendance", args=[finished_id]),
+        ),
+        ViewBenchmark("certificates", dataset.student, reverse("certificates")),
+        ViewBenchmark(
+            "generate_certificate",
+            dataset.student,
+            reverse("generate_certificate", args=[finished_id]),
+        ),
+    ]
+
+
+def run_view_benchmarks(dataset, iterations=50, warmup=2) -> dict:
+    """
+    Mede cada view com o cliente de testes do Django. As primeiras
+    `warmup` requisições preenchem caches e arquivos gerados e não entram
+    nas estatísticas.
+
+    Retorna {view: {"p50": ms, "p95": ms, "queries": máximo por requisição}}
+    """
+    results = {}
+    for view in dataset_views(dataset):
+        client = Client()
+        client.force_login(view.user)
+
+        timings, queries = [], []
+        for iteration in range(warmup + iterations):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = getattr(client, view.method)(view.url)
+                # Respostas em streaming só terminam quando consumidas
+                if response.streaming:
+                    b"".join(response.streaming_content)
+                elapsed = time.perf_counter() - started
+
+            if response.status_code >= 400:
+                raise RuntimeError(
+                    f"{view.name} respondeu {response.status_code} ({view.url})"
+                )
+            if view.after:
+                view.after()
+
+            if iteration >= warmup:
+                timings.append(elapsed * 1000)
+                queries.append(len(captured))
+
+        timings.sort()
+        results[view.name] = {
+            "p50": round(statistics.median(timings), 2),
+            "p95": round(timings[max(int(len(timings) * 0.95) - 1, 0)], 2),
+            "queries": max(queries),
+        }
+    return results
+
+
+def load_baseline(path=BASELINE_PATH) -> dict:
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def save_baseline(results, path=BASELINE_PATH) -> None:
+    Path(path).write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+def compare_to_baseline(results, baseline, tolerance=LATENCY_TOLERANCE) -> list[str]:
+    """
+    Lista as regressões: mais consultas que a linha de base (determinístico)
+    ou p95 acima da linha de base multiplicada pela tolerância.
+    """
+    regressions = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        if current["queries"] > reference["queries"]:
+            regressions.append(
+                f"{name}: {current['queries']} consultas "
+                f"(linha de base: {reference['queries']})"
+            )
+        if current["p95"] > reference["p95"] * tolerance:
+            regressions.append(
+                f"{name}: p95 de {current['p95']:.1f} ms "
+                f"(linha de base: {reference['p95']:.1f} ms)"
+            )
+    return regressions
+
+
+def wsgi_get(handler, path) -> int:
+    """
+    GET direto no handler WSGI, como faria o servidor de aplicação: ao
+    fechar a resposta o Django dispara request_finished e devolve (ou fecha)
+    a conexão da thread, ao contrário do cliente de testes.
+    """
+    statuses = []
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": "",
+        "SERVER_NAME": "benchmark",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "wsgi.url_scheme": "http",
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+    }
+    response = handler(environ, lambda status, headers: statuses.append(status))
+    try:
+        b"".join(response)
+    finally:
+        response.close()
+    return int(statuses[0].split()[0])
+
+
+def run_concurrent_requests(path, clients, requests_per_client) -> dict:
+    """
+    `clients` threads fazendo `requests_per_client` requisições seguidas a
+    `path` pelo handler WSGI, com as configurações de banco do processo.
+
+    Retorna latências (ms), vazão e quantas conexões foram abertas no banco
+    """
+    handler = WSGIHandler()
+    opened = []
+    connection_created.connect(
+        lambda sender, connection, **kwargs: opened.append(connection.alias),
+        weak=False,
+        dispatch_uid="benchmark_connections",
+    )
+
+    def client(_):
+        timings = []
+        for _ in range(requests_per_client):
+            started = time.perf_counter()
+            status = wsgi_get(handler, path)
+            timings.append((time.perf_counter() - started) * 1000)
+            if status >= 400:
+                raise RuntimeError(f"{path} respondeu {status}")
+        return timings
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as executor:
+        timings = [t for batch in executor.map(client, range(clients)) for t in batch]
+    elapsed = time.perf_counter() - started
+
+    # Com pool, connection_created dispara a cada conexão tirada do pool;
+    # as abertas de fato no servidor vêm das estatísticas do próprio pool
+    pool = connections[DEFAULT_DB_ALIAS].pool
+    opened_total = pool.get_stats()["connections_num"] if pool else len(opened)
+    connections.close_all()
+    if pool:
+        connections[DEFAULT_DB_ALIAS].close_pool()
+    connection_created.disconnect(dispatch_uid="benchmark_connections")
+
+    timings.sort()
+    return {
+        "p50": round(statistics.median(timings), 2),
+        "p95": round(timings[max(int(len(timings) * 0.95) - 1, 0)], 2),
+        "throughput": round(len(timings) / elapsed, 1),
+        "connections": opened_total,
+    }
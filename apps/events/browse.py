@@ -0,0 +1,176 @@
+import base64
+import hashlib
+import json
+import uuid
+from datetime import datetime
+
+from django.db import connections
+from django.db.models import Model, Q
+from django.utils import timezone
+
+from apps.events.cache import get_or_refresh
+from apps.events.models import EventModel
+
+BROWSE_PAGE_SIZE = 24
+TOPIC_FACETS_LIMIT = 20
+
+# Apenas o que os cards da listagem exibem
+CARD_FIELDS = (
+    "name",
+    "description",
+    "city",
+    "state",
+    "start_date",
+    "status",
+    "participants_limit",
+    "participants_count",
+    "image_url",
+    "user_id",
+    "category__name",
+)
+
+
+def encode_cursor(event) -> str:
+    raw = f"{event.start_date.isoformat()}|{event.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """
+    Lança ValueError se o cursor estiver malformado
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        start_date, event_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(start_date), uuid.UUID(event_id)
+    except (UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Cursor inválido") from e
+
+
+def filter_events(
+    queryset,
+    *,
+    now,
+    category=None,
+    city=None,
+    state=None,
+    topics=None,
+    start_from=None,
+    start_until=None,
+    upcoming=False,
+    status=None,
+    user=None,
+):
+    """
+    Aplica os filtros da navegação. `queryset` precisa ter o status efetivo
+    anotado (EventQuerySet.with_effective_status) para filtrar por status
+    """
+    if category:
+        queryset = queryset.filter(category=category)
+    if city:
+        queryset = queryset.filter(city__iexact=city)
+    if state:
+        queryset = queryset.filter(state__iexact=state)
+    if topics:
+        # topics @> ARRAY[...], atendido pelo índice GIN
+        queryset = queryset.filter(topics__contains=topics)
+    if user:
+        queryset = queryset.filter(user=user)
+    if start_from:
+        queryset = queryset.filter(start_date__gte=start_from)
+    elif upcoming:
+        queryset = queryset.filter(start_date__gte=now)
+    if start_until:
+        queryset = queryset.filter(start_date__lt=start_until)
+
+    if status:
+        # Pré-filtros equivalentes sobre colunas indexadas, quando existem,
+        # antes do filtro pelo status efetivo
+        if status == EventModel.Status.OPEN:
+            queryset = queryset.filter(status=status, start_date__gt=now)
+        elif status == EventModel.Status.CANCELED:
+            queryset = queryset.filter(status=status)
+        queryset = queryset.filter(effective_status=status)
+
+    return queryset
+
+
+def browse_events(*, cursor=None, limit=BROWSE_PAGE_SIZE, **filters):
+    """
+    Página de eventos ordenada por (start_date, id), paginada por cursor:
+    cada página continua do último evento da anterior, então o custo não
+    cresce com a profundidade como no OFFSET.
+
+    Retorna (eventos, cursor da próxima página ou None)
+    """
+    now = timezone.now()
+    queryset = filter_events(
+        EventModel.objects.with_effective_status(now)
+        .select_related("category")
+        .only(*CARD_FIELDS)
+        .order_by("start_date", "id"),
+        now=now,
+        **filters,
+    )
+
+    if cursor:
+        last_start_date, last_id = cursor
+        queryset = queryset.filter(start_date__gte=last_start_date).filter(
+            Q(start_date__gt=last_start_date) | Q(id__gt=last_id)
+        )
+
+    # Um registro a mais indica se existe próxima página
+    events = list(queryset[: limit + 1])
+    if len(events) <= limit:
+        return events, None
+
+    events = events[:limit]
+    return events, encode_cursor(events[-1])
+
+
+# =====================================================================
+# FACETAS
+# =====================================================================
+
+TOPIC_FACETS_SQL = """
+    SELECT topic, COUNT(*)
+    FROM ({events}) AS e
+    CROSS JOIN LATERAL unnest(e.topics) AS topic
+    GROUP BY topic
+    ORDER BY 2 DESC, 1
+    LIMIT %s
+"""
+
+
+def _filter_signature(filters) -> str:
+    signature = {
+        name: value.pk if isinstance(value, Model) else value
+        for name, value in filters.items()
+        if value
+    }
+    raw = json.dumps(signature, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def topic_facets(limit=TOPIC_FACETS_LIMIT, **filters) -> list[tuple[str, int]]:
+    """
+    Contagem de eventos por tópico para o conjunto de filtros atual,
+    em cache por assinatura dos filtros.
+
+    Retorna [(tópico, quantidade), ...] do mais frequente ao menos
+    """
+
+    def compute():
+        now = timezone.now()
+        events = filter_events(
+            EventModel.objects.with_effective_status(now), now=now, **filters
+        ).values("topics")
+        events_sql, params = events.query.sql_with_params()
+
+        # No banco escolhido pelo roteador (réplica, se liberada)
+        with connections[events.db].cursor() as cursor:
+            cursor.execute(TOPIC_FACETS_SQL.format(events=events_sql), (*params, limit))
+            return cursor.fetchall()
+
+    key = f"events:facets:topics:{_filter_signature(filters)}:{limit}"
+    return get_or_refresh(key, compute)
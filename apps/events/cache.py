@@ -0,0 +1,78 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.core.routers import replica_reads
+
+# Versão global dos dados de eventos: qualquer escrita em eventos ou
+# inscrições incrementa a versão e torna obsoletas as entradas em cache.
+EVENTS_VERSION_KEY = "events:version"
+
+# Tempo máximo que um worker pode segurar o recálculo de uma entrada
+REFRESH_LOCK_TIMEOUT = 30
+
+
+def get_events_version() -> int:
+    version = cache.get(EVENTS_VERSION_KEY)
+    if version is None:
+        # Parte do relógio para não reaproveitar versões antigas caso a
+        # chave seja despejada do cache
+        cache.add(EVENTS_VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(EVENTS_VERSION_KEY)
+    return version
+
+
+def bump_events_version() -> None:
+    try:
+        cache.incr(EVENTS_VERSION_KEY)
+    except ValueError:
+        cache.add(EVENTS_VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def invalidate_events_cache() -> None:
+    """
+    Incrementa a versão após o commit, para que nenhum worker recalcule
+    (e grave na versão nova) dados que ainda não foram confirmados.
+    """
+    transaction.on_commit(bump_events_version)
+
+
+def get_or_refresh(key: str, compute, fresh_for: int | None = None):
+    """
+    Cache com stale-while-revalidate: uma entrada expirada (por tempo ou
+    por mudança de versão) continua sendo servida enquanto um único worker,
+    dono da trava `<key>:lock`, recalcula o valor.
+
+    O recálculo que vai para o cache lê do primário: uma réplica atrasada
+    gravaria na versão nova os dados que a troca de versão quis esconder.
+    """
+    fresh_for = fresh_for or settings.EVENTS_CACHE_TTL
+    version = get_events_version()
+    now = time.time()
+
+    entry = cache.get(key)
+    if entry and entry["version"] == version and entry["expires_at"] > now:
+        return entry["value"]
+
+    lock_key = f"{key}:lock"
+    if cache.add(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT):
+        reads_token = replica_reads.set(False)
+        try:
+            value = compute()
+            cache.set(
+                key,
+                {"version": version, "expires_at": now + fresh_for, "value": value},
+                timeout=fresh_for + settings.EVENTS_CACHE_STALE_TTL,
+            )
+        finally:
+            replica_reads.reset(reads_token)
+            cache.delete(lock_key)
+        return value
+
+    if entry:
+        return entry["value"]
+
+    # Sem nenhuma versão em cache ainda: calcula sem gravar
+    return compute()
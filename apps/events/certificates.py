@@ -0,0 +1,783 @@
+import base64
+import functools
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import re
+import secrets
+import shutil
+import tempfile
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+
+import django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.http import FileResponse, HttpResponse
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.text import slugify
+from reportlab import rl_config
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4, landscape
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import cm
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import Paragraph
+
+from apps.events.archive import event_participations
+from apps.events.models import EventParticipantModel, IssuedCertificateModel
+from apps.events.status import can_generate_certificates
+
+# Incrementar sempre que o layout do PDF mudar: os arquivos já gravados
+# deixam de corresponder e são regerados no próximo download
+CERTIFICATE_TEMPLATE_VERSION = 3
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+ZIP_CHUNK_SIZE = 64 * 1024
+
+# Padding interno padrão do Frame do Platypus
+FRAME_PADDING = 6
+
+CERTIFICATE_CODE_PREFIX = "SNSP"
+
+# Tentativas de sortear um código inédito antes de desistir da emissão
+CERTIFICATE_CODE_ATTEMPTS = 5
+
+# Um certificado emitido não muda, então a verificação pode ficar em cache
+VERIFY_CACHE_TIMEOUT = 60 * 60
+
+
+# =====================================================================
+# EMISSÃO
+# =====================================================================
+
+
+def new_certificate_code() -> str:
+    """
+    80 bits aleatórios em base32, em grupos: SNSP-XXXX-XXXX-XXXX-XXXX.
+    Não é sequencial (não dá para enumerar certificados de terceiros) e o
+    índice único da coluna detecta uma eventual colisão.
+    """
+    raw = base64.b32encode(secrets.token_bytes(10)).decode()
+    groups = [raw[i : i + 4] for i in range(0, len(raw), 4)]
+    return "-".join([CERTIFICATE_CODE_PREFIX, *groups])
+
+
+def certificate_snapshot(event, user) -> dict:
+    return {
+        "participant_name": f"{user.first_name} {user.last_name}",
+        "event_name": event.name,
+        "event_city": event.city,
+        "event_state": event.state,
+        "event_country": event.country,
+        "event_start_date": event.start_date,
+        "event_end_date": event.end_date,
+    }
+
+
+def issue_certificate(event, user) -> IssuedCertificateModel | None:
+    """
+    Certificado do participante, emitido na primeira chamada. As regras de
+    elegibilidade só rodam na emissão: depois disso basta a consulta pelo
+    par (evento, usuário). `event` deve ter o status efetivo anotado.
+
+    Retorna None se o participante ainda não pode receber o certificado
+    """
+    issued = IssuedCertificateModel.objects.filter(event=event, user=user).first()
+    if issued:
+        return issued
+
+    # Eventos antigos têm as inscrições no arquivo (apps.events.archive)
+    is_present = (
+        event_participations(event)
+        .filter(user=user, status=EventParticipantModel.ParticipationStatus.PRESENT)
+        .exists()
+    )
+    if not is_present or not can_generate_certificates(event):
+        return None
+
+    for _attempt in range(CERTIFICATE_CODE_ATTEMPTS):
+        try:
+            # Em emissões simultâneas, o get_or_create devolve o registro
+            # gravado pela outra; o IntegrityError restante é o código
+            issued, _created = IssuedCertificateModel.objects.get_or_create(
+                event=event,
+                user=user,
+                defaults={
+                    "code": new_certificate_code(),
+                    **certificate_snapshot(event, user),
+                },
+            )
+            return issued
+        except IntegrityError:
+            continue
+
+    raise IntegrityError("Não foi possível gerar um código de certificado único")
+
+
+def issue_event_certificates(event) -> list[IssuedCertificateModel]:
+    """
+    Emite de uma vez os certificados que faltam para os presentes do evento
+    e retorna todos os já emitidos, com o usuário carregado.
+    """
+    if can_generate_certificates(event):
+        pending = (
+            event_participations(event)
+            .filter(status=EventParticipantModel.ParticipationStatus.PRESENT)
+            .exclude(user__issued_certificates__event=event)
+            .select_related("user")
+        )
+        IssuedCertificateModel.objects.bulk_create(
+            [
+                IssuedCertificateModel(
+                    event=event,
+                    user=participation.user,
+                    code=new_certificate_code(),
+                    **certificate_snapshot(event, participation.user),
+                )
+                for participation in pending
+            ],
+            ignore_conflicts=True,
+        )
+
+    return list(
+        IssuedCertificateModel.objects.filter(event=event, user__isnull=False)
+        .select_related("user")
+        .only(
+            "code",
+            "created_at",
+            "user__id",
+            "user__first_name",
+            "user__last_name",
+        )
+        .order_by("user__first_name", "user__last_name")
+    )
+
+
+def find_issued_certificate(code: str) -> dict | None:
+    """
+    Dados públicos de um certificado, pelo código impresso no PDF: uma
+    consulta no índice único, em cache por código.
+    """
+    code = code.strip().upper()
+    key = f"certificates:verify:{code}"
+
+    certificate = cache.get(key)
+    if certificate is None:
+        certificate = (
+            IssuedCertificateModel.objects.filter(code=code)
+            .values(
+                "code",
+                "created_at",
+                "participant_name",
+                "event_name",
+                "event_city",
+                "event_state",
+                "event_country",
+                "event_start_date",
+                "event_end_date",
+            )
+            .first()
+        )
+        if certificate is None:
+            return None
+        cache.set(key, certificate, VERIFY_CACHE_TIMEOUT)
+
+    return certificate
+
+
+# =====================================================================
+# RENDERIZAÇÃO
+# =====================================================================
+
+
+def certificate_context(event, user, issued) -> dict:
+    """
+    Tudo o que varia de um certificado para outro. É também a chave do
+    arquivo gravado: se nada aqui mudar, o PDF não precisa ser regerado.
+    """
+    return {
+        "code": issued.code,
+        "issued_at": issued.created_at,
+        "first_name": user.first_name,
+        "last_name": user.last_name,
+        "event_name": event.name,
+        "city": event.city,
+        "state": event.state,
+        "country": event.country,
+        "start_date": event.start_date,
+        "end_date": event.end_date,
+    }
+
+
+def certificate_digest(context: dict) -> str:
+    payload = json.dumps(
+        {"template_version": CERTIFICATE_TEMPLATE_VERSION, **context},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+@contextmanager
+def ascii85_streams(enabled: bool):
+    """
+    Liga ou desliga o filtro ASCII85 dos streams do ReportLab durante o
+    bloco. A opção é global (rl_config) e é restaurada ao final, para não
+    afetar outros PDFs gerados no processo.
+    """
+    previous = rl_config.useA85
+    rl_config.useA85 = int(enabled)
+    try:
+        yield
+    finally:
+        rl_config.useA85 = previous
+
+
+class CertificateTemplate:
+    """
+    Partes fixas do certificado, montadas uma única vez por processo:
+    estilos, textos estáticos e métricas da página. Por certificado, só os
+    textos variáveis são criados e diagramados.
+
+    Design inspirado no template HTML original, desenhado com ReportLab
+    — roda em Windows/Linux sem dependências externas além do ReportLab.
+    """
+
+    def __init__(self, ascii85: bool = False):
+        # Streams só com Flate: sem a extensão rl_accel o codificador ASCII85
+        # do ReportLab roda em Python puro e dominava a renderização
+        self.ascii85 = ascii85
+
+        self.page_size = landscape(A4)
+        self.width, self.height = self.page_size
+
+        # Área útil do frame que o SimpleDocTemplate montava com margens de
+        # 2cm (o Frame ainda desconta um padding em cada lado)
+        self.content_left = 2 * cm + FRAME_PADDING
+        self.content_top = self.height - 2 * cm - FRAME_PADDING
+        self.content_width = self.width - 4 * cm - 2 * FRAME_PADDING
+        self.content_height = self.height - 4 * cm - 2 * FRAME_PADDING
+
+        base_styles = getSampleStyleSheet()
+        title_style = ParagraphStyle(
+            "certificate_title",
+            parent=base_styles["Title"],
+            fontName="Helvetica-Bold",
+            fontSize=28,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#4F46E5"),
+            spaceAfter=12,
+        )
+
+        normal_center = ParagraphStyle(
+            "normal_center",
+            parent=base_styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=16,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#374151"),
+            leading=22,
+        )
+
+        self.participant_style = ParagraphStyle(
+            "participant",
+            parent=base_styles["Heading1"],
+            fontName="Helvetica-Bold",
+            fontSize=34,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#4F46E5"),
+            leading=36,
+            spaceAfter=6,
+        )
+
+        self.event_style = ParagraphStyle(
+            "event",
+            parent=base_styles["Heading2"],
+            fontName="Helvetica-Bold",
+            fontSize=24,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#8B5CF6"),
+            leading=28,
+            spaceAfter=6,
+        )
+
+        self.details_style = ParagraphStyle(
+            "details",
+            parent=base_styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=14,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#4B5563"),
+            leading=20,
+            spaceAfter=6,
+        )
+
+        self.emission_style = ParagraphStyle(
+            "emission",
+            parent=base_styles["BodyText"],
+            fontName="Helvetica-Oblique",
+            fontSize=12,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#6B7280"),
+            leading=16,
+        )
+
+        self.cert_id_style = ParagraphStyle(
+            "cert_id",
+            parent=base_styles["BodyText"],
+            fontName="Helvetica",
+            fontSize=9,
+            alignment=TA_CENTER,
+            textColor=colors.HexColor("#9CA3AF"),
+        )
+
+        # Textos fixos: diagramados uma vez e só desenhados a cada certificado
+        self.title = self._prewrap(
+            Paragraph("CERTIFICADO DE PARTICIPAÇÃO", title_style)
+        )
+        self.certify = self._prewrap(Paragraph("Certificamos que", normal_center))
+        self.participated = self._prewrap(
+            Paragraph("participou com sucesso do evento", normal_center)
+        )
+
+    def _prewrap(self, paragraph):
+        paragraph.wrap(self.content_width, self.content_height)
+        paragraph.prewrapped = True
+        return paragraph
+
+    def _stack(self, canvas_obj, story):
+        """
+        Empilha os blocos de cima para baixo com as mesmas regras de
+        espaçamento do Frame do Platypus, sem o custo de reembrulhar os
+        textos fixos. Números no `story` são espaçadores (altura em pontos).
+        """
+        y = self.content_top
+        previous_space_after = 0
+        at_top = True
+
+        for item in story:
+            if not isinstance(item, Paragraph):
+                y -= item
+                previous_space_after = 0
+                at_top = False
+                continue
+
+            if getattr(item, "prewrapped", False):
+                height = item.height
+            else:
+                _width, height = item.wrap(self.content_width, self.content_height)
+
+            if not at_top:
+                y -= max(item.getSpaceBefore() - previous_space_after, 0)
+
+            y -= height
+            item.drawOn(canvas_obj, self.content_left, y)
+
+            previous_space_after = item.getSpaceAfter()
+            y -= previous_space_after
+            at_top = False
+
+    def draw_background(self, canvas_obj):
+        """
+        Fundo, bordas e marca d'água; não dependem do participante e são
+        poucas operações de desenho, refeitas em cada certificado.
+        """
+        w, h = self.width, self.height
+
+        canvas_obj.saveState()
+
+        # Background fill
+        canvas_obj.setFillColor(colors.HexColor("#F3F4F6"))
+        canvas_obj.rect(0, 0, w, h, stroke=0, fill=1)
+
+        # Outer decorative border
+        canvas_obj.setStrokeColor(colors.HexColor("#4F46E5"))
+        canvas_obj.setLineWidth(10)
+        canvas_obj.rect(20, 20, w - 40, h - 40, stroke=1, fill=0)
+
+        # Inner subtle border
+        canvas_obj.setStrokeColor(colors.Color(0.545, 0.361, 0.961, alpha=0.18))
+        canvas_obj.setLineWidth(2)
+        canvas_obj.rect(36, 36, w - 72, h - 72, stroke=1, fill=0)
+
+        # Central watermark "SINAPSE"
+        watermark_color = colors.Color(79 / 255, 70 / 255, 229 / 255, alpha=0.06)
+        canvas_obj.setFillColor(watermark_color)
+        canvas_obj.setFont("Helvetica-Bold", 120)
+
+        canvas_obj.saveState()
+        canvas_obj.translate(w / 2.0, h / 2.0)
+        canvas_obj.rotate(-25)
+        canvas_obj.drawCentredString(0, 0, "SINAPSE")
+        canvas_obj.restoreState()
+
+        canvas_obj.restoreState()
+
+    def draw_page(self, canvas_obj, context: dict) -> None:
+        """
+        Fundo e rodapé com o código do certificado
+        """
+        self.draw_background(canvas_obj)
+
+        # Footer ID
+        canvas_obj.saveState()
+        canvas_obj.setFillColor(colors.HexColor("#D1D5DB"))
+        canvas_obj.setFont("Helvetica", 9)
+        canvas_obj.drawRightString(
+            self.width - 30, 25, f"Certificado ID: {context['code']}"
+        )
+        canvas_obj.restoreState()
+
+    def story(self, context: dict) -> list:
+        """
+        Blocos de texto de cima para baixo; números são espaçadores (altura
+        em pontos)
+        """
+        issued_at = timezone.localtime(context["issued_at"])
+        participant_name = f"{context['first_name']} {context['last_name']}"
+        emission_text = (
+            f"Emitido digitalmente em {issued_at.strftime('%d/%m/%Y')} "
+            f"através da plataforma Sinapse"
+        )
+
+        return [
+            1 * cm,
+            self.title,
+            0.4 * cm,
+            self.certify,
+            0.2 * cm,
+            Paragraph(participant_name, self.participant_style),
+            0.2 * cm,
+            self.participated,
+            0.4 * cm,
+            Paragraph(context["event_name"], self.event_style),
+            0.3 * cm,
+            Paragraph(certificate_details_html(context), self.details_style),
+            1.2 * cm,
+            Paragraph(emission_text, self.emission_style),
+            0.6 * cm,
+            Paragraph(context["code"], self.cert_id_style),
+        ]
+
+    def render(self, context: dict) -> bytes:
+        buffer = BytesIO()
+
+        with ascii85_streams(self.ascii85):
+            canvas_obj = Canvas(buffer, pagesize=self.page_size)
+            canvas_obj.setTitle(f"Certificado - {context['event_name']}")
+
+            self.draw_page(canvas_obj, context)
+            self._stack(canvas_obj, self.story(context))
+
+            canvas_obj.showPage()
+            canvas_obj.save()
+
+        return buffer.getvalue()
+
+
+def certificate_details_html(context: dict) -> str:
+    start_date, end_date = context["start_date"], context["end_date"]
+
+    # Calcular carga horária (diferença entre start_date e end_date)
+    if start_date and end_date:
+        # Calcular diferença em horas
+        time_difference = end_date - start_date
+        total_hours = time_difference.total_seconds() / 3600
+        # Arredondar para 1 casa decimal
+        duration_hours = round(total_hours, 1)
+
+        # Verificar se é no mesmo dia
+        if start_date.date() == end_date.date():
+            date_range_str = f"<b>{start_date.strftime('%d/%m/%Y')}</b><br/>"
+            time_range_str = f"Das <b>{start_date.strftime('%H:%M')}</b> às <b>{end_date.strftime('%H:%M')}</b>"
+        else:
+            date_range_str = f"De <b>{start_date.strftime('%d/%m/%Y %H:%M')}</b><br/>"
+            time_range_str = f"Até <b>{end_date.strftime('%d/%m/%Y %H:%M')}</b>"
+    else:
+        duration_hours = 0
+        date_range_str = "Data não especificada"
+        time_range_str = ""
+
+    return (
+        f"Realizado em <b>{context['city']}, {context['state']} - {context['country']}</b><br/>"
+        f"{date_range_str}"
+        f"{time_range_str}<br/>"
+        f"Carga horária total de <b>{duration_hours} horas</b>"
+    )
+
+
+@functools.cache
+def get_certificate_template() -> CertificateTemplate:
+    return CertificateTemplate()
+
+
+def render_certificate(context: dict) -> bytes:
+    return get_certificate_template().render(context)
+
+
+# =====================================================================
+# ARMAZENAMENTO
+# =====================================================================
+
+
+def event_certificates_dir(event_id) -> Path:
+    return Path(settings.CERTIFICATES_ROOT) / str(event_id)
+
+
+def certificate_path(event_id, user_id, digest: str) -> Path:
+    return event_certificates_dir(event_id) / f"{user_id}-{digest}.pdf"
+
+
+def write_certificate(path: Path, pdf: bytes) -> None:
+    """
+    Grava o PDF atomicamente (arquivo temporário + rename, para que nenhum
+    download leia um arquivo pela metade) e remove as versões anteriores
+    do mesmo participante.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as tmp_file:
+        tmp_file.write(pdf)
+    os.replace(tmp_path, path)
+
+    # O id do usuário também tem hífens: o digest é o que vem depois do último
+    user_id = path.name.rsplit("-", 1)[0]
+    for stale in path.parent.glob(f"{user_id}-*.pdf"):
+        if stale != path:
+            stale.unlink(missing_ok=True)
+
+
+def store_certificate(event, user, issued) -> tuple[Path, str]:
+    """
+    Retorna (caminho, digest) do PDF do participante, gerando-o apenas se
+    ainda não existir para o conteúdo atual (nome do usuário, dados do
+    evento, emissão e versão do template).
+    """
+    context = certificate_context(event, user, issued)
+    digest = certificate_digest(context)
+    path = certificate_path(event.id, user.id, digest)
+
+    if not path.exists():
+        write_certificate(path, render_certificate(context))
+
+    return path, digest
+
+
+def certificate_filename(event, user) -> str:
+    return f"certificado_{slugify(event.name)}_{slugify(user.first_name)}_{slugify(user.last_name)}.pdf"
+
+
+def delete_event_certificates(event_id) -> None:
+    shutil.rmtree(event_certificates_dir(event_id), ignore_errors=True)
+
+
+# =====================================================================
+# DOWNLOAD
+# =====================================================================
+
+
+def _parse_range(header: str | None, size: int):
+    """
+    Interpreta um único intervalo `bytes=início-fim`. Retorna None quando
+    não há intervalo (ou há vários, caso em que o arquivo inteiro é
+    servido), (início, fim) inclusivo, ou False se for insatisfazível.
+    """
+    match = RANGE_RE.match(header or "")
+    if not match:
+        return None
+
+    start, end = match.groups()
+    if not start and not end:
+        return None
+
+    if not start:
+        # Sufixo: os últimos N bytes
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def serve_certificate(request, path: Path, digest: str, filename: str):
+    """
+    Entrega o PDF gravado sem carregá-lo em memória: via X-Accel-Redirect
+    quando configurado, senão com FileResponse (sendfile do servidor WSGI),
+    com ETag para revalidação (304) e suporte a Range.
+    """
+    etag = f'"{digest}"'
+
+    response = get_conditional_response(request, etag=etag)
+    if response is not None:
+        return response
+
+    accel_prefix = settings.CERTIFICATES_ACCEL_PREFIX
+    if accel_prefix:
+        relative_path = path.relative_to(settings.CERTIFICATES_ROOT).as_posix()
+        response = HttpResponse(content_type="application/pdf")
+        response["X-Accel-Redirect"] = f"{accel_prefix.rstrip('/')}/{relative_path}"
+    else:
+        size = path.stat().st_size
+
+        byte_range = None
+        if request.headers.get("If-Range", etag) == etag:
+            byte_range = _parse_range(request.headers.get("Range"), size)
+
+        if byte_range is False:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+            return response
+
+        if byte_range:
+            start, end = byte_range
+            with path.open("rb") as pdf_file:
+                pdf_file.seek(start)
+                content = pdf_file.read(end - start + 1)
+            response = HttpResponse(content, status=206, content_type="application/pdf")
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        else:
+            response = FileResponse(path.open("rb"), content_type="application/pdf")
+
+        response["Accept-Ranges"] = "bytes"
+
+    response["ETag"] = etag
+    response["Cache-Control"] = "private, no-cache"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
+
+
+# =====================================================================
+# GERAÇÃO EM LOTE
+# =====================================================================
+
+
+def _render_to_store(job) -> None:
+    # Também executada nos processos do pool: recebe só dados serializáveis
+    path, context = job
+    write_certificate(path, render_certificate(context))
+
+
+def _event_certificate_jobs(event):
+    """
+    Emite o certificado de todos os participantes presentes.
+    Retorna ([(usuário, caminho), ...], [(caminho, contexto) dos PDFs que faltam])
+    """
+    certificates, jobs = [], []
+    for issued in issue_event_certificates(event):
+        user = issued.user
+        context = certificate_context(event, user, issued)
+        path = certificate_path(event.id, user.id, certificate_digest(context))
+        certificates.append((user, path))
+        if not path.exists():
+            jobs.append((path, context))
+    return certificates, jobs
+
+
+def generate_event_certificates(event, workers: int | None = None):
+    """
+    Emite e garante o PDF de todos os participantes presentes, renderizando
+    os que faltam em paralelo (o ReportLab é limitado por CPU, então threads
+    não ajudariam por causa do GIL). Para o comando de geração em lote: cada
+    chamada sobe novos interpretadores.
+
+    Retorna ([(usuário, caminho), ...], estatísticas da renderização)
+    """
+    certificates, jobs = _event_certificate_jobs(event)
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs) or 1)
+    started = time.perf_counter()
+
+    if jobs:
+        # "spawn": o processo pai pode ter threads e conexões abertas, que um
+        # fork copiaria; os processos filhos não acessam o banco
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=django.setup,
+        ) as executor:
+            chunksize = max(1, len(jobs) // (workers * 4))
+            list(executor.map(_render_to_store, jobs, chunksize=chunksize))
+
+    stats = {
+        "total": len(certificates),
+        "rendered": len(jobs),
+        "workers": workers,
+        "elapsed": time.perf_counter() - started,
+    }
+    return certificates, stats
+
+
+def ensure_event_certificates(event):
+    """
+    Versão para requisições web: serve os PDFs já gravados (normalmente
+    todos, gerados pelo comando generate_event_certificates) e renderiza no
+    próprio processo só os poucos que faltam, sem subir um pool por requisição.
+
+    Retorna [(usuário, caminho), ...]
+    """
+    certificates, jobs = _event_certificate_jobs(event)
+    for job in jobs:
+        _render_to_store(job)
+    return certificates
+
+
+class ZipStream(io.RawIOBase):
+    """
+    Destino não posicionável para o zipfile: acumula o que foi escrito
+    até que o gerador repasse os bytes à resposta.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_certificates_zip(certificates):
+    """
+    Gera o ZIP em pedaços, sem montar o arquivo em memória nem em disco.
+    PDFs já são comprimidos, então as entradas são apenas armazenadas.
+    """
+    stream = ZipStream()
+    used_names = set()
+
+    with zipfile.ZipFile(stream, "w", compression=zipfile.ZIP_STORED) as archive:
+        for arcname, path in certificates:
+            if arcname in used_names:
+                arcname = f"{path.stem[:8]}_{arcname}"
+            used_names.add(arcname)
+
+            with path.open("rb") as pdf_file, archive.open(arcname, "w") as entry:
+                while chunk := pdf_file.read(ZIP_CHUNK_SIZE):
+                    entry.write(chunk)
+                    yield stream.drain()
+            yield stream.drain()
+
+    yield stream.drain()
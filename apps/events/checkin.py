@@ -0,0 +1,157 @@
+import base64
+import uuid
+from datetime import timedelta
+
+from django.core import signing
+from django.db import connection, models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from reportlab.graphics import renderSVG
+from reportlab.graphics.barcode.qr import QrCodeWidget
+from reportlab.graphics.shapes import Drawing
+
+from apps.authentication.models import UserModel
+from apps.core.routers import mark_primary_written
+from apps.events.cache import invalidate_events_cache
+from apps.events.models import EventModel, EventParticipantModel
+
+
+class CheckinResult(models.TextChoices):
+    CHECKED_IN = "CHECKED_IN", _("Presença confirmada")
+    ALREADY_PRESENT = "ALREADY_PRESENT", _("Presença já confirmada")
+    UNAVAILABLE = "UNAVAILABLE", _("Check-in indisponível")
+    EXPIRED = "EXPIRED", _("QR code expirado")
+    INVALID = "INVALID", _("QR code inválido")
+
+
+CHECKIN_SALT = "apps.events.checkin"
+
+# O check-in abre um pouco antes do início e vai até o término do evento
+CHECKIN_OPENS_BEFORE = timedelta(hours=1)
+
+# O QR code vale por pouco tempo depois de gerado; o participante recarrega
+# a página do evento para obter um novo
+CHECKIN_TOKEN_MAX_AGE = timedelta(minutes=30)
+
+QR_CODE_SIZE = 220
+
+EVENTS_TABLE = EventModel._meta.db_table
+PARTICIPANTS_TABLE = EventParticipantModel._meta.db_table
+USERS_TABLE = UserModel._meta.db_table
+
+# Confirma a presença em um único comando. A inscrição só é encontrada se
+# pertencer ao evento do token, o evento for do professor que leu o QR code
+# e estiver na janela de check-in. O UPDATE reavalia o status da própria
+# linha, então leituras simultâneas do mesmo QR code gravam uma vez só.
+CHECKIN_SQL = f"""
+    WITH target AS (
+        SELECT p.id, p.status, u.first_name, u.last_name
+        FROM {PARTICIPANTS_TABLE} p
+        JOIN {EVENTS_TABLE} e ON e.id = p.event_id
+        JOIN {USERS_TABLE} u ON u.id = p.user_id
+        WHERE p.id = %(participation_id)s
+          AND p.event_id = %(event_id)s
+          AND NOT p.deleted
+          AND NOT e.deleted
+          AND e.user_id = %(teacher_id)s
+          AND e.status NOT IN (%(canceled)s, %(finished)s)
+          AND e.start_date <= %(opens_until)s
+          AND e.end_date >= %(now)s
+    ),
+    checked_in AS (
+        UPDATE {PARTICIPANTS_TABLE} p
+        SET status = %(present)s, attended_at = %(now)s, updated_at = %(now)s
+        FROM target
+        WHERE p.id = target.id AND p.status <> %(present)s
+        RETURNING p.id
+    )
+    SELECT
+        EXISTS (SELECT 1 FROM checked_in),
+        target.first_name || ' ' || target.last_name
+    FROM target
+"""
+
+
+def checkin_token(participation) -> str:
+    value = f"{participation.event_id.hex}.{participation.id.hex}"
+    return signing.TimestampSigner(salt=CHECKIN_SALT).sign(value)
+
+
+def read_checkin_token(token: str) -> tuple[uuid.UUID, uuid.UUID]:
+    """
+    Retorna (id do evento, id da inscrição) verificando apenas a assinatura
+    e a idade do token, sem consultar o banco. Lança signing.SignatureExpired
+    se o token passou de CHECKIN_TOKEN_MAX_AGE e signing.BadSignature se for
+    inválido
+    """
+    value = signing.TimestampSigner(salt=CHECKIN_SALT).unsign(
+        token, max_age=CHECKIN_TOKEN_MAX_AGE
+    )
+    try:
+        event_id, participation_id = value.split(".")
+        return uuid.UUID(event_id), uuid.UUID(participation_id)
+    except ValueError as e:
+        raise signing.BadSignature("Token de check-in malformado") from e
+
+
+def check_in(token: str, teacher_id, now=None) -> tuple[str, str | None]:
+    """
+    Confirma a presença do participante dono do token.
+    Retorna (CheckinResult, nome do participante ou None)
+    """
+    try:
+        event_id, participation_id = read_checkin_token(token)
+    except signing.SignatureExpired:
+        return CheckinResult.EXPIRED, None
+    except signing.BadSignature:
+        return CheckinResult.INVALID, None
+
+    now = now or timezone.now()
+    params = {
+        "event_id": event_id,
+        "participation_id": participation_id,
+        "teacher_id": teacher_id,
+        "canceled": EventModel.Status.CANCELED,
+        "finished": EventModel.Status.FINISHED,
+        "present": EventParticipantModel.ParticipationStatus.PRESENT,
+        "opens_until": now + CHECKIN_OPENS_BEFORE,
+        "now": now,
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(CHECKIN_SQL, params)
+        row = cursor.fetchone()
+
+    if row is None:
+        return CheckinResult.UNAVAILABLE, None
+
+    checked_in, participant_name = row
+    if not checked_in:
+        return CheckinResult.ALREADY_PRESENT, participant_name
+
+    invalidate_events_cache()
+    mark_primary_written()
+    return CheckinResult.CHECKED_IN, participant_name
+
+
+def checkin_open(event, now=None) -> bool:
+    now = now or timezone.now()
+    return (
+        event.status not in (EventModel.Status.CANCELED, EventModel.Status.FINISHED)
+        and event.start_date - CHECKIN_OPENS_BEFORE <= now <= event.end_date
+    )
+
+
+def checkin_qr_code(url: str, size: int = QR_CODE_SIZE) -> str:
+    """
+    QR code da URL de check-in como SVG em data URI, pronto para um <img>
+    """
+    widget = QrCodeWidget(url)
+    x1, y1, x2, y2 = widget.getBounds()
+    drawing = Drawing(
+        size, size, transform=[size / (x2 - x1), 0, 0, size / (y2 - y1), 0, 0]
+    )
+    drawing.add(widget)
+
+    svg = renderSVG.drawToString(drawing)
+    return "data:image/svg+xml;base64," + base64.b64encode(svg.encode()).decode()
@@ -0,0 +1,247 @@
+import uuid
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+from apps.core.routers import mark_primary_written
+from apps.events.cache import invalidate_events_cache
+from apps.events.models import (
+    EventModel,
+    EventParticipantModel,
+    WaitlistEntryModel,
+)
+from apps.events.rankings import record_enrollments
+
+
+class EnrollmentResult(models.TextChoices):
+    ENROLLED = "ENROLLED", _("Inscrito")
+    ALREADY_ENROLLED = "ALREADY_ENROLLED", _("Já inscrito")
+    FULL = "FULL", _("Lotado")
+    CLOSED = "CLOSED", _("Inscrições encerradas")
+
+
+EVENTS_TABLE = EventModel._meta.db_table
+PARTICIPANTS_TABLE = EventParticipantModel._meta.db_table
+
+# Reserva a vaga e cria a inscrição em um único comando. O UPDATE do
+# contador trava a linha do evento, então a condição de capacidade é
+# reavaliada sobre o valor mais recente e não há overbooking.
+ENROLL_SQL = f"""
+    WITH event AS (
+        SELECT status, start_date
+        FROM {EVENTS_TABLE}
+        WHERE id = %(event_id)s AND NOT deleted
+    ),
+    existing AS (
+        SELECT 1
+        FROM {PARTICIPANTS_TABLE}
+        WHERE event_id = %(event_id)s AND user_id = %(user_id)s
+    ),
+    seat AS (
+        UPDATE {EVENTS_TABLE}
+        SET participants_count = participants_count + 1
+        WHERE id = %(event_id)s
+          AND NOT deleted
+          AND status = %(open)s
+          AND start_date > %(now)s
+          AND (participants_limit IS NULL OR participants_count < participants_limit)
+          AND NOT EXISTS (SELECT 1 FROM existing)
+        RETURNING id
+    ),
+    inserted AS (
+        INSERT INTO {PARTICIPANTS_TABLE} (
+            id, event_id, user_id, status, attended_at,
+            created_at, updated_at, deleted, deleted_at
+        )
+        SELECT %(id)s, id, %(user_id)s, %(pending)s, NULL, %(now)s, %(now)s, false, NULL
+        FROM seat
+        ON CONFLICT (user_id, event_id) DO NOTHING
+        RETURNING id
+    )
+    SELECT
+        EXISTS (SELECT 1 FROM inserted),
+        EXISTS (SELECT 1 FROM seat),
+        EXISTS (SELECT 1 FROM existing),
+        event.status,
+        event.start_date
+    FROM event
+"""
+
+UNENROLL_SQL = f"""
+    WITH removed AS (
+        DELETE FROM {PARTICIPANTS_TABLE}
+        WHERE event_id = %(event_id)s AND user_id = %(user_id)s
+        RETURNING id, created_at
+    ),
+    released AS (
+        UPDATE {EVENTS_TABLE}
+        SET participants_count = participants_count - (SELECT COUNT(*) FROM removed)
+        WHERE id = %(event_id)s AND EXISTS (SELECT 1 FROM removed)
+    )
+    SELECT created_at FROM removed
+"""
+
+
+def enroll_user(event_id, user_id) -> EnrollmentResult:
+    """
+    Inscreve o usuário no evento com um único comando atômico, protegido
+    pela capacidade restante e pela unicidade (user, event).
+
+    Lança EventModel.DoesNotExist se o evento não existir
+    """
+    now = timezone.now()
+    params = {
+        "id": str(uuid.uuid4()),
+        "event_id": str(event_id),
+        "user_id": str(user_id),
+        "now": now,
+        "open": EventModel.Status.OPEN,
+        "pending": EventParticipantModel.ParticipationStatus.PENDING,
+    }
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(ENROLL_SQL, params)
+            row = cursor.fetchone()
+
+        if row is None:
+            raise EventModel.DoesNotExist()
+
+        inserted, seat_reserved, existing, status, start_date = row
+
+        if inserted:
+            record_enrollments(event_id)
+            invalidate_events_cache()
+            mark_primary_written()
+            return EnrollmentResult.ENROLLED
+
+        if seat_reserved:
+            # Inscrição concorrente do mesmo usuário venceu o ON CONFLICT:
+            # desfaz a reserva da vaga.
+            transaction.set_rollback(True)
+            return EnrollmentResult.ALREADY_ENROLLED
+
+    if existing:
+        return EnrollmentResult.ALREADY_ENROLLED
+
+    if status != EventModel.Status.OPEN or start_date <= now:
+        return EnrollmentResult.CLOSED
+
+    return EnrollmentResult.FULL
+
+
+def unenroll_user(event_id, user_id) -> bool:
+    """
+    Remove a inscrição e libera a vaga no mesmo comando.
+    Retorna True se o usuário estava inscrito
+    """
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                UNENROLL_SQL, {"event_id": str(event_id), "user_id": str(user_id)}
+            )
+            row = cursor.fetchone()
+
+        if row is None:
+            return False
+
+        # A inscrição só sai das janelas de 24h/7d em que ainda estava
+        record_enrollments(event_id, -1, enrolled_at=row[0])
+        invalidate_events_cache()
+        mark_primary_written()
+
+    return True
+
+
+# =====================================================================
+# LISTA DE ESPERA
+# =====================================================================
+
+
+def join_waitlist(event_id, user_id) -> int:
+    """
+    Coloca o usuário no fim da lista de espera do evento (idempotente).
+    Retorna a posição atual dele na fila, começando em 1
+    """
+    WaitlistEntryModel.objects.get_or_create(event_id=event_id, user_id=user_id)
+    return waitlist_position(event_id, user_id)
+
+
+def leave_waitlist(event_id, user_id) -> bool:
+    removed, _deleted = WaitlistEntryModel.objects.filter(
+        event_id=event_id, user_id=user_id
+    ).delete()
+    return bool(removed)
+
+
+def waitlist_position(event_id, user_id) -> int | None:
+    entry = WaitlistEntryModel.objects.filter(
+        event_id=event_id, user_id=user_id
+    ).first()
+
+    if not entry:
+        return None
+
+    return WaitlistEntryModel.objects.filter(
+        event_id=event_id, position__lte=entry.position
+    ).count()
+
+
+def promote_waitlist(event_id) -> int:
+    """
+    Inscreve os primeiros N usuários da lista de espera, onde N é o número
+    de vagas livres, em uma única transação. A linha do evento fica travada
+    durante a promoção, o que também bloqueia inscrições concorrentes
+    (enroll_user precisa da mesma trava para reservar vaga).
+
+    Retorna a quantidade de usuários promovidos
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        event = (
+            EventModel.objects.select_for_update()
+            .filter(id=event_id, status=EventModel.Status.OPEN, start_date__gt=now)
+            .first()
+        )
+
+        if not event:
+            return 0
+
+        waitlist = WaitlistEntryModel.objects.filter(event_id=event_id)
+
+        # Quem já conseguiu a vaga por outro caminho sai da fila
+        waitlist.filter(
+            user_id__in=EventParticipantModel.objects.filter(event_id=event_id).values(
+                "user_id"
+            )
+        ).delete()
+
+        waitlist = waitlist.order_by("position")
+        if event.participants_limit:
+            free = event.participants_limit - event.participants_count
+            if free <= 0:
+                return 0
+            waitlist = waitlist[:free]
+
+        entries = list(waitlist.values_list("id", "user_id"))
+        if not entries:
+            return 0
+
+        EventParticipantModel.objects.bulk_create(
+            [
+                EventParticipantModel(event_id=event_id, user_id=user_id)
+                for _entry_id, user_id in entries
+            ]
+        )
+        WaitlistEntryModel.objects.filter(
+            id__in=[entry_id for entry_id, _user_id in entries]
+        ).delete()
+        EventModel.objects.filter(id=event_id).update(
+            participants_count=models.F("participants_count") + len(entries)
+        )
+        record_enrollments(event_id, len(entries))
+        invalidate_events_cache()
+
+    return len(entries)
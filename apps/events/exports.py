@@ -0,0 +1,221 @@
+import csv
+import itertools
+import zipfile
+from xml.sax.saxutils import escape
+
+from django.utils import timezone
+
+from apps.events.archive import event_participations
+from apps.events.certificates import ZipStream
+from apps.events.models import ArchivedParticipantModel, EventParticipantModel
+
+# Linhas buscadas por vez no cursor do servidor
+EXPORT_CHUNK_SIZE = 2000
+
+ROSTER_HEADER = (
+    "Evento",
+    "Início do evento",
+    "Participante",
+    "E-mail",
+    "Status",
+    "Inscrito em",
+    "Presença confirmada em",
+)
+
+ROSTER_FIELDS = (
+    "status",
+    "attended_at",
+    "created_at",
+    "user__first_name",
+    "user__last_name",
+    "user__email",
+    "event__name",
+    "event__start_date",
+)
+
+
+def _format_datetime(value, tz) -> str:
+    return value.astimezone(tz).strftime("%d/%m/%Y %H:%M") if value else ""
+
+
+def roster_rows(*, event=None, teacher=None):
+    """
+    Linhas da lista de chamada de um evento ou de todos os eventos de um
+    professor. O iterator usa um cursor no servidor, então a memória não
+    cresce com o tamanho da lista.
+    """
+    if event is not None:
+        sources = [event_participations(event)]
+    else:
+        # Eventos arquivados são os mais antigos: vêm antes na lista
+        sources = [
+            ArchivedParticipantModel.objects.filter(event__user=teacher),
+            EventParticipantModel.objects.filter(event__user=teacher),
+        ]
+
+    # Resolvidos uma vez: rótulos traduzidos e fuso custam caro por linha
+    statuses = {
+        value: str(label)
+        for value, label in EventParticipantModel.ParticipationStatus.choices
+    }
+    tz = timezone.get_current_timezone()
+
+    participations = itertools.chain.from_iterable(
+        source.select_related("user", "event")
+        .only(*ROSTER_FIELDS)
+        .order_by(
+            "event__start_date", "event_id", "user__first_name", "user__last_name"
+        )
+        .iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        for source in sources
+    )
+
+    for participation in participations:
+        user, participation_event = participation.user, participation.event
+        yield (
+            participation_event.name,
+            _format_datetime(participation_event.start_date, tz),
+            f"{user.first_name} {user.last_name}",
+            user.email,
+            statuses.get(participation.status, participation.status),
+            _format_datetime(participation.created_at, tz),
+            _format_datetime(participation.attended_at, tz),
+        )
+
+
+# =====================================================================
+# CSV
+# =====================================================================
+
+
+class _Echo:
+    """
+    "Arquivo" do csv.writer que devolve a linha formatada em vez de gravá-la
+    """
+
+    def write(self, value):
+        return value
+
+
+# Início de célula que Excel/LibreOffice interpretam como fórmula
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _csv_cell(value: str) -> str:
+    """
+    Nomes e e-mails vêm do cadastro dos próprios usuários: um valor como
+    `=HYPERLINK(...)` viraria fórmula ao abrir o CSV. O apóstrofo faz a
+    planilha tratá-lo como texto. No XLSX as células já são texto (inlineStr)
+    e nunca são avaliadas.
+    """
+    if value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows, header=ROSTER_HEADER):
+    writer = csv.writer(_Echo())
+    # BOM para o Excel reconhecer o UTF-8 (acentos nos nomes)
+    yield "\ufeff" + writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+# =====================================================================
+# XLSX
+# =====================================================================
+
+# Partes mínimas de uma planilha OOXML com uma única aba
+XLSX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" '
+    'ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/'
+    'vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    "</Types>"
+)
+
+XLSX_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    "</Relationships>"
+)
+
+XLSX_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Lista de chamada" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+
+XLSX_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/'
+    'officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    "</Relationships>"
+)
+
+XLSX_SHEET_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    "<sheetData>"
+)
+
+XLSX_SHEET_END = "</sheetData></worksheet>"
+
+
+def _xlsx_row(values) -> str:
+    # Texto inline: dispensa a tabela de strings compartilhadas, que
+    # exigiria conhecer todas as linhas antes de gravar a aba
+    cells = "".join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+        for value in values
+    )
+    return f"<row>{cells}</row>"
+
+
+def stream_xlsx(rows, header=ROSTER_HEADER):
+    """
+    Gera a planilha em pedaços: a aba é comprimida à medida que as linhas
+    chegam e cada trecho pronto do ZIP é repassado à resposta.
+    """
+    stream = ZipStream()
+
+    with zipfile.ZipFile(
+        stream, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6
+    ) as archive:
+        archive.writestr("[Content_Types].xml", XLSX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", XLSX_ROOT_RELS)
+        archive.writestr("xl/workbook.xml", XLSX_WORKBOOK)
+        archive.writestr("xl/_rels/workbook.xml.rels", XLSX_WORKBOOK_RELS)
+
+        with archive.open("xl/worksheets/sheet1.xml", "w") as sheet:
+            sheet.write(XLSX_SHEET_START.encode())
+            sheet.write(_xlsx_row(header).encode())
+            for row in rows:
+                sheet.write(_xlsx_row(row).encode())
+                if chunk := stream.drain():
+                    yield chunk
+            sheet.write(XLSX_SHEET_END.encode())
+
+        yield stream.drain()
+
+    yield stream.drain()
+
+
+# Formato na URL -> (gerador, content type)
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv; charset=utf-8"),
+    "xlsx": (
+        stream_xlsx,
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ),
+}
@@ -1,7 +1,33 @@
+from datetime import datetime, time, timedelta
+
 from django import forms
 from django.utils import timezone
 
-from apps.events.models import EventModel
+from apps.events.browse import decode_cursor
+from apps.events.models import CategoryModel, EventModel
+
+
+def normalize_topic(topic: str) -> str:
+    return " ".join(topic.split()).lower()
+
+
+def normalize_topics(topics) -> list[str]:
+    """
+    Caixa e espaços padronizados, sem vazios nem repetidos, para que
+    "IA", " ia " e "Ia" contem como o mesmo tópico nas facetas
+    """
+    return list(dict.fromkeys(filter(None, map(normalize_topic, topics))))
+
+
+class TopicListField(forms.Field):
+    """
+    Lista de tópicos vinda de parâmetros repetidos (?topic=a&topic=b)
+    """
+
+    widget = forms.MultipleHiddenInput
+
+    def to_python(self, value):
+        return normalize_topics(value or [])
 
 
 class EventForm(forms.ModelForm):
@@ -139,13 +165,10 @@ class EventForm(forms.ModelForm):
         topics = self.cleaned_data.get("topics", "")
         if isinstance(topics, str):
             # Processar string separada por vírgulas
-            topics_list = [
-                topic.strip() for topic in topics.split(",") if topic.strip()
-            ]
-            if not topics_list:
+            topics = [topic for topic in topics.split(",") if topic.strip()]
+            if not topics:
                 raise forms.ValidationError("Adicione pelo menos um tópico.")
-            return topics_list
-        return topics
+        return normalize_topics(topics)
 
     def clean_participants_limit(self):
         participants_limit = self.cleaned_data.get("participants_limit")
@@ -176,3 +199,91 @@ class EventForm(forms.ModelForm):
                 )
 
         return cleaned_data
+
+
+FILTER_INPUT_CLASS = "appearance-none block w-full px-3 py-2 border border-gray-300 rounded-lg placeholder-gray-400 focus:outline-none focus:ring-2 focus:ring-purple-500 focus:border-purple-500 transition duration-300"
+
+
+class EventBrowseForm(forms.Form):
+    category = forms.ModelChoiceField(
+        queryset=CategoryModel.objects.order_by("name"),
+        required=False,
+        empty_label="Todas as categorias",
+        widget=forms.Select(attrs={"class": FILTER_INPUT_CLASS}),
+    )
+    city = forms.CharField(
+        required=False,
+        widget=forms.TextInput(
+            attrs={"placeholder": "Cidade", "class": FILTER_INPUT_CLASS}
+        ),
+    )
+    state = forms.CharField(
+        required=False,
+        widget=forms.TextInput(
+            attrs={"placeholder": "Estado", "class": FILTER_INPUT_CLASS}
+        ),
+    )
+    start_from = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date", "class": FILTER_INPUT_CLASS}),
+    )
+    start_until = forms.DateField(
+        required=False,
+        widget=forms.DateInput(attrs={"type": "date", "class": FILTER_INPUT_CLASS}),
+    )
+    status = forms.ChoiceField(
+        choices=[("", "Todos os status"), *EventModel.Status.choices],
+        required=False,
+        widget=forms.Select(attrs={"class": FILTER_INPUT_CLASS}),
+    )
+    topic = TopicListField(required=False)
+    mine = forms.BooleanField(required=False)
+    cursor = forms.CharField(required=False, widget=forms.HiddenInput)
+
+    def clean_city(self):
+        return self.cleaned_data.get("city", "").strip()
+
+    def clean_state(self):
+        return self.cleaned_data.get("state", "").strip()
+
+    def clean_start_from(self):
+        start_from = self.cleaned_data.get("start_from")
+        if start_from:
+            return timezone.make_aware(datetime.combine(start_from, time.min))
+        return None
+
+    def clean_start_until(self):
+        # Inclusivo: o dia informado inteiro entra no filtro
+        start_until = self.cleaned_data.get("start_until")
+        if start_until:
+            return timezone.make_aware(
+                datetime.combine(start_until + timedelta(days=1), time.min)
+            )
+        return None
+
+    def clean_cursor(self):
+        cursor = self.cleaned_data.get("cursor")
+        if not cursor:
+            return None
+        try:
+            return decode_cursor(cursor)
+        except ValueError:
+            raise forms.ValidationError("Página inválida.")
+
+
+class EventSearchForm(forms.Form):
+    q = forms.CharField(
+        max_length=100,
+        required=False,
+        widget=forms.TextInput(
+            attrs={
+                "type": "search",
+                "placeholder": "Buscar por nome, tópico ou descrição",
+                "class": FILTER_INPUT_CLASS,
+            }
+        ),
+    )
+    page = forms.IntegerField(min_value=1, required=False)
+
+    def clean_q(self):
+        return self.cleaned_data.get("q", "").strip()
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.archive import ARCHIVE_AFTER_MONTHS, ARCHIVE_BATCH_SIZE, archive_events
+
+
+class Command(BaseCommand):
+    help = (
+        "Move para a tabela de arquivo as inscrições dos eventos finalizados "
+        "ou cancelados há mais de N meses, um lote de eventos por transação."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=ARCHIVE_AFTER_MONTHS,
+            help=f"Idade mínima do término do evento (padrão: {ARCHIVE_AFTER_MONTHS}).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ARCHIVE_BATCH_SIZE,
+            help=f"Eventos por transação (padrão: {ARCHIVE_BATCH_SIZE}).",
+        )
+
+    def handle(self, *args, **options):
+        total_events = total_participations = 0
+
+        for events, participations in archive_events(
+            months=options["months"], batch_size=options["batch_size"]
+        ):
+            total_events += events
+            total_participations += participations
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"{events} evento(s), {participations} inscrição(ões)"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{total_events} evento(s) arquivado(s), "
+                f"{total_participations} inscrição(ões) movida(s)."
+            )
+        )
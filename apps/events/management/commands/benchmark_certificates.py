@@ -0,0 +1,111 @@
+import statistics
+import time
+from datetime import timedelta
+from io import BytesIO
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from reportlab.lib.units import cm
+from reportlab.platypus import SimpleDocTemplate, Spacer
+
+from apps.events.certificates import CertificateTemplate, ascii85_streams
+
+
+def platypus_render(template: CertificateTemplate, context: dict) -> bytes:
+    """
+    Renderização anterior: o mesmo conteúdo, mas diagramado a cada
+    certificado pelo doc.build completo do Platypus.
+    """
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(
+        buffer,
+        pagesize=template.page_size,
+        leftMargin=2 * cm,
+        rightMargin=2 * cm,
+        topMargin=2 * cm,
+        bottomMargin=2 * cm,
+        title=f"Certificado - {context['event_name']}",
+    )
+    story = [
+        Spacer(1, item) if isinstance(item, (int, float)) else item
+        for item in template.story(context)
+    ]
+
+    with ascii85_streams(template.ascii85):
+        doc.build(
+            story,
+            onFirstPage=lambda canvas_obj, _doc: template.draw_page(
+                canvas_obj, context
+            ),
+        )
+    return buffer.getvalue()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a latência por certificado da diagramação pelo Platypus e do "
+        "template pré-compilado, com e sem o filtro ASCII85 dos streams."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        start_date = timezone.now() - timedelta(days=1)
+        contexts = [
+            {
+                "code": f"SNSP-BENC-HMAR-K000-{i:04d}",
+                "issued_at": timezone.now(),
+                "first_name": f"Participante{i}",
+                "last_name": "de Teste",
+                "event_name": "Semana de Tecnologia e Inovação",
+                "city": "São Paulo",
+                "state": "SP",
+                "country": "Brasil",
+                "start_date": start_date,
+                "end_date": start_date + timedelta(hours=4),
+            }
+            for i in range(iterations)
+        ]
+
+        # Os templates são montados uma vez por processo, fora da medição
+        templates = {ascii85: CertificateTemplate(ascii85) for ascii85 in (True, False)}
+
+        # Cada renderizador é comparado com o mesmo ASCII85; o ganho de
+        # desligar o filtro aparece em uma linha separada
+        means = {}
+        for ascii85, template in templates.items():
+            for label, renderer in [
+                ("Platypus", lambda context: platypus_render(template, context)),
+                ("pré-compilado", template.render),
+            ]:
+                renderer(contexts[0])  # aquecimento (fontes, imports)
+
+                timings = []
+                for context in contexts:
+                    started = time.perf_counter()
+                    renderer(context)
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                timings.sort()
+                p95 = timings[int(len(timings) * 0.95) - 1]
+                means[label, ascii85] = statistics.mean(timings)
+                self.stdout.write(
+                    f"{label:>14} {'com' if ascii85 else 'sem'} A85: "
+                    f"média {means[label, ascii85]:6.2f} ms | "
+                    f"p50 {statistics.median(timings):6.2f} ms | p95 {p95:6.2f} ms"
+                )
+
+        for ascii85 in (True, False):
+            speedup = means["Platypus", ascii85] / means["pré-compilado", ascii85]
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Template pré-compilado ({'com' if ascii85 else 'sem'} A85): "
+                    f"{speedup:.1f}x"
+                )
+            )
+        speedup = means["pré-compilado", True] / means["pré-compilado", False]
+        self.stdout.write(
+            self.style.SUCCESS(f"Sem ASCII85 (pré-compilado): {speedup:.1f}x")
+        )
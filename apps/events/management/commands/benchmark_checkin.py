@@ -0,0 +1,144 @@
+import statistics
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.authentication.models import UserModel
+from apps.events.checkin import check_in, checkin_token, read_checkin_token
+from apps.events.models import CategoryModel, EventModel, EventParticipantModel
+
+
+def legacy_check_in(token, teacher_id):
+    """
+    Caminho anterior: carrega a inscrição, confere o dono do evento e grava
+    com save() (full_clean incluso), como a lista de chamada fazia.
+    """
+    event_id, participation_id = read_checkin_token(token)
+    record = EventParticipantModel.objects.select_related("event").get(
+        id=participation_id, event_id=event_id
+    )
+    if record.event.user_id != teacher_id:
+        return None
+    record.status = EventParticipantModel.ParticipationStatus.PRESENT
+    record.save()
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a vazão de uma rajada de check-ins simultâneos em um evento: "
+        "gravação via save() contra o UPDATE condicional."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--participants", type=int, default=500)
+        parser.add_argument("--threads", type=int, default=8)
+
+    def handle(self, *args, **options):
+        total = options["participants"]
+        threads = options["threads"]
+
+        self.stdout.write(f"Criando um evento com {total} inscritos...")
+        teacher, student_ids, event, tokens = self._seed(total)
+
+        try:
+            results = []
+            for label, runner in [
+                ("save()", legacy_check_in),
+                ("UPDATE condicional", check_in),
+            ]:
+                EventParticipantModel.objects.filter(event=event).update(
+                    status=EventParticipantModel.ParticipationStatus.PENDING,
+                    attended_at=None,
+                )
+
+                started = time.perf_counter()
+                latencies = self._burst(runner, tokens, teacher.id, threads)
+                elapsed = time.perf_counter() - started
+
+                present = EventParticipantModel.objects.filter(
+                    event=event,
+                    status=EventParticipantModel.ParticipationStatus.PRESENT,
+                ).count()
+                results.append((label, elapsed, latencies, present))
+
+            self.stdout.write("")
+            for label, elapsed, latencies, present in results:
+                latencies.sort()
+                p95 = latencies[int(len(latencies) * 0.95) - 1]
+                self.stdout.write(
+                    f"{label:>18}: {total / elapsed:8.0f} check-ins/s | "
+                    f"p50 {statistics.median(latencies):6.2f} ms | "
+                    f"p95 {p95:6.2f} ms | {present} presentes"
+                )
+
+            speedup = results[0][1] / results[1][1] if results[1][1] else 0
+            self.stdout.write(self.style.SUCCESS(f"Ganho: {speedup:.1f}x"))
+
+        finally:
+            event.delete()
+            UserModel.objects.filter(id__in=[teacher.id, *student_ids]).delete()
+
+    def _burst(self, runner, tokens, teacher_id, threads):
+        def worker(chunk):
+            latencies = []
+            try:
+                for token in chunk:
+                    started = time.perf_counter()
+                    runner(token, teacher_id)
+                    latencies.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+            return latencies
+
+        chunks = [tokens[i::threads] for i in range(threads)]
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return [
+                latency
+                for latencies in executor.map(worker, chunks)
+                for latency in latencies
+            ]
+
+    def _seed(self, total):
+        suffix = uuid.uuid4().hex[:8]
+        teacher = UserModel.objects.create(
+            email=f"bench-teacher-{suffix}@sinapse.local",
+            first_name="Bench",
+            last_name="Teacher",
+            role=UserModel.Role.TEACHER,
+        )
+        students = UserModel.objects.bulk_create(
+            [
+                UserModel(
+                    email=f"bench-student-{i}-{suffix}@sinapse.local",
+                    first_name="Bench",
+                    last_name=f"Student {i}",
+                    role=UserModel.Role.STUDENT,
+                )
+                for i in range(total)
+            ]
+        )
+
+        # Evento em andamento: dentro da janela de check-in
+        now = timezone.now()
+        event = EventModel.objects.create(
+            name="Benchmark check-in",
+            street="Rua do Benchmark, 1",
+            city="São Paulo",
+            state="SP",
+            zip_code="01000000",
+            start_date=now + timedelta(minutes=5),
+            end_date=now + timedelta(hours=2),
+            category=CategoryModel.objects.first(),
+            user=teacher,
+        )
+        participations = EventParticipantModel.objects.bulk_create(
+            [EventParticipantModel(event=event, user=student) for student in students]
+        )
+
+        tokens = [checkin_token(participation) for participation in participations]
+        return teacher, [student.id for student in students], event, tokens
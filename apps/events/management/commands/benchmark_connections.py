@@ -0,0 +1,83 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from apps.events.benchmarks import BenchmarkDataset, run_concurrent_requests
+
+# Cada modo roda em um processo próprio, com as configurações de banco
+# vindas do ambiente como em produção (config/settings.py)
+MODES = [
+    ("sem pool", {"DATABASE_POOL": "0", "DATABASE_CONN_MAX_AGE": "0"}),
+    ("persistente", {"DATABASE_POOL": "0", "DATABASE_CONN_MAX_AGE": "60"}),
+    ("pool", {"DATABASE_POOL": "1"}),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mede a latência por requisição com clientes simultâneos abrindo uma "
+        "conexão por requisição, com conexões persistentes e com o pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, default=8)
+        parser.add_argument("--requests", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=42)
+        # Uso interno: executa um modo e imprime o resultado em JSON
+        parser.add_argument("--worker", metavar="PATH", help="(interno)")
+
+    def handle(self, *args, **options):
+        if options["worker"]:
+            results = run_concurrent_requests(
+                options["worker"], options["clients"], options["requests"]
+            )
+            self.stdout.write(json.dumps(results))
+            return
+
+        dataset = BenchmarkDataset(
+            teachers=2, students=50, events=5, participants=20, seed=options["seed"]
+        )
+        path = reverse("event_details", args=[dataset.open_event.id])
+        self.stdout.write(
+            f"{options['clients']} clientes x {options['requests']} requisições "
+            f"em {path}"
+        )
+
+        try:
+            results = [
+                (label, self.run_mode(path, env, options)) for label, env in MODES
+            ]
+        finally:
+            dataset.delete()
+
+        self.stdout.write("")
+        for label, result in results:
+            self.stdout.write(
+                f"{label:>12}: p50 {result['p50']:7.2f} ms | "
+                f"p95 {result['p95']:7.2f} ms | {result['throughput']:7.1f} req/s | "
+                f"{result['connections']:5d} conexões abertas"
+            )
+
+    def run_mode(self, path, env, options):
+        command = [
+            sys.executable,
+            str(settings.BASE_DIR / "manage.py"),
+            "benchmark_connections",
+            "--worker",
+            path,
+            "--clients",
+            str(options["clients"]),
+            "--requests",
+            str(options["requests"]),
+        ]
+        process = subprocess.run(
+            command, env={**os.environ, **env}, capture_output=True, text=True
+        )
+        if process.returncode:
+            raise CommandError(process.stderr.strip())
+        return json.loads(process.stdout.strip().splitlines()[-1])
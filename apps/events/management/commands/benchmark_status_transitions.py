@@ -0,0 +1,148 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.authentication.models import UserModel
+from apps.events.models import CategoryModel, EventModel, EventParticipantModel
+from apps.events.status import (
+    auto_close_event,
+    auto_finish_event,
+    update_events_status_bulk,
+)
+
+
+def legacy_update_events_status(now):
+    """
+    Reproduz o laço anterior: busca os ids e trava, relê e atualiza
+    cada evento em sua própria transação.
+    """
+    events_to_close = EventModel.objects.filter(
+        status=EventModel.Status.OPEN, start_date__lte=now
+    ).values_list("id", flat=True)
+
+    for event_id in events_to_close:
+        auto_close_event(event_id)
+
+    events_to_finish = EventModel.objects.filter(
+        status=EventModel.Status.CLOSED, end_date__lte=now
+    ).values_list("id", flat=True)
+
+    for event_id in events_to_finish:
+        auto_finish_event(event_id)
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara o laço evento a evento com as transições em lote "
+        "(UPDATE condicional) sobre N eventos vencidos."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--events", type=int, default=10_000)
+        parser.add_argument("--batch-size", type=int, default=2_000)
+
+    def handle(self, *args, **options):
+        total = options["events"]
+        batch_size = options["batch_size"]
+
+        self.stdout.write(f"Criando {total} eventos vencidos...")
+        teacher, student, event_ids = self._seed(total, batch_size)
+
+        try:
+            results = []
+            for label, runner in [
+                ("laço por evento", legacy_update_events_status),
+                ("em lote", update_events_status_bulk),
+            ]:
+                self._reset(event_ids)
+
+                counter = QueryCounter()
+                with connection.execute_wrapper(counter):
+                    started = time.perf_counter()
+                    runner(timezone.now())
+                    elapsed = time.perf_counter() - started
+
+                finished = EventModel.objects.filter(
+                    id__in=event_ids, status=EventModel.Status.FINISHED
+                ).count()
+                results.append((label, elapsed, counter.count, finished))
+
+            self.stdout.write("")
+            for label, elapsed, queries, finished in results:
+                self.stdout.write(
+                    f"{label:>16}: {elapsed * 1000:10.1f} ms | "
+                    f"{queries:6d} queries | {finished} finalizados"
+                )
+
+            speedup = results[0][1] / results[1][1] if results[1][1] else 0
+            self.stdout.write(self.style.SUCCESS(f"Ganho: {speedup:.1f}x"))
+
+        finally:
+            EventModel.objects.filter(id__in=event_ids).delete()
+            UserModel.objects.filter(id__in=[teacher.id, student.id]).delete()
+
+    def _seed(self, total, batch_size):
+        suffix = uuid.uuid4().hex[:8]
+        teacher = UserModel.objects.create(
+            email=f"bench-teacher-{suffix}@sinapse.local",
+            first_name="Bench",
+            last_name="Teacher",
+            role=UserModel.Role.TEACHER,
+        )
+        student = UserModel.objects.create(
+            email=f"bench-student-{suffix}@sinapse.local",
+            first_name="Bench",
+            last_name="Student",
+            role=UserModel.Role.STUDENT,
+        )
+        category = CategoryModel.objects.first()
+        now = timezone.now()
+
+        # bulk_create ignora o full_clean, que recusaria datas no passado
+        events = [
+            EventModel(
+                name=f"Benchmark {i}",
+                street="Rua do Benchmark, 1",
+                city="São Paulo",
+                state="SP",
+                zip_code="01000000",
+                start_date=now - timedelta(hours=3),
+                end_date=now - timedelta(hours=1),
+                category=category,
+                user=teacher,
+            )
+            for i in range(total)
+        ]
+        EventModel.objects.bulk_create(events, batch_size=batch_size)
+
+        EventParticipantModel.objects.bulk_create(
+            [
+                EventParticipantModel(
+                    event=event,
+                    user=student,
+                    status=EventParticipantModel.ParticipationStatus.PRESENT,
+                )
+                for event in events
+            ],
+            batch_size=batch_size,
+        )
+
+        return teacher, student, [event.id for event in events]
+
+    def _reset(self, event_ids):
+        EventModel.objects.filter(id__in=event_ids).update(
+            status=EventModel.Status.OPEN
+        )
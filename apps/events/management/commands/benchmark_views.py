@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.benchmarks import (
+    BASELINE_PATH,
+    DEFAULT_DATASET,
+    LATENCY_TOLERANCE,
+    BenchmarkDataset,
+    compare_to_baseline,
+    load_baseline,
+    run_view_benchmarks,
+    save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria uma massa de dados, mede p50/p95 e consultas das principais "
+        "views e compara com a linha de base gravada."
+    )
+
+    def add_arguments(self, parser):
+        for name, default in DEFAULT_DATASET.items():
+            parser.add_argument(f"--{name}", type=int, default=default)
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--baseline", default=str(BASELINE_PATH))
+        parser.add_argument("--tolerance", type=float, default=LATENCY_TOLERANCE)
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Grava o resultado como a nova linha de base",
+        )
+
+    def handle(self, *args, **options):
+        sizes = {name: options[name] for name in DEFAULT_DATASET}
+        self.stdout.write(
+            "Criando massa de dados: "
+            + ", ".join(f"{total} {name}" for name, total in sizes.items())
+        )
+        dataset = BenchmarkDataset(**sizes, seed=options["seed"])
+
+        try:
+            results = run_view_benchmarks(dataset, options["iterations"])
+        finally:
+            dataset.delete()
+
+        baseline = load_baseline(options["baseline"])
+        self.stdout.write("")
+        for name, current in results.items():
+            reference = baseline.get(name)
+            reference_text = (
+                f" | base p95 {reference['p95']:7.2f} ms, {reference['queries']:3d} q"
+                if reference
+                else ""
+            )
+            self.stdout.write(
+                f"{name:>20}: p50 {current['p50']:7.2f} ms | "
+                f"p95 {current['p95']:7.2f} ms | {current['queries']:3d} consultas"
+                f"{reference_text}"
+            )
+
+        if options["save_baseline"]:
+            save_baseline(results, options["baseline"])
+            self.stdout.write(self.style.SUCCESS("Linha de base atualizada."))
+            return
+
+        regressions = compare_to_baseline(results, baseline, options["tolerance"])
+        if regressions:
+            raise CommandError("Regressões:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("Sem regressões."))
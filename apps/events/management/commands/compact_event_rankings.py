@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.rankings import compact_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula o ranking de popularidade e a pontuação em alta dos "
+        "eventos futuros e remove os eventos que já começaram."
+    )
+
+    def handle(self, *args, **options):
+        refreshed, removed = compact_rankings()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{refreshed} ranking(s) recalculado(s), {removed} removido(s)."
+            )
+        )
@@ -0,0 +1,53 @@
+import uuid
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.events.certificates import generate_event_certificates
+from apps.events.models import EventModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera em paralelo os certificados de todos os participantes presentes "
+        "de eventos finalizados e informa o tempo e a vazão da renderização."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("event_ids", nargs="+", help="IDs dos eventos.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Processos de renderização (padrão: número de núcleos).",
+        )
+
+    def handle(self, *args, **options):
+        for event_id in options["event_ids"]:
+            try:
+                event = EventModel.objects.with_effective_status().get(
+                    id=uuid.UUID(event_id)
+                )
+            except (ValueError, EventModel.DoesNotExist):
+                raise CommandError(f"Evento {event_id} não encontrado.")
+
+            if event.status != EventModel.Status.FINISHED:
+                self.stderr.write(f"{event.name}: evento não finalizado, ignorado.")
+                continue
+
+            _certificates, stats = generate_event_certificates(
+                event, workers=options["workers"]
+            )
+
+            rendered, elapsed = stats["rendered"], stats["elapsed"]
+            line = (
+                f"{event.name}: {rendered} gerado(s), "
+                f"{stats['total'] - rendered} já existente(s)"
+            )
+            if rendered:
+                rate = rendered / elapsed
+                line += (
+                    f" em {elapsed:.2f}s com {stats['workers']} processo(s) — "
+                    f"{rate:.1f} certificados/s, "
+                    f"{rate / stats['workers']:.1f}/s por núcleo"
+                )
+            self.stdout.write(self.style.SUCCESS(line))
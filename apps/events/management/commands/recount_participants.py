@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from apps.events.models import EventModel
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula o contador desnormalizado participants_count dos eventos "
+        "a partir das inscrições, corrigindo apenas os que divergiram."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--event",
+            action="append",
+            dest="event_ids",
+            help="Restringe a correção a um evento (pode ser repetido).",
+        )
+
+    def handle(self, *args, **options):
+        events = EventModel.objects.all()
+
+        if options["event_ids"]:
+            events = events.filter(id__in=options["event_ids"])
+
+        fixed = events.recount_participants()
+
+        self.stdout.write(
+            self.style.SUCCESS(f"{fixed} evento(s) com contador corrigido.")
+        )
@@ -0,0 +1,103 @@
+import time
+import zlib
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from apps.events.status import StatusTransitionScheduler
+
+# Chave do advisory lock do Postgres que garante um único agendador ativo
+SCHEDULER_LOCK_ID = zlib.crc32(b"sinapse.events.status_scheduler")
+
+
+def try_advisory_lock(lock_id: int) -> bool:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [lock_id])
+        return cursor.fetchone()[0]
+
+
+def advisory_unlock(lock_id: int) -> None:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_advisory_unlock(%s)", [lock_id])
+
+
+class Command(BaseCommand):
+    help = (
+        "Executa o agendador que fecha e finaliza eventos automaticamente "
+        "quando start_date/end_date vencem. Apenas um nó executa por vez "
+        "(advisory lock do Postgres); os demais ficam em espera."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=int,
+            default=60,
+            help="Intervalo em segundos para recarregar o índice de transições.",
+        )
+        parser.add_argument(
+            "--horizon",
+            type=int,
+            default=10,
+            help="Janela em minutos de transições futuras mantidas em memória.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Aplica as transições vencidas uma única vez e encerra.",
+        )
+
+    def handle(self, *args, **options):
+        interval = options["interval"]
+        scheduler = StatusTransitionScheduler(
+            horizon=timedelta(minutes=options["horizon"])
+        )
+
+        while not try_advisory_lock(SCHEDULER_LOCK_ID):
+            if options["once"]:
+                self.stdout.write("Outro agendador está em execução. Encerrando.")
+                return
+            self.stdout.write("Outro agendador está em execução. Aguardando...")
+            time.sleep(interval)
+
+        self.stdout.write(self.style.SUCCESS("Agendador de status iniciado."))
+
+        try:
+            if options["once"]:
+                scheduler.load()
+                self._report(scheduler.run_due())
+                return
+
+            self._loop(scheduler, interval)
+
+        except KeyboardInterrupt:
+            self.stdout.write("Agendador interrompido.")
+        finally:
+            advisory_unlock(SCHEDULER_LOCK_ID)
+
+    def _loop(self, scheduler: StatusTransitionScheduler, interval: int):
+        next_load = timezone.now()
+
+        while True:
+            now = timezone.now()
+
+            if now >= next_load:
+                scheduler.load(now)
+                next_load = now + timedelta(seconds=interval)
+
+            self._report(scheduler.run_due(now))
+
+            # Dorme até a próxima transição ou a próxima recarga do índice
+            wake_at = min(filter(None, [scheduler.next_due(), next_load]))
+            time.sleep(max(0.0, (wake_at - timezone.now()).total_seconds()))
+
+    def _report(self, applied: dict[str, int]):
+        closed = applied[StatusTransitionScheduler.CLOSE]
+        finished = applied[StatusTransitionScheduler.FINISH]
+        if closed or finished:
+            self.stdout.write(
+                f"[{timezone.now():%Y-%m-%d %H:%M:%S}] "
+                f"{closed} evento(s) fechado(s), {finished} finalizado(s)."
+            )
@@ -0,0 +1,441 @@
+import random
+import time
+import uuid
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.authentication.models import UserModel
+from apps.events.cache import invalidate_events_cache
+from apps.events.models import CategoryModel, EventModel, EventParticipantModel
+from apps.events.rankings import compact_rankings
+
+USER_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "deleted",
+    "first_name",
+    "last_name",
+    "email",
+    "password",
+    "role",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+    "date_joined",
+)
+
+EVENT_COLUMNS = (
+    "id",
+    "created_at",
+    "updated_at",
+    "deleted",
+    "name",
+    "description",
+    "topics",
+    "street",
+    "city",
+    "state",
+    "country",
+    "zip_code",
+    "start_date",
+    "end_date",
+    "status",
+    "participants_limit",
+    "participants_count",
+    "category_id",
+    "user_id",
+)
+
+PARTICIPANT_COLUMNS = (
+    "id",
+    "event_id",
+    "user_id",
+    "status",
+    "attended_at",
+    "created_at",
+    "updated_at",
+    "deleted",
+)
+
+FIRST_NAMES = (
+    "Ana", "Bruno", "Camila", "Daniel", "Eduarda", "Felipe", "Gabriela",
+    "Henrique", "Isabela", "João", "Larissa", "Lucas", "Mariana", "Mateus",
+    "Natália", "Pedro", "Rafaela", "Rodrigo", "Sofia", "Thiago", "Vitória",
+)  # fmt: skip
+
+LAST_NAMES = (
+    "Almeida", "Barbosa", "Cardoso", "Costa", "Ferreira", "Gomes", "Lima",
+    "Martins", "Oliveira", "Pereira", "Ribeiro", "Rodrigues", "Santos",
+    "Silva", "Souza",
+)  # fmt: skip
+
+CITIES = (
+    ("São Paulo", "SP"), ("Rio de Janeiro", "RJ"), ("Belo Horizonte", "MG"),
+    ("Curitiba", "PR"), ("Porto Alegre", "RS"), ("Salvador", "BA"),
+    ("Recife", "PE"), ("Fortaleza", "CE"), ("Brasília", "DF"),
+    ("Florianópolis", "SC"), ("Campinas", "SP"), ("Goiânia", "GO"),
+)  # fmt: skip
+
+TOPICS = (
+    "python", "django", "dados", "web", "cloud", "ia", "segurança", "devops",
+    "carreira", "design", "mobile", "gestão", "startups", "educação",
+)  # fmt: skip
+
+EVENT_KINDS = ("Workshop", "Palestra", "Meetup", "Curso", "Seminário", "Hackathon")
+
+# Expoente da distribuição de popularidade (Zipf): poucos eventos concentram
+# a maior parte das inscrições
+POPULARITY_EXPONENT = 1.1
+
+# Senha de todos os usuários gerados, com o hash calculado uma única vez
+SEED_PASSWORD = "sinapse123"
+
+# Os e-mails gerados identificam a massa para o --purge
+SEED_EMAIL_DOMAIN = "sinapse.local"
+
+PURGE_SQL = """
+    WITH seed_users AS (
+        SELECT id FROM tb_users WHERE email LIKE %(pattern)s
+    ),
+    seed_events AS (
+        SELECT id FROM tb_events WHERE user_id IN (SELECT id FROM seed_users)
+    ),
+    rankings AS (
+        DELETE FROM tb_event_rankings WHERE event_id IN (SELECT id FROM seed_events)
+    ),
+    waitlist AS (
+        DELETE FROM tb_events_waitlist
+        WHERE event_id IN (SELECT id FROM seed_events)
+           OR user_id IN (SELECT id FROM seed_users)
+    ),
+    certificates AS (
+        DELETE FROM tb_issued_certificates
+        WHERE event_id IN (SELECT id FROM seed_events)
+           OR user_id IN (SELECT id FROM seed_users)
+    ),
+    participants AS (
+        DELETE FROM tb_events_participants
+        WHERE event_id IN (SELECT id FROM seed_events)
+           OR user_id IN (SELECT id FROM seed_users)
+    ),
+    archived AS (
+        DELETE FROM tb_events_participants_archive
+        WHERE event_id IN (SELECT id FROM seed_events)
+           OR user_id IN (SELECT id FROM seed_users)
+    )
+    SELECT
+        (SELECT COUNT(*) FROM seed_users),
+        (SELECT COUNT(*) FROM seed_events)
+"""
+
+
+def copy_rows(cursor, table: str, columns, rows) -> None:
+    """
+    Carrega as linhas (tuplas já formatadas como texto, None para NULL)
+    com um único COPY FROM STDIN no formato texto do Postgres.
+    Os valores gerados aqui não contêm tabulações, quebras de linha nem
+    barras invertidas, então não precisam de escape.
+    """
+    data = "".join(
+        "\t".join("\\N" if value is None else value for value in row) + "\n"
+        for row in rows
+    )
+    with cursor.copy(f"COPY {table} ({', '.join(columns)}) FROM STDIN") as copy:
+        copy.write(data)
+
+
+def batched(rows, size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Command(BaseCommand):
+    help = (
+        "Gera uma massa sintética de usuários, eventos e inscrições (com "
+        "popularidade de cauda longa e datas passadas, em andamento e futuras) "
+        "e a carrega com COPY FROM STDIN em lotes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200_000)
+        parser.add_argument("--events", type=int, default=20_000)
+        parser.add_argument("--participations", type=int, default=1_000_000)
+        parser.add_argument("--teacher-ratio", type=float, default=0.05)
+        parser.add_argument("--batch-size", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Remove a massa gerada anteriormente em vez de gerar uma nova.",
+        )
+
+    def handle(self, *args, **options):
+        if options["purge"]:
+            return self._purge()
+
+        self.rng = random.Random(options["seed"])
+        self.now = timezone.now()
+        self.batch_size = options["batch_size"]
+        self.run_id = uuid.UUID(int=self.rng.getrandbits(128)).hex[:8]
+        self.id_prefix = self.rng.getrandbits(64) << 64
+        self.sequence = 0
+
+        category_ids = [
+            str(pk) for pk in CategoryModel.objects.values_list("id", flat=True)
+        ]
+        if not category_ids:
+            self.stderr.write("Nenhuma categoria: rode as migrações antes.")
+            return
+
+        started = time.perf_counter()
+        with connection.cursor() as cursor:
+            # Massa descartável: não vale esperar o flush do WAL a cada lote
+            cursor.execute("SET synchronous_commit = off")
+            teachers, students = self._load_users(
+                cursor, options["users"], options["teacher_ratio"]
+            )
+            events = self._plan_events(
+                options["events"], options["participations"], len(students)
+            )
+            self._load_events(cursor, events, teachers, category_ids)
+            participations = self._load_participations(cursor, events, students)
+
+            cursor.execute(
+                f"ANALYZE {UserModel._meta.db_table}, {EventModel._meta.db_table}, "
+                f"{EventParticipantModel._meta.db_table}"
+            )
+
+        refreshed, _removed = compact_rankings()
+        invalidate_events_cache()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(teachers) + len(students)} usuários, {len(events)} eventos e "
+                f"{participations} inscrições em {time.perf_counter() - started:.1f}s "
+                f"({refreshed} rankings atualizados)"
+            )
+        )
+
+    def _purge(self):
+        pattern = f"%@seed-%.{SEED_EMAIL_DOMAIN}"
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Os CTEs de DELETE enxergam o snapshot anterior, então eventos
+            # e usuários só podem sair depois, em comandos separados
+            cursor.execute(PURGE_SQL, {"pattern": pattern})
+            users, events = cursor.fetchone()
+            cursor.execute(
+                "DELETE FROM tb_events WHERE user_id IN "
+                "(SELECT id FROM tb_users WHERE email LIKE %s)",
+                [pattern],
+            )
+            cursor.execute("DELETE FROM tb_users WHERE email LIKE %s", [pattern])
+
+        invalidate_events_cache()
+        self.stdout.write(
+            self.style.SUCCESS(f"{users} usuários e {events} eventos removidos")
+        )
+
+    def _uuid(self) -> str:
+        # Prefixo da execução + contador: ids crescentes viram inserções no
+        # fim do índice da chave primária, em vez de páginas aleatórias
+        self.sequence += 1
+        return str(uuid.UUID(int=self.id_prefix | self.sequence, version=4))
+
+    def _timestamp(self, days: float) -> str:
+        return (self.now + timedelta(days=days)).isoformat()
+
+    def _step(self, label, total, started):
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label:>10}: {total:>9} linhas em {elapsed:5.1f}s "
+            f"({total / elapsed if elapsed else 0:,.0f}/s)"
+        )
+
+    def _load_users(self, cursor, total, teacher_ratio):
+        started = time.perf_counter()
+        password = make_password(SEED_PASSWORD)
+        rng = self.rng
+
+        teachers, students, rows = [], [], []
+        for i in range(total):
+            user_id = self._uuid()
+            is_teacher = rng.random() < teacher_ratio
+            (teachers if is_teacher else students).append(user_id)
+
+            first_name = rng.choice(FIRST_NAMES)
+            last_name = rng.choice(LAST_NAMES)
+            joined = self._timestamp(-rng.uniform(30, 730))
+            rows.append(
+                (
+                    user_id,
+                    joined,
+                    joined,
+                    "f",
+                    first_name,
+                    last_name,
+                    f"{first_name.lower()}.{last_name.lower()}.{i}"
+                    f"@seed-{self.run_id}.{SEED_EMAIL_DOMAIN}",
+                    password,
+                    (UserModel.Role.TEACHER if is_teacher else UserModel.Role.STUDENT),
+                    "t",
+                    "f",
+                    "f",
+                    joined,
+                )
+            )
+
+        for batch in batched(rows, self.batch_size):
+            copy_rows(cursor, UserModel._meta.db_table, USER_COLUMNS, batch)
+
+        self._step("usuários", total, started)
+        return teachers or students[:1], students
+
+    def _plan_events(self, total, participations, students):
+        """
+        Datas entre um ano atrás e seis meses à frente e inscrições
+        distribuídas por uma lei de potência (Zipf) sobre os eventos.
+        """
+        weights = [1 / (rank**POPULARITY_EXPONENT) for rank in range(1, total + 1)]
+        self.rng.shuffle(weights)
+        scale = participations / sum(weights)
+
+        events = []
+        for weight in weights:
+            start_offset = self.rng.uniform(-365, 180)
+            duration = self.rng.choice((2, 3, 4, 8)) / 24
+            enrolled = min(round(weight * scale), students)
+
+            if start_offset + duration < 0:
+                status = (
+                    EventModel.Status.CANCELED
+                    if self.rng.random() < 0.08
+                    else EventModel.Status.FINISHED
+                )
+            elif start_offset < 0:
+                status = EventModel.Status.CLOSED
+            else:
+                status = (
+                    EventModel.Status.CANCELED
+                    if self.rng.random() < 0.05
+                    else EventModel.Status.OPEN
+                )
+
+            events.append(
+                {
+                    "id": self._uuid(),
+                    # Criado antes do início e nunca no futuro
+                    "created_offset": min(start_offset, 0) - self.rng.uniform(7, 90),
+                    "start_offset": start_offset,
+                    "duration": duration,
+                    "status": status,
+                    "enrolled": enrolled,
+                }
+            )
+        return events
+
+    def _load_events(self, cursor, events, teachers, category_ids):
+        started = time.perf_counter()
+        rng = self.rng
+
+        rows = []
+        for i, event in enumerate(events):
+            city, state = rng.choice(CITIES)
+            topics = rng.sample(TOPICS, rng.randint(1, 4))
+            created = self._timestamp(event["created_offset"])
+            # Metade dos eventos sem limite; os demais com folga arredondada
+            limit = (
+                None if rng.random() < 0.5 else str((event["enrolled"] // 50 + 1) * 50)
+            )
+            rows.append(
+                (
+                    event["id"],
+                    created,
+                    created,
+                    "f",
+                    f"{rng.choice(EVENT_KINDS)} de {topics[0]} #{i}",
+                    f"Encontro sobre {', '.join(topics)} em {city}",
+                    "{" + ",".join(topics) + "}",
+                    f"Rua {rng.choice(LAST_NAMES)}, {rng.randint(1, 2000)}",
+                    city,
+                    state,
+                    "Brasil",
+                    f"{rng.randint(1000000, 99999999):08d}",
+                    self._timestamp(event["start_offset"]),
+                    self._timestamp(event["start_offset"] + event["duration"]),
+                    event["status"],
+                    limit,
+                    str(event["enrolled"]),
+                    rng.choice(category_ids),
+                    rng.choice(teachers),
+                )
+            )
+
+        for batch in batched(rows, self.batch_size):
+            copy_rows(cursor, EventModel._meta.db_table, EVENT_COLUMNS, batch)
+
+        self._step("eventos", len(events), started)
+
+    def _participation_rows(self, events, students):
+        rng = self.rng
+        present = EventParticipantModel.ParticipationStatus.PRESENT
+        absent = EventParticipantModel.ParticipationStatus.ABSENT
+        pending = EventParticipantModel.ParticipationStatus.PENDING
+
+        for event in events:
+            if not event["enrolled"]:
+                continue
+
+            finished = event["status"] == EventModel.Status.FINISHED
+            start_offset = event["start_offset"]
+            attended_at = self._timestamp(start_offset) if finished else None
+            # Inscrições entre a criação do evento e o início (ou agora, se
+            # ainda não começou): datas futuras cairiam todas nas janelas de
+            # 24h/7d do ranking "em alta"
+            enrolled_until = min(start_offset, 0)
+
+            for student in rng.sample(students, event["enrolled"]):
+                created = self._timestamp(
+                    rng.uniform(event["created_offset"], enrolled_until)
+                )
+                if finished:
+                    status = present if rng.random() < 0.75 else absent
+                else:
+                    status = pending
+                yield (
+                    self._uuid(),
+                    event["id"],
+                    student,
+                    status,
+                    attended_at if status == present else None,
+                    created,
+                    created,
+                    "f",
+                )
+
+    def _load_participations(self, cursor, events, students) -> int:
+        started = time.perf_counter()
+        total = 0
+        for batch in batched(
+            self._participation_rows(events, students), self.batch_size
+        ):
+            copy_rows(
+                cursor,
+                EventParticipantModel._meta.db_table,
+                PARTICIPANT_COLUMNS,
+                batch,
+            )
+            total += len(batch)
+
+        self._step("inscrições", total, started)
+        return total
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-17 03:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0005_insert_initial_categories"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventmodel",
+            name="participants_count",
+            field=models.PositiveIntegerField(
+                default=0, editable=False, verbose_name="Número de inscritos"
+            ),
+        ),
+        migrations.RunSQL(
+            sql="""
+                UPDATE tb_events e
+                SET participants_count = p.total
+                FROM (
+                    SELECT event_id, COUNT(*) AS total
+                    FROM tb_events_participants
+                    GROUP BY event_id
+                ) p
+                WHERE p.event_id = e.id
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,78 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:01
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0006_eventmodel_participants_count"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="CREATE SEQUENCE tb_events_waitlist_position_seq",
+            reverse_sql="DROP SEQUENCE tb_events_waitlist_position_seq",
+        ),
+        migrations.CreateModel(
+            name="WaitlistEntryModel",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("deleted", models.BooleanField(default=False)),
+                (
+                    "position",
+                    models.BigIntegerField(
+                        db_default=models.Func(
+                            models.Value("tb_events_waitlist_position_seq"),
+                            function="nextval",
+                        ),
+                        editable=False,
+                        verbose_name="Posição na fila",
+                    ),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist_entries",
+                        to="events.eventmodel",
+                        verbose_name="Evento",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="waitlist_entries",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Usuário",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Entrada na lista de espera",
+                "verbose_name_plural": "Lista de espera",
+                "db_table": "tb_events_waitlist",
+                "indexes": [
+                    models.Index(
+                        fields=["event", "position"],
+                        name="tb_events_w_event_i_79098c_idx",
+                    )
+                ],
+                "unique_together": {("event", "user")},
+            },
+        ),
+    ]
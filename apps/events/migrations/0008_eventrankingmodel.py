@@ -0,0 +1,108 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:04
+
+import uuid
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0007_waitlistentrymodel"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EventRankingModel",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("deleted", models.BooleanField(default=False)),
+                ("start_date", models.DateTimeField(verbose_name="Data de início")),
+                (
+                    "total_enrollments",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Total de inscrições"
+                    ),
+                ),
+                (
+                    "enrollments_24h",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Inscrições nas últimas 24h"
+                    ),
+                ),
+                (
+                    "enrollments_7d",
+                    models.PositiveIntegerField(
+                        default=0, verbose_name="Inscrições nos últimos 7 dias"
+                    ),
+                ),
+                (
+                    "trending_score",
+                    models.FloatField(default=0, verbose_name="Pontuação em alta"),
+                ),
+                (
+                    "refreshed_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="Última compactação"
+                    ),
+                ),
+                (
+                    "event",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ranking",
+                        to="events.eventmodel",
+                        verbose_name="Evento",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Ranking do evento",
+                "verbose_name_plural": "Rankings dos eventos",
+                "db_table": "tb_event_rankings",
+                "indexes": [
+                    models.Index(
+                        fields=["-total_enrollments", "start_date"],
+                        name="tb_event_ra_total_e_0e9a3b_idx",
+                    ),
+                    models.Index(
+                        fields=["-trending_score", "start_date"],
+                        name="tb_event_ra_trendin_1b3560_idx",
+                    ),
+                ],
+            },
+        ),
+        # Carga inicial do ranking a partir das inscrições já existentes
+        migrations.RunSQL(
+            sql="""
+                INSERT INTO tb_event_rankings (
+                    id, event_id, start_date, total_enrollments, enrollments_24h,
+                    enrollments_7d, trending_score, refreshed_at, created_at,
+                    updated_at, deleted
+                )
+                SELECT
+                    gen_random_uuid(), e.id, e.start_date,
+                    COUNT(p.id),
+                    COUNT(p.id) FILTER (WHERE p.created_at >= now() - interval '1 day'),
+                    COUNT(p.id) FILTER (WHERE p.created_at >= now() - interval '7 days'),
+                    COUNT(p.id) FILTER (WHERE p.created_at >= now() - interval '1 day')
+                        + COUNT(p.id) FILTER (
+                            WHERE p.created_at >= now() - interval '7 days'
+                        ) / 7.0,
+                    now(), now(), now(), false
+                FROM tb_events e
+                LEFT JOIN tb_events_participants p ON p.event_id = e.id
+                GROUP BY e.id, e.start_date
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
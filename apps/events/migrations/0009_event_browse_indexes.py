@@ -0,0 +1,68 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:08
+
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0008_eventrankingmodel"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_status_939f8e_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_categor_32a032_idx",
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                fields=["start_date", "id"], name="tb_events_browse_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                fields=["category", "start_date", "id"],
+                name="tb_events_category_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                fields=["status", "start_date", "id"],
+                name="tb_events_status_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                fields=["user", "start_date", "id"], name="tb_events_user_browse_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                django.db.models.functions.text.Upper("city"),
+                models.F("start_date"),
+                models.F("id"),
+                name="tb_events_city_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                django.db.models.functions.text.Upper("state"),
+                models.F("start_date"),
+                models.F("id"),
+                name="tb_events_state_browse_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0009_event_browse_indexes"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql="""
+                CREATE FUNCTION tb_events_topics_text(text[]) RETURNS text
+                LANGUAGE sql IMMUTABLE PARALLEL SAFE
+                AS $$ SELECT array_to_string($1, ' ') $$
+            """,
+            reverse_sql="DROP FUNCTION tb_events_topics_text(text[])",
+        ),
+        migrations.AddField(
+            model_name="eventmodel",
+            name="search_vector",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.contrib.postgres.search.CombinedSearchVector(
+                    django.contrib.postgres.search.CombinedSearchVector(
+                        django.contrib.postgres.search.SearchVector(
+                            "name", config="portuguese", weight="A"
+                        ),
+                        "||",
+                        django.contrib.postgres.search.SearchVector(
+                            models.Func(
+                                "topics",
+                                function="tb_events_topics_text",
+                                output_field=models.TextField(),
+                            ),
+                            config="portuguese",
+                            weight="B",
+                        ),
+                        django.contrib.postgres.search.SearchConfig("portuguese"),
+                    ),
+                    "||",
+                    django.contrib.postgres.search.SearchVector(
+                        "description", config="portuguese", weight="C"
+                    ),
+                    django.contrib.postgres.search.SearchConfig("portuguese"),
+                ),
+                output_field=django.contrib.postgres.search.SearchVectorField(),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="tb_events_search_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:11
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0010_event_search_vector"),
+    ]
+
+    operations = [
+        # Mesma normalização de EventForm.clean_topics para os dados já
+        # gravados: caixa baixa, espaços colapsados, sem vazios nem repetidos
+        migrations.RunSQL(
+            sql=r"""
+                UPDATE tb_events
+                SET topics = ARRAY(
+                    SELECT topic
+                    FROM (
+                        SELECT
+                            lower(regexp_replace(btrim(raw), '\s+', ' ', 'g')) AS topic,
+                            MIN(position) AS position
+                        FROM unnest(topics) WITH ORDINALITY AS t(raw, position)
+                        WHERE btrim(raw) <> ''
+                        GROUP BY 1
+                    ) AS normalized
+                    ORDER BY position
+                )
+            """,
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["topics"], name="tb_events_topics_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:20
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0011_event_topics_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IssuedCertificateModel",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("deleted", models.BooleanField(default=False)),
+                (
+                    "code",
+                    models.CharField(
+                        editable=False,
+                        max_length=32,
+                        unique=True,
+                        verbose_name="Código",
+                    ),
+                ),
+                (
+                    "participant_name",
+                    models.CharField(
+                        max_length=100, verbose_name="Nome do participante"
+                    ),
+                ),
+                (
+                    "event_name",
+                    models.CharField(max_length=100, verbose_name="Nome do evento"),
+                ),
+                ("event_city", models.CharField(max_length=100, verbose_name="Cidade")),
+                (
+                    "event_state",
+                    models.CharField(max_length=100, verbose_name="Estado"),
+                ),
+                (
+                    "event_country",
+                    models.CharField(max_length=100, verbose_name="País"),
+                ),
+                (
+                    "event_start_date",
+                    models.DateTimeField(verbose_name="Data de início"),
+                ),
+                (
+                    "event_end_date",
+                    models.DateTimeField(verbose_name="Data de término"),
+                ),
+                (
+                    "event",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="issued_certificates",
+                        to="events.eventmodel",
+                        verbose_name="Evento",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="issued_certificates",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Usuário",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Certificado emitido",
+                "verbose_name_plural": "Certificados emitidos",
+                "db_table": "tb_issued_certificates",
+                "unique_together": {("event", "user")},
+            },
+        ),
+    ]
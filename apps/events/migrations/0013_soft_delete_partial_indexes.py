@@ -0,0 +1,125 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:41
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0012_issuedcertificatemodel"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_browse_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_category_browse_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_status_browse_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_user_browse_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_city_browse_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_state_browse_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_search_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="eventmodel",
+            name="tb_events_topics_idx",
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["start_date", "id"],
+                name="tb_events_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["category", "start_date", "id"],
+                name="tb_events_category_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["status", "start_date", "id"],
+                name="tb_events_status_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["user", "start_date", "id"],
+                name="tb_events_user_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                django.db.models.functions.text.Upper("city"),
+                models.F("start_date"),
+                models.F("id"),
+                condition=models.Q(("deleted", False)),
+                name="tb_events_city_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=models.Index(
+                django.db.models.functions.text.Upper("state"),
+                models.F("start_date"),
+                models.F("id"),
+                condition=models.Q(("deleted", False)),
+                name="tb_events_state_browse_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("deleted", False)),
+                fields=["search_vector"],
+                name="tb_events_search_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventmodel",
+            index=django.contrib.postgres.indexes.GinIndex(
+                condition=models.Q(("deleted", False)),
+                fields=["topics"],
+                name="tb_events_topics_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="eventparticipantmodel",
+            index=models.Index(
+                condition=models.Q(("deleted", False)),
+                fields=["event", "status"],
+                name="tb_participants_event_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.6 on 2026-10-17 04:44
+
+import uuid
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0013_soft_delete_partial_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventmodel",
+            name="archived_at",
+            field=models.DateTimeField(
+                blank=True, editable=False, null=True, verbose_name="Arquivado em"
+            ),
+        ),
+        migrations.CreateModel(
+            name="ArchivedParticipantModel",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4, primary_key=True, serialize=False
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("deleted", models.BooleanField(default=False)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PRESENT", "Presente"),
+                            ("ABSENT", "Ausente"),
+                            ("PENDING", "Pendente"),
+                        ],
+                        max_length=20,
+                        verbose_name="Status da participação",
+                    ),
+                ),
+                (
+                    "attended_at",
+                    models.DateTimeField(
+                        blank=True,
+                        null=True,
+                        verbose_name="Data/hora da confirmação de presença",
+                    ),
+                ),
+                ("archived_at", models.DateTimeField(verbose_name="Arquivado em")),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_participations",
+                        to="events.eventmodel",
+                        verbose_name="Evento",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_participations",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="Usuário",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Participante arquivado",
+                "verbose_name_plural": "Participantes arquivados",
+                "db_table": "tb_events_participants_archive",
+            },
+        ),
+    ]
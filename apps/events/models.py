@@ -1,11 +1,21 @@
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Coalesce, Upper
+from django.db.models.query import ModelIterable
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from apps.authentication.models import UserModel
-from apps.core.models import BaseModel
+from apps.core.models import (
+    SOFT_DELETE_BATCH_SIZE,
+    BaseModel,
+    SoftDeleteManager,
+    SoftDeleteQuerySet,
+)
+from apps.events.cache import invalidate_events_cache
 
 
 class CategoryModel(BaseModel):
@@ -31,6 +41,72 @@ class CategoryModel(BaseModel):
         super().clean()
 
 
+WAITLIST_POSITION_SEQUENCE = "tb_events_waitlist_position_seq"
+
+# Condição dos índices parciais: só linhas não excluídas logicamente
+ALIVE = models.Q(deleted=False)
+
+# Configuração de busca textual (LANGUAGE_CODE é pt-br)
+SEARCH_CONFIG = "portuguese"
+
+# array_to_string não é IMMUTABLE e não pode ser usada em coluna gerada;
+# esta função (criada na migração 0010) apenas a declara como tal
+TOPICS_TEXT_FUNCTION = "tb_events_topics_text"
+
+
+class EffectiveStatusIterable(ModelIterable):
+    """
+    Substitui o status armazenado pelo status efetivo calculado no SQL,
+    para que templates e views continuem lendo apenas `event.status`.
+    """
+
+    def __iter__(self):
+        for event in super().__iter__():
+            event.status = event.effective_status
+            yield event
+
+
+class EventQuerySet(SoftDeleteQuerySet):
+    def with_effective_status(self, now=None):
+        """
+        Anota `effective_status` (status considerando start_date, end_date e
+        a lista de chamada) sem gravar nada no banco.
+        """
+        queryset = self.annotate(effective_status=effective_status_expression(now=now))
+        queryset._iterable_class = EffectiveStatusIterable
+        return queryset
+
+    def recount_participants(self) -> int:
+        """
+        Recalcula `participants_count` a partir de tb_events_participants,
+        atualizando apenas os eventos cujo contador divergiu.
+        Retorna a quantidade de eventos corrigidos.
+        """
+        actual = Coalesce(
+            models.Subquery(
+                EventParticipantModel.objects.filter(event_id=models.OuterRef("pk"))
+                .order_by()
+                .values("event_id")
+                .annotate(total=models.Count("id"))
+                .values("total")
+            ),
+            0,
+        )
+
+        # O contador dos eventos arquivados é histórico: as inscrições
+        # não estão mais em tb_events_participants
+        drifted = (
+            self.filter(archived_at__isnull=True)
+            .annotate(actual_count=actual)
+            .exclude(participants_count=models.F("actual_count"))
+            .values("pk")
+        )
+
+        return EventModel.objects.filter(pk__in=drifted).update(
+            participants_count=actual
+        )
+
+
 class EventModel(BaseModel):
 
     class Status(models.TextChoices):
@@ -101,10 +177,22 @@ class EventModel(BaseModel):
         null=True, blank=True, verbose_name=_("Limite de participantes")
     )
 
+    # Contador desnormalizado, mantido atomicamente na inscrição/cancelamento
+    # (apps.events.enrollment)
+    participants_count = models.PositiveIntegerField(
+        default=0, editable=False, verbose_name=_("Número de inscritos")
+    )
+
     image_url = models.URLField(
         null=True, blank=True, max_length=500, verbose_name=_("URL da imagem")
     )
 
+    # Preenchido quando as inscrições foram movidas para o arquivo
+    # (apps.events.archive); a partir daí elas são lidas de lá
+    archived_at = models.DateTimeField(
+        null=True, blank=True, editable=False, verbose_name=_("Arquivado em")
+    )
+
     category = models.ForeignKey(
         CategoryModel,
         related_name="events",
@@ -134,14 +222,75 @@ class EventModel(BaseModel):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Documento de busca mantido pelo próprio Postgres (apps.events.search)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("name", weight="A", config=SEARCH_CONFIG)
+            + SearchVector(
+                models.Func(
+                    "topics",
+                    function=TOPICS_TEXT_FUNCTION,
+                    output_field=models.TextField(),
+                ),
+                weight="B",
+                config=SEARCH_CONFIG,
+            )
+            + SearchVector("description", weight="C", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
+
+    objects = SoftDeleteManager.from_queryset(EventQuerySet)()
+    all_objects = EventQuerySet.as_manager()
+
     class Meta:
         db_table = "tb_events"
         verbose_name = _("Evento")
         verbose_name_plural = _("Eventos")
         indexes = [
             models.Index(fields=["start_date", "end_date"]),
-            models.Index(fields=["status"]),
-            models.Index(fields=["category"]),
+            # Paginação por cursor (start_date, id) na navegação, uma por filtro.
+            # Parciais: a navegação e a busca passam pelo manager padrão, que
+            # já exclui os eventos removidos
+            models.Index(
+                fields=["start_date", "id"],
+                condition=ALIVE,
+                name="tb_events_browse_idx",
+            ),
+            models.Index(
+                fields=["category", "start_date", "id"],
+                condition=ALIVE,
+                name="tb_events_category_browse_idx",
+            ),
+            models.Index(
+                fields=["status", "start_date", "id"],
+                condition=ALIVE,
+                name="tb_events_status_browse_idx",
+            ),
+            models.Index(
+                fields=["user", "start_date", "id"],
+                condition=ALIVE,
+                name="tb_events_user_browse_idx",
+            ),
+            models.Index(
+                Upper("city"),
+                "start_date",
+                "id",
+                condition=ALIVE,
+                name="tb_events_city_browse_idx",
+            ),
+            models.Index(
+                Upper("state"),
+                "start_date",
+                "id",
+                condition=ALIVE,
+                name="tb_events_state_browse_idx",
+            ),
+            GinIndex(
+                fields=["search_vector"], condition=ALIVE, name="tb_events_search_idx"
+            ),
+            GinIndex(fields=["topics"], condition=ALIVE, name="tb_events_topics_idx"),
         ]
 
     def __str__(self):
@@ -164,19 +313,44 @@ class EventModel(BaseModel):
 
     def save(self, *args, **kwargs):
         self.full_clean()
+
+        # Nunca sobrescrever o contador com o valor carregado em memória:
+        # ele é alterado apenas por UPDATEs atômicos.
+        if not self._state.adding and kwargs.get("update_fields") is None:
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key
+                and not field.generated
+                and field.name != "participants_count"
+            ]
+
         super().save(*args, **kwargs)
 
+    def soft_delete(self, batch_size: int = SOFT_DELETE_BATCH_SIZE):
+        """
+        Exclui o evento logicamente e, em seguida, as inscrições e a lista de
+        espera em lotes. O evento some primeiro das listagens; o ranking,
+        derivado, é apagado.
+        """
+        super().soft_delete()
+        self.participants_records.soft_delete(batch_size)
+        self.archived_participations.soft_delete(batch_size)
+        self.waitlist_entries.soft_delete(batch_size)
+        EventRankingModel.objects.filter(event_id=self.pk).delete()
+        invalidate_events_cache()
+
     @property
     def is_full(self):
         if not self.participants_limit:
             return False
-        return self.participants.count() >= self.participants_limit
+        return self.participants_count >= self.participants_limit
 
     @property
     def available_spots(self):
         if not self.participants_limit:
             return None
-        return max(0, self.participants_limit - self.participants.count())
+        return max(0, self.participants_limit - self.participants_count)
 
     @property
     def attendance_available(self):
@@ -221,6 +395,14 @@ class EventParticipantModel(BaseModel):
     class Meta:
         db_table = "tb_events_participants"
         unique_together = ["user", "event"]
+        indexes = [
+            # Lista de chamada, contagens por status e o status efetivo
+            models.Index(
+                fields=["event", "status"],
+                condition=ALIVE,
+                name="tb_participants_event_idx",
+            )
+        ]
         verbose_name = _("Participante do Evento")
         verbose_name_plural = _("Participantes dos Eventos")
 
@@ -242,3 +424,234 @@ class EventParticipantModel(BaseModel):
 
         self.full_clean()
         super().save(*args, **kwargs)
+
+
+def effective_status_expression(prefix: str = "", now=None):
+    """
+    Expressão SQL com o status efetivo de um evento, equivalente às
+    transições automáticas: OPEN vira CLOSED após o início e OPEN/CLOSED
+    vira FINISHED após o término, se a lista de chamada foi feita.
+
+    `prefix` permite usar a expressão a partir de outro modelo
+    (ex.: "event__" em EventParticipantModel).
+    """
+    now = now or timezone.now()
+    status = models.F(f"{prefix}status")
+
+    has_attendance = models.Exists(
+        EventParticipantModel.objects.filter(
+            event_id=models.OuterRef(f"{prefix}id"),
+            status__in=[
+                EventParticipantModel.ParticipationStatus.PRESENT,
+                EventParticipantModel.ParticipationStatus.ABSENT,
+            ],
+        )
+    )
+
+    return models.Case(
+        models.When(
+            models.Q(
+                **{
+                    f"{prefix}status__in": [
+                        EventModel.Status.CANCELED,
+                        EventModel.Status.FINISHED,
+                    ]
+                }
+            ),
+            then=status,
+        ),
+        models.When(
+            models.Q(**{f"{prefix}end_date__lte": now}) & has_attendance,
+            then=models.Value(EventModel.Status.FINISHED),
+        ),
+        models.When(
+            models.Q(
+                **{
+                    f"{prefix}status": EventModel.Status.OPEN,
+                    f"{prefix}start_date__lte": now,
+                }
+            ),
+            then=models.Value(EventModel.Status.CLOSED),
+        ),
+        default=status,
+        output_field=models.CharField(),
+    )
+
+
+class ArchivedParticipantModel(BaseModel):
+    """
+    Inscrições de eventos encerrados há mais tempo, movidas de
+    tb_events_participants pelo `manage.py archive_events` para que as
+    consultas dos eventos ativos percorram apenas a tabela quente.
+    """
+
+    user = models.ForeignKey(
+        UserModel,
+        on_delete=models.CASCADE,
+        related_name="archived_participations",
+        verbose_name=_("Usuário"),
+    )
+
+    event = models.ForeignKey(
+        EventModel,
+        on_delete=models.CASCADE,
+        related_name="archived_participations",
+        verbose_name=_("Evento"),
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=EventParticipantModel.ParticipationStatus.choices,
+        verbose_name=_("Status da participação"),
+    )
+
+    attended_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Data/hora da confirmação de presença")
+    )
+
+    archived_at = models.DateTimeField(verbose_name=_("Arquivado em"))
+
+    class Meta:
+        db_table = "tb_events_participants_archive"
+        verbose_name = _("Participante arquivado")
+        verbose_name_plural = _("Participantes arquivados")
+
+    def __str__(self):
+        return f"{self.user} - {self.event}"
+
+
+class WaitlistEntryModel(BaseModel):
+    event = models.ForeignKey(
+        EventModel,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+        verbose_name=_("Evento"),
+    )
+
+    user = models.ForeignKey(
+        UserModel,
+        on_delete=models.CASCADE,
+        related_name="waitlist_entries",
+        verbose_name=_("Usuário"),
+    )
+
+    # Valor de uma sequence global: crescente na ordem de entrada na fila
+    position = models.BigIntegerField(
+        db_default=models.Func(
+            models.Value(WAITLIST_POSITION_SEQUENCE), function="nextval"
+        ),
+        editable=False,
+        verbose_name=_("Posição na fila"),
+    )
+
+    class Meta:
+        db_table = "tb_events_waitlist"
+        unique_together = ["event", "user"]
+        verbose_name = _("Entrada na lista de espera")
+        verbose_name_plural = _("Lista de espera")
+        indexes = [models.Index(fields=["event", "position"])]
+
+    def __str__(self):
+        return f"{self.user} - {self.event} (#{self.position})"
+
+
+class EventRankingModel(BaseModel):
+    """
+    Ranking materializado de popularidade dos eventos futuros. Mantido de
+    forma incremental na inscrição/cancelamento (apps.events.rankings) e
+    recalculado periodicamente por `manage.py compact_event_rankings`.
+    """
+
+    event = models.OneToOneField(
+        EventModel,
+        on_delete=models.CASCADE,
+        related_name="ranking",
+        verbose_name=_("Evento"),
+    )
+
+    # Cópia de EventModel.start_date para filtrar eventos futuros no índice
+    start_date = models.DateTimeField(verbose_name=_("Data de início"))
+
+    total_enrollments = models.PositiveIntegerField(
+        default=0, verbose_name=_("Total de inscrições")
+    )
+
+    enrollments_24h = models.PositiveIntegerField(
+        default=0, verbose_name=_("Inscrições nas últimas 24h")
+    )
+
+    enrollments_7d = models.PositiveIntegerField(
+        default=0, verbose_name=_("Inscrições nos últimos 7 dias")
+    )
+
+    trending_score = models.FloatField(default=0, verbose_name=_("Pontuação em alta"))
+
+    refreshed_at = models.DateTimeField(
+        null=True, blank=True, verbose_name=_("Última compactação")
+    )
+
+    class Meta:
+        db_table = "tb_event_rankings"
+        verbose_name = _("Ranking do evento")
+        verbose_name_plural = _("Rankings dos eventos")
+        indexes = [
+            models.Index(fields=["-total_enrollments", "start_date"]),
+            models.Index(fields=["-trending_score", "start_date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.event} ({self.total_enrollments})"
+
+
+class IssuedCertificateModel(BaseModel):
+    """
+    Registro de um certificado emitido, gravado uma única vez na primeira
+    emissão. Guarda uma cópia dos dados certificados para que a verificação
+    pública não dependa do evento ou do usuário continuarem existindo.
+    """
+
+    event = models.ForeignKey(
+        EventModel,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="issued_certificates",
+        verbose_name=_("Evento"),
+    )
+
+    user = models.ForeignKey(
+        UserModel,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="issued_certificates",
+        verbose_name=_("Usuário"),
+    )
+
+    # Código público impresso no PDF e usado na verificação
+    code = models.CharField(
+        max_length=32, unique=True, editable=False, verbose_name=_("Código")
+    )
+
+    participant_name = models.CharField(
+        max_length=100, verbose_name=_("Nome do participante")
+    )
+
+    event_name = models.CharField(max_length=100, verbose_name=_("Nome do evento"))
+
+    event_city = models.CharField(max_length=100, verbose_name=_("Cidade"))
+
+    event_state = models.CharField(max_length=100, verbose_name=_("Estado"))
+
+    event_country = models.CharField(max_length=100, verbose_name=_("País"))
+
+    event_start_date = models.DateTimeField(verbose_name=_("Data de início"))
+
+    event_end_date = models.DateTimeField(verbose_name=_("Data de término"))
+
+    class Meta:
+        db_table = "tb_issued_certificates"
+        unique_together = ["event", "user"]
+        verbose_name = _("Certificado emitido")
+        verbose_name_plural = _("Certificados emitidos")
+
+    def __str__(self):
+        return f"{self.code} - {self.participant_name}"
@@ -0,0 +1,143 @@
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.events.models import EventModel, EventParticipantModel, EventRankingModel
+
+EVENTS_TABLE = EventModel._meta.db_table
+PARTICIPANTS_TABLE = EventParticipantModel._meta.db_table
+RANKINGS_TABLE = EventRankingModel._meta.db_table
+
+# Peso das inscrições da última semana na pontuação "em alta": a média
+# diária da semana soma-se às inscrições das últimas 24h.
+TRENDING_WEEK_WEIGHT = 1 / 7
+
+# Aplica um delta às contagens de um evento, criando a linha se preciso.
+# Contagens nunca ficam negativas: a compactação corrige qualquer desvio.
+RECORD_SQL = f"""
+    INSERT INTO {RANKINGS_TABLE} AS r (
+        id, event_id, start_date, total_enrollments, enrollments_24h,
+        enrollments_7d, trending_score, created_at, updated_at, deleted
+    )
+    SELECT
+        gen_random_uuid(), e.id, e.start_date,
+        GREATEST(%(total)s, 0), GREATEST(%(day)s, 0), GREATEST(%(week)s, 0),
+        GREATEST(%(day)s, 0) + GREATEST(%(week)s, 0) * %(week_weight)s,
+        %(now)s, %(now)s, false
+    FROM {EVENTS_TABLE} e
+    WHERE e.id = %(event_id)s
+    ON CONFLICT (event_id) DO UPDATE SET
+        total_enrollments = GREATEST(r.total_enrollments + %(total)s, 0),
+        enrollments_24h = GREATEST(r.enrollments_24h + %(day)s, 0),
+        enrollments_7d = GREATEST(r.enrollments_7d + %(week)s, 0),
+        trending_score = GREATEST(r.enrollments_24h + %(day)s, 0)
+            + GREATEST(r.enrollments_7d + %(week)s, 0) * %(week_weight)s,
+        updated_at = %(now)s
+"""
+
+# Recalcula do zero as contagens dos eventos futuros e descarta os passados
+COMPACT_SQL = f"""
+    INSERT INTO {RANKINGS_TABLE} AS r (
+        id, event_id, start_date, total_enrollments, enrollments_24h,
+        enrollments_7d, trending_score, refreshed_at, created_at, updated_at,
+        deleted
+    )
+    SELECT
+        gen_random_uuid(), e.id, e.start_date,
+        COALESCE(p.total, 0), COALESCE(p.day, 0), COALESCE(p.week, 0),
+        COALESCE(p.day, 0) + COALESCE(p.week, 0) * %(week_weight)s,
+        %(now)s, %(now)s, %(now)s, false
+    FROM {EVENTS_TABLE} e
+    LEFT JOIN (
+        SELECT
+            event_id,
+            COUNT(*) AS total,
+            COUNT(*) FILTER (WHERE created_at >= %(day_ago)s) AS day,
+            COUNT(*) FILTER (WHERE created_at >= %(week_ago)s) AS week
+        FROM {PARTICIPANTS_TABLE}
+        WHERE NOT deleted AND event_id IN (
+            SELECT id FROM {EVENTS_TABLE}
+            WHERE start_date >= %(now)s AND NOT deleted
+        )
+        GROUP BY event_id
+    ) p ON p.event_id = e.id
+    WHERE e.start_date >= %(now)s AND NOT e.deleted
+    ON CONFLICT (event_id) DO UPDATE SET
+        start_date = EXCLUDED.start_date,
+        total_enrollments = EXCLUDED.total_enrollments,
+        enrollments_24h = EXCLUDED.enrollments_24h,
+        enrollments_7d = EXCLUDED.enrollments_7d,
+        trending_score = EXCLUDED.trending_score,
+        refreshed_at = EXCLUDED.refreshed_at,
+        updated_at = EXCLUDED.updated_at
+"""
+
+
+def record_enrollments(event_id, amount: int = 1, enrolled_at=None) -> None:
+    """
+    Atualiza incrementalmente o ranking após `amount` inscrições (positivo)
+    ou cancelamentos (negativo). `enrolled_at` é a data da inscrição
+    cancelada, usada para saber de quais janelas ela deve sair.
+    """
+    now = timezone.now()
+    enrolled_at = enrolled_at or now
+
+    params = {
+        "event_id": str(event_id),
+        "total": amount,
+        "day": amount if enrolled_at >= now - timedelta(days=1) else 0,
+        "week": amount if enrolled_at >= now - timedelta(days=7) else 0,
+        "week_weight": TRENDING_WEEK_WEIGHT,
+        "now": now,
+    }
+
+    with connection.cursor() as cursor:
+        cursor.execute(RECORD_SQL, params)
+
+
+def compact_rankings(now=None) -> tuple[int, int]:
+    """
+    Recalcula as janelas de 24h/7d (que só decaem com o tempo) e remove os
+    eventos que já começaram ou foram excluídos.
+    Retorna (rankings atualizados, removidos)
+    """
+    now = now or timezone.now()
+    params = {
+        "now": now,
+        "day_ago": now - timedelta(days=1),
+        "week_ago": now - timedelta(days=7),
+        "week_weight": TRENDING_WEEK_WEIGHT,
+    }
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(COMPACT_SQL, params)
+            refreshed = cursor.rowcount
+
+        removed, _deleted = EventRankingModel.objects.filter(
+            Q(start_date__lt=now) | Q(event__deleted=True)
+        ).delete()
+
+    return refreshed, removed
+
+
+def top_events(order_by: str, limit: int = 10) -> list[EventModel]:
+    """
+    Top-N de eventos futuros lido do ranking pré-ordenado (varredura de
+    índice), já com status efetivo e categoria carregados.
+    """
+    event_ids = list(
+        EventRankingModel.objects.filter(start_date__gte=timezone.now())
+        .order_by(f"-{order_by}")
+        .values_list("event_id", flat=True)[:limit]
+    )
+
+    events = (
+        EventModel.objects.with_effective_status()
+        .select_related("category")
+        .in_bulk(event_ids)
+    )
+
+    return [events[event_id] for event_id in event_ids if event_id in events]
@@ -0,0 +1,57 @@
+import hashlib
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.core.paginator import Paginator
+from django.db.models import F
+
+from apps.events.browse import CARD_FIELDS
+from apps.events.cache import get_or_refresh
+from apps.events.models import SEARCH_CONFIG, EventModel
+
+SEARCH_PAGE_SIZE = 20
+
+# Só os melhores resultados são guardados e paginados: buscas que precisam
+# de mais que isso devem ser refinadas
+SEARCH_MAX_RESULTS = 200
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def _ranked_event_ids(query: str) -> list:
+    search_query = SearchQuery(query, config=SEARCH_CONFIG, search_type="websearch")
+
+    return list(
+        EventModel.objects.filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "start_date", "id")
+        .values_list("id", flat=True)[:SEARCH_MAX_RESULTS]
+    )
+
+
+def search_events(query: str, page_number=1):
+    """
+    Busca textual em nome (peso A), tópicos (B) e descrição (C) usando o
+    índice GIN de `search_vector`. A lista ranqueada de ids fica em cache
+    por consulta normalizada; cada página carrega apenas os seus cards.
+
+    Retorna uma Page do Paginator com os eventos da página
+    """
+    query = normalize_query(query)
+    key = f"events:search:{hashlib.sha1(query.encode()).hexdigest()}"
+    event_ids = get_or_refresh(key, lambda: _ranked_event_ids(query))
+
+    page = Paginator(event_ids, SEARCH_PAGE_SIZE).get_page(page_number)
+
+    events = (
+        EventModel.objects.with_effective_status()
+        .select_related("category")
+        .only(*CARD_FIELDS)
+        .in_bulk(page.object_list)
+    )
+    page.object_list = [
+        events[event_id] for event_id in page.object_list if event_id in events
+    ]
+
+    return page
@@ -0,0 +1,32 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apps.events.cache import invalidate_events_cache
+from apps.events.certificates import delete_event_certificates
+from apps.events.models import EventModel, EventParticipantModel, EventRankingModel
+
+
+@receiver(post_save, sender=EventModel)
+@receiver(post_delete, sender=EventModel)
+@receiver(post_save, sender=EventParticipantModel)
+@receiver(post_delete, sender=EventParticipantModel)
+def on_events_changed(sender, **kwargs):
+    invalidate_events_cache()
+
+
+@receiver(post_save, sender=EventModel)
+def sync_event_ranking(sender, instance, created, **kwargs):
+    # O ranking guarda a data de início para filtrar eventos futuros sem join
+    if created:
+        EventRankingModel.objects.create(event=instance, start_date=instance.start_date)
+    else:
+        EventRankingModel.objects.filter(event=instance).update(
+            start_date=instance.start_date
+        )
+
+
+@receiver(post_delete, sender=EventModel)
+def delete_certificate_files(sender, instance, **kwargs):
+    event_id = instance.id
+    transaction.on_commit(lambda: delete_event_certificates(event_id))
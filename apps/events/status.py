@@ -0,0 +1,289 @@
+import heapq
+import logging
+from datetime import datetime, timedelta
+
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from apps.core.routers import mark_primary_written
+from apps.events.archive import event_participations
+from apps.events.cache import invalidate_events_cache
+from apps.events.models import EventModel, EventParticipantModel
+
+logger = logging.getLogger(__name__)
+
+
+def auto_close_event(event_id: int) -> bool:
+    """
+    Fecha automaticamente um evento se:
+    1. O horário de início já passou
+    2. O evento está com status OPEN
+    3. O evento não está cancelado ou finalizado
+
+    Retorna True se o evento foi fechado, False caso contrário
+    """
+    try:
+        with transaction.atomic():
+            event = EventModel.objects.select_for_update().get(id=event_id)
+
+            if event.status != EventModel.Status.OPEN:
+                return False
+
+            if event.start_date > timezone.now():
+                return False
+
+            # Atualizar apenas o status, sem passar pelo formulário
+            EventModel.objects.filter(id=event_id).update(
+                status=EventModel.Status.CLOSED, updated_at=timezone.now()
+            )
+            invalidate_events_cache()
+            return True
+
+    except EventModel.DoesNotExist:
+        return False
+    except Exception:
+        logger.exception("Erro ao fechar evento automaticamente %s", event_id)
+        return False
+
+
+def auto_finish_event(event_id: int) -> bool:
+    """
+    Finaliza automaticamente um evento se:
+    1. A data de término já passou
+    2. O evento não está cancelado
+    3. A lista de chamada foi feita (pelo menos um participante com status definido)
+
+    Retorna True se o evento foi finalizado, False caso contrário
+    """
+    try:
+        with transaction.atomic():
+            event = EventModel.objects.select_for_update().get(id=event_id)
+
+            if event.status in [EventModel.Status.FINISHED, EventModel.Status.CANCELED]:
+                return False
+
+            if event.end_date > timezone.now():
+                return False
+
+            # Verificar se há pelo menos um participante com status definido (lista de chamada feita)
+            has_attendance_records = event.participants_records.filter(
+                status__in=["PRESENT", "ABSENT"]
+            ).exists()
+
+            if not has_attendance_records:
+                return False
+
+            # Atualizar apenas o status, sem passar pelo formulário
+            EventModel.objects.filter(id=event_id).update(
+                status=EventModel.Status.FINISHED, updated_at=timezone.now()
+            )
+            invalidate_events_cache()
+            return True
+
+    except EventModel.DoesNotExist:
+        return False
+    except Exception:
+        logger.exception("Erro ao finalizar evento automaticamente %s", event_id)
+        return False
+
+
+def can_generate_certificates(event: EventModel) -> bool:
+    """
+    Verifica se o evento está em condições de gerar certificados
+    """
+    return (
+        event.status == EventModel.Status.FINISHED
+        and event.end_date <= timezone.now()
+        and event_participations(event).filter(status="PRESENT").exists()
+    )
+
+
+def close_due_events(now: datetime | None = None, event_ids=None) -> list:
+    """
+    Fecha, em um único UPDATE condicional, todos os eventos OPEN cujo
+    horário de início já passou. Se `event_ids` for informado, restringe
+    a atualização a esses eventos.
+
+    Retorna os ids dos eventos efetivamente fechados
+    """
+    now = now or timezone.now()
+
+    sql = (
+        f"UPDATE {EventModel._meta.db_table} "
+        "SET status = %s, updated_at = %s "
+        "WHERE status = %s AND start_date <= %s AND NOT deleted"
+    )
+    params = [EventModel.Status.CLOSED, now, EventModel.Status.OPEN, now]
+
+    if event_ids is not None:
+        sql += " AND id = ANY(%s::uuid[])"
+        params.append([str(event_id) for event_id in event_ids])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql + " RETURNING id", params)
+        changed = [row[0] for row in cursor.fetchall()]
+
+    if changed:
+        invalidate_events_cache()
+        mark_primary_written()
+    return changed
+
+
+def finish_due_events(now: datetime | None = None, event_ids=None) -> list:
+    """
+    Finaliza, em um único UPDATE condicional, todos os eventos CLOSED cuja
+    data de término já passou e que tiveram a lista de chamada feita.
+    Se `event_ids` for informado, restringe a atualização a esses eventos.
+
+    Retorna os ids dos eventos efetivamente finalizados
+    """
+    now = now or timezone.now()
+    events_table = EventModel._meta.db_table
+    participants_table = EventParticipantModel._meta.db_table
+
+    sql = (
+        f"UPDATE {events_table} "
+        "SET status = %s, updated_at = %s "
+        "WHERE status = %s AND end_date <= %s AND NOT deleted "
+        f"AND EXISTS (SELECT 1 FROM {participants_table} p "
+        f"WHERE p.event_id = {events_table}.id AND NOT p.deleted "
+        "AND p.status IN (%s, %s))"
+    )
+    params = [
+        EventModel.Status.FINISHED,
+        now,
+        EventModel.Status.CLOSED,
+        now,
+        EventParticipantModel.ParticipationStatus.PRESENT,
+        EventParticipantModel.ParticipationStatus.ABSENT,
+    ]
+
+    if event_ids is not None:
+        sql += " AND id = ANY(%s::uuid[])"
+        params.append([str(event_id) for event_id in event_ids])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql + " RETURNING id", params)
+        changed = [row[0] for row in cursor.fetchall()]
+
+    if changed:
+        invalidate_events_cache()
+        mark_primary_written()
+    return changed
+
+
+def update_events_status_bulk(now: datetime | None = None) -> tuple[list, list]:
+    """
+    Atualiza o status de todos os eventos que precisam ser atualizados,
+    com um UPDATE para os fechamentos e outro para as finalizações.
+
+    Retorna uma tupla (ids fechados, ids finalizados)
+    """
+    now = now or timezone.now()
+
+    with transaction.atomic():
+        closed = close_due_events(now)
+        finished = finish_due_events(now)
+
+    return closed, finished
+
+
+# =====================================================================
+# AGENDADOR DE TRANSIÇÕES
+# =====================================================================
+
+
+class StatusTransitionScheduler:
+    """
+    Mantém um índice em memória (heap ordenado pelo horário) das próximas
+    transições de status: fechamento no `start_date` e finalização no
+    `end_date`. O índice cobre apenas a janela `horizon` à frente e é
+    recarregado periodicamente pelo worker.
+    """
+
+    CLOSE = "close"
+    FINISH = "finish"
+
+    def __init__(self, horizon: timedelta = timedelta(minutes=10)):
+        self.horizon = horizon
+        self._heap: list[tuple[datetime, str, str]] = []
+        self._scheduled: set[tuple[str, str]] = set()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, due_at: datetime, kind: str, event_id) -> None:
+        key = (kind, str(event_id))
+        if key in self._scheduled:
+            return
+        self._scheduled.add(key)
+        heapq.heappush(self._heap, (due_at, kind, str(event_id)))
+
+    def load(self, now: datetime | None = None) -> int:
+        """
+        Reconstrói o índice com as transições que vencem até
+        `now + horizon`, incluindo as atrasadas. Retorna o tamanho do índice.
+        """
+        now = now or timezone.now()
+        until = now + self.horizon
+        self._heap = []
+        self._scheduled = set()
+
+        to_close = EventModel.objects.filter(
+            status=EventModel.Status.OPEN, start_date__lte=until
+        ).values_list("id", "start_date")
+
+        for event_id, start_date in to_close:
+            self.schedule(start_date, self.CLOSE, event_id)
+
+        # Eventos já encerrados sem lista de chamada ficam de fora: eles são
+        # finalizados pela própria tela de presença quando a chamada é feita.
+        to_finish = (
+            EventModel.objects.filter(
+                status=EventModel.Status.CLOSED, end_date__lte=until
+            )
+            .filter(
+                models.Q(end_date__gt=now)
+                | models.Q(participants_records__status__in=["PRESENT", "ABSENT"])
+            )
+            .distinct()
+            .values_list("id", "end_date")
+        )
+
+        for event_id, end_date in to_finish:
+            self.schedule(end_date, self.FINISH, event_id)
+
+        return len(self._heap)
+
+    def next_due(self) -> datetime | None:
+        return self._heap[0][0] if self._heap else None
+
+    def run_due(self, now: datetime | None = None) -> dict[str, int]:
+        """
+        Aplica, em lote, todas as transições vencidas até `now`.
+        Retorna a contagem de eventos fechados e finalizados.
+        """
+        now = now or timezone.now()
+        due = {self.CLOSE: [], self.FINISH: []}
+
+        while self._heap and self._heap[0][0] <= now:
+            due_at, kind, event_id = heapq.heappop(self._heap)
+            self._scheduled.discard((kind, event_id))
+            due[kind].append(event_id)
+
+        closed = close_due_events(now, due[self.CLOSE]) if due[self.CLOSE] else []
+
+        # Eventos recém-fechados cujo término também já venceu são
+        # finalizados na mesma rodada; os demais entram no índice.
+        end_dates = EventModel.objects.filter(id__in=closed).values_list(
+            "id", "end_date"
+        )
+        for event_id, end_date in end_dates:
+            if end_date <= now:
+                due[self.FINISH].append(str(event_id))
+            elif end_date <= now + self.horizon:
+                self.schedule(end_date, self.FINISH, event_id)
+
+        finished = finish_due_events(now, due[self.FINISH]) if due[self.FINISH] else []
+
+        return {self.CLOSE: len(closed), self.FINISH: len(finished)}
@@ -1,3 +1,1264 @@
-from django.test import TestCase
+import io
+import tempfile
+import time
+import uuid
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 
-# Create your tests here.
+from django.core import signing
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Count
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from reportlab import rl_config
+
+from apps.authentication.models import UserModel
+from apps.core.routers import replica_reads
+from apps.events.archive import archive_events, event_participations
+from apps.events.benchmarks import (
+    BenchmarkDataset,
+    compare_to_baseline,
+    load_baseline,
+    run_view_benchmarks,
+)
+from apps.events.browse import browse_events, decode_cursor, topic_facets
+from apps.events.cache import (
+    bump_events_version,
+    get_events_version,
+    get_or_refresh,
+    invalidate_events_cache,
+)
+from apps.events.certificates import (
+    certificate_path,
+    event_certificates_dir,
+    issue_certificate,
+    write_certificate,
+)
+from apps.events.checkin import (
+    CHECKIN_SALT,
+    CHECKIN_TOKEN_MAX_AGE,
+    CheckinResult,
+    checkin_token,
+)
+from apps.events.enrollment import (
+    EnrollmentResult,
+    enroll_user,
+    join_waitlist,
+    promote_waitlist,
+    unenroll_user,
+    waitlist_position,
+)
+from apps.events.exports import roster_rows
+from apps.events.forms import normalize_topics
+from apps.events.management.commands.run_status_scheduler import (
+    SCHEDULER_LOCK_ID,
+    advisory_unlock,
+    try_advisory_lock,
+)
+from apps.events.models import (
+    CategoryModel,
+    EventModel,
+    EventParticipantModel,
+    EventRankingModel,
+    IssuedCertificateModel,
+)
+from apps.events.rankings import compact_rankings, top_events
+from apps.events.search import search_events
+from apps.events.status import (
+    StatusTransitionScheduler,
+    close_due_events,
+    finish_due_events,
+    update_events_status_bulk,
+)
+
+
+def create_users(total, role=UserModel.Role.STUDENT, prefix="user"):
+    users = [
+        UserModel(
+            email=f"{prefix}{i}@sinapse.local",
+            first_name="Usuário",
+            last_name=str(i),
+            role=role,
+        )
+        for i in range(total)
+    ]
+    for user in users:
+        user.set_unusable_password()
+    return UserModel.objects.bulk_create(users)
+
+
+def create_event(user, **kwargs):
+    now = timezone.now()
+    defaults = {
+        "name": "Evento",
+        "street": "Rua A, 1",
+        "city": "São Paulo",
+        "state": "SP",
+        "zip_code": "01000000",
+        "start_date": now + timedelta(days=1),
+        "end_date": now + timedelta(days=1, hours=2),
+        "category": CategoryModel.objects.get_or_create(name="tecnologia")[0],
+        "user": user,
+    }
+    defaults.update(kwargs)
+    return EventModel.objects.create(**defaults)
+
+
+class EnrollmentStressTest(TransactionTestCase):
+    """
+    Dispara inscrições concorrentes, cada thread com sua própria conexão,
+    e verifica que a capacidade do evento nunca é ultrapassada.
+    """
+
+    WORKERS = 32
+
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+
+    def _enroll_concurrently(self, event, user_ids):
+        def enroll(user_id):
+            try:
+                return enroll_user(event.id, user_id)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=self.WORKERS) as executor:
+            return list(executor.map(enroll, user_ids))
+
+    def test_no_overbooking_with_1k_concurrent_enrollments(self):
+        event = create_event(self.teacher, participants_limit=100)
+        students = create_users(1000)
+
+        results = self._enroll_concurrently(event, [s.id for s in students])
+
+        event.refresh_from_db()
+        self.assertEqual(results.count(EnrollmentResult.ENROLLED), 100)
+        self.assertEqual(results.count(EnrollmentResult.FULL), 900)
+        self.assertEqual(event.participants_count, 100)
+        self.assertEqual(event.participants_records.count(), 100)
+
+    def test_concurrent_duplicates_reserve_a_single_seat(self):
+        event = create_event(self.teacher, participants_limit=10)
+        student = create_users(1)[0]
+
+        results = self._enroll_concurrently(event, [student.id] * 200)
+
+        event.refresh_from_db()
+        self.assertEqual(results.count(EnrollmentResult.ENROLLED), 1)
+        self.assertEqual(results.count(EnrollmentResult.ALREADY_ENROLLED), 199)
+        self.assertEqual(event.participants_count, 1)
+        self.assertEqual(
+            EventParticipantModel.objects.filter(event=event, user=student).count(),
+            1,
+        )
+
+    def test_closed_event_rejects_enrollment(self):
+        event = create_event(self.teacher, participants_limit=10)
+        EventModel.objects.filter(id=event.id).update(status=EventModel.Status.CLOSED)
+        student = create_users(1)[0]
+
+        self.assertEqual(enroll_user(event.id, student.id), EnrollmentResult.CLOSED)
+
+
+class EventsCacheTest(TestCase):
+    key = "events:test"
+
+    def setUp(self):
+        cache.clear()
+        self.computed = []
+
+    def compute(self, value):
+        def compute():
+            self.computed.append(value)
+            return value
+
+        return compute
+
+    def test_version_bump_invalidates_the_entry(self):
+        first = get_or_refresh(self.key, self.compute("v1"))
+        cached = get_or_refresh(self.key, self.compute("v2"))
+
+        # A versão só muda quando a transação confirma
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_events_cache()
+            pending = get_or_refresh(self.key, self.compute("v2"))
+        refreshed = get_or_refresh(self.key, self.compute("v3"))
+
+        self.assertEqual([first, cached, pending, refreshed], ["v1", "v1", "v1", "v3"])
+        self.assertEqual(self.computed, ["v1", "v3"])
+
+    def test_serves_stale_entry_while_a_single_refresh_runs(self):
+        get_or_refresh(self.key, self.compute("v1"))
+        bump_events_version()
+        served_meanwhile = []
+
+        def slow_refresh():
+            # Outros workers pedem a entrada enquanto este a recalcula
+            for _ in range(3):
+                served_meanwhile.append(get_or_refresh(self.key, self.compute("x")))
+            return self.compute("v2")()
+
+        refreshed = get_or_refresh(self.key, slow_refresh)
+
+        self.assertEqual(served_meanwhile, ["v1", "v1", "v1"])
+        self.assertEqual(refreshed, "v2")
+        self.assertEqual(get_or_refresh(self.key, self.compute("x")), "v2")
+        self.assertEqual(self.computed, ["v1", "v2"])
+
+    def test_refresh_reads_from_the_primary(self):
+        token = replica_reads.set(True)
+        try:
+            cached = get_or_refresh(self.key, replica_reads.get)
+            # Sem gravar no cache (outro worker tem a trava), pode usar réplica
+            cache.add(f"{self.key}:other:lock", 1)
+            uncached = get_or_refresh(f"{self.key}:other", replica_reads.get)
+            still_enabled = replica_reads.get()
+        finally:
+            replica_reads.reset(token)
+
+        self.assertFalse(cached)
+        self.assertTrue(uncached)
+        self.assertTrue(still_enabled)
+
+
+class RecountParticipantsTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.students = create_users(3)
+
+    def test_recount_fixes_only_drifted_counters(self):
+        inflated, missed, correct = (create_event(self.teacher) for _ in range(3))
+        for event in (inflated, correct):
+            enroll_user(event.id, self.students[0].id)
+        # Inscrições gravadas sem passar pelo contador
+        EventParticipantModel.objects.bulk_create(
+            [EventParticipantModel(event=missed, user=s) for s in self.students]
+        )
+        EventModel.objects.filter(id=inflated.id).update(participants_count=10)
+
+        fixed = EventModel.objects.all().recount_participants()
+        output = io.StringIO()
+        call_command("recount_participants", stdout=output)
+
+        counts = dict(
+            EventModel.objects.filter(
+                id__in=[inflated.id, missed.id, correct.id]
+            ).values_list("id", "participants_count")
+        )
+        self.assertEqual(fixed, 2)
+        self.assertEqual(counts, {inflated.id: 1, missed.id: 3, correct.id: 1})
+        self.assertIn("0 evento(s)", output.getvalue())
+
+
+class WaitlistTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.students = create_users(4)
+        self.event = create_event(self.teacher, participants_limit=1)
+        enroll_user(self.event.id, self.students[0].id)
+
+    def enrolled_ids(self):
+        return set(self.event.participants_records.values_list("user_id", flat=True))
+
+    def test_unenroll_promotes_the_first_in_line(self):
+        first, second = self.students[1], self.students[2]
+        join_waitlist(self.event.id, first.id)
+        join_waitlist(self.event.id, second.id)
+        self.client.force_login(self.students[0])
+
+        self.client.get(reverse("cancel_enrollment", args=[self.event.id]))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.enrolled_ids(), {first.id})
+        self.assertEqual(self.event.participants_count, 1)
+        self.assertEqual(waitlist_position(self.event.id, second.id), 1)
+
+    def test_promotes_in_queue_order(self):
+        # Ordem de entrada na fila, não a de criação dos usuários
+        queue = [self.students[3], self.students[1], self.students[2]]
+        for student in queue:
+            join_waitlist(self.event.id, student.id)
+        EventModel.objects.filter(id=self.event.id).update(participants_limit=3)
+
+        promoted = promote_waitlist(self.event.id)
+
+        self.assertEqual(promoted, 2)
+        self.assertEqual(
+            self.enrolled_ids(), {self.students[0].id, queue[0].id, queue[1].id}
+        )
+        self.assertEqual(waitlist_position(self.event.id, queue[2].id), 1)
+
+    def test_raising_the_limit_in_edit_event_promotes(self):
+        waiting = self.students[1]
+        join_waitlist(self.event.id, waiting.id)
+        self.client.force_login(self.teacher)
+        event = self.event
+        date_format = "%Y-%m-%dT%H:%M"
+
+        response = self.client.post(
+            reverse("edit_event", args=[event.id]),
+            {
+                "name": event.name,
+                "description": "Descrição",
+                "topics": "python",
+                "street": event.street,
+                "city": event.city,
+                "state": event.state,
+                "country": "Brasil",
+                "zip_code": event.zip_code,
+                "start_date": timezone.localtime(event.start_date).strftime(
+                    date_format
+                ),
+                "end_date": timezone.localtime(event.end_date).strftime(date_format),
+                "participants_limit": 2,
+                "category": event.category_id,
+            },
+        )
+
+        self.assertRedirects(
+            response,
+            reverse("event_details", args=[event.id]),
+            fetch_redirect_response=False,
+        )
+        self.assertIn(waiting.id, self.enrolled_ids())
+        self.assertIsNone(waitlist_position(event.id, waiting.id))
+
+    def test_join_and_leave_the_waitlist_through_the_views(self):
+        student = self.students[1]
+        self.client.force_login(student)
+        details_url = reverse("event_details", args=[self.event.id])
+
+        self.client.get(reverse("enroll_event", args=[self.event.id]))
+        waiting = self.client.get(details_url)
+        self.client.get(reverse("cancel_enrollment", args=[self.event.id]))
+        left = self.client.get(details_url)
+
+        self.assertEqual(waiting.context["waitlist_position"], 1)
+        self.assertIsNone(left.context["waitlist_position"])
+        self.assertNotIn(student.id, self.enrolled_ids())
+
+
+def create_event_with_status(user, status, start_date, end_date, **kwargs):
+    # Datas passadas não passam pelo full_clean do save
+    event = create_event(user, **kwargs)
+    EventModel.objects.filter(id=event.id).update(
+        status=status, start_date=start_date, end_date=end_date
+    )
+    return event
+
+
+class EffectiveStatusTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.student = create_users(1)[0]
+        now = timezone.now()
+        self.upcoming = create_event(self.teacher, name="Futuro")
+        self.started = create_event_with_status(
+            self.teacher,
+            EventModel.Status.OPEN,
+            now - timedelta(hours=1),
+            now + timedelta(hours=1),
+            name="Em andamento",
+        )
+        self.ended = create_event_with_status(
+            self.teacher,
+            EventModel.Status.CLOSED,
+            now - timedelta(hours=3),
+            now - timedelta(hours=1),
+            name="Encerrado",
+        )
+        EventParticipantModel.objects.create(
+            event=self.ended, user=self.student, status="PRESENT"
+        )
+        EventParticipantModel.objects.create(event=self.started, user=self.student)
+
+    def test_started_event_is_listed_as_closed_without_writing(self):
+        self.client.force_login(self.student)
+
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse("events_index"))
+
+        statuses = {event.name: event.status for event in response.context["enrolled"]}
+        self.assertEqual(statuses["Em andamento"], EventModel.Status.CLOSED)
+        self.assertEqual(statuses["Encerrado"], EventModel.Status.FINISHED)
+        self.assertEqual(
+            EventModel.objects.get(id=self.started.id).status, EventModel.Status.OPEN
+        )
+        self.assertFalse(any(query["sql"].startswith("UPDATE") for query in captured))
+
+    def test_filters_on_effective_status(self):
+        events = EventModel.objects.with_effective_status()
+
+        def names(status):
+            return list(
+                events.filter(effective_status=status).values_list("name", flat=True)
+            )
+
+        self.assertEqual(names(EventModel.Status.OPEN), ["Futuro"])
+        self.assertEqual(names(EventModel.Status.CLOSED), ["Em andamento"])
+        self.assertEqual(names(EventModel.Status.FINISHED), ["Encerrado"])
+
+
+class BulkStatusUpdateTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.student = create_users(1)[0]
+        self.now = timezone.now()
+
+    def event(self, status, starts_in_hours, ends_in_hours):
+        return create_event_with_status(
+            self.teacher,
+            status,
+            self.now + timedelta(hours=starts_in_hours),
+            self.now + timedelta(hours=ends_in_hours),
+        )
+
+    def statuses(self, *events):
+        return [EventModel.objects.get(id=event.id).status for event in events]
+
+    def test_close_touches_only_open_events_past_their_start(self):
+        due = self.event(EventModel.Status.OPEN, -1, 1)
+        upcoming = self.event(EventModel.Status.OPEN, 1, 2)
+        canceled = self.event(EventModel.Status.CANCELED, -1, 1)
+
+        closed = close_due_events(self.now)
+
+        self.assertEqual(closed, [due.id])
+        self.assertEqual(
+            self.statuses(due, upcoming, canceled),
+            [
+                EventModel.Status.CLOSED,
+                EventModel.Status.OPEN,
+                EventModel.Status.CANCELED,
+            ],
+        )
+
+    def test_finish_requires_end_date_and_attendance(self):
+        done, no_attendance, running = (
+            self.event(EventModel.Status.CLOSED, -3, -1),
+            self.event(EventModel.Status.CLOSED, -3, -1),
+            self.event(EventModel.Status.CLOSED, -1, 1),
+        )
+        for event in (done, running):
+            EventParticipantModel.objects.create(
+                event=event, user=self.student, status="PRESENT"
+            )
+
+        finished = finish_due_events(self.now)
+
+        self.assertEqual(finished, [done.id])
+        self.assertEqual(
+            self.statuses(done, no_attendance, running),
+            [
+                EventModel.Status.FINISHED,
+                EventModel.Status.CLOSED,
+                EventModel.Status.CLOSED,
+            ],
+        )
+
+    def test_bulk_update_returns_ids_and_invalidates_only_on_change(self):
+        version = get_events_version()
+        self.event(EventModel.Status.OPEN, 1, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            unchanged = update_events_status_bulk(self.now)
+        unchanged_version = get_events_version()
+
+        due = self.event(EventModel.Status.OPEN, -1, 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            changed = update_events_status_bulk(self.now)
+
+        self.assertEqual(unchanged, ([], []))
+        self.assertEqual(unchanged_version, version)
+        self.assertEqual(changed, ([due.id], []))
+        self.assertGreater(get_events_version(), version)
+
+
+class StatusSchedulerTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.student = create_users(1)[0]
+        self.now = timezone.now()
+
+    def event(self, status, starts_in, ends_in, attendance=None):
+        """
+        Evento com início e término a `starts_in`/`ends_in` minutos de agora
+        """
+        event = create_event_with_status(
+            self.teacher,
+            status,
+            self.now + timedelta(minutes=starts_in),
+            self.now + timedelta(minutes=ends_in),
+        )
+        if attendance:
+            EventParticipantModel.objects.create(
+                event=event, user=self.student, status=attendance
+            )
+        return event
+
+    def test_load_keeps_only_transitions_within_the_horizon(self):
+        open_soon = self.event(EventModel.Status.OPEN, 5, 60)
+        open_late = self.event(EventModel.Status.OPEN, -5, 60)
+        self.event(EventModel.Status.OPEN, 60, 120)
+        ending_soon = self.event(EventModel.Status.CLOSED, -60, 5)
+        ended = self.event(EventModel.Status.CLOSED, -120, -60, "PRESENT")
+        # Encerrado sem lista de chamada: a tela de presença o finaliza
+        self.event(EventModel.Status.CLOSED, -120, -60)
+        self.event(EventModel.Status.OPEN, 5, 60).soft_delete()
+
+        scheduler = StatusTransitionScheduler(horizon=timedelta(minutes=10))
+
+        self.assertEqual(scheduler.load(self.now), 4)
+        self.assertEqual(
+            scheduler._scheduled,
+            {
+                (scheduler.CLOSE, str(open_soon.id)),
+                (scheduler.CLOSE, str(open_late.id)),
+                (scheduler.FINISH, str(ending_soon.id)),
+                (scheduler.FINISH, str(ended.id)),
+            },
+        )
+        self.assertEqual(scheduler.next_due(), self.now - timedelta(minutes=60))
+
+    def test_run_due_closes_and_finishes_in_the_same_pass(self):
+        event = self.event(EventModel.Status.OPEN, -180, -60, "PRESENT")
+        upcoming = self.event(EventModel.Status.OPEN, 5, 60)
+        scheduler = StatusTransitionScheduler()
+        scheduler.load(self.now)
+
+        applied = scheduler.run_due(self.now)
+
+        event.refresh_from_db()
+        upcoming.refresh_from_db()
+        self.assertEqual(applied, {scheduler.CLOSE: 1, scheduler.FINISH: 1})
+        self.assertEqual(event.status, EventModel.Status.FINISHED)
+        self.assertEqual(upcoming.status, EventModel.Status.OPEN)
+        self.assertEqual(len(scheduler), 1)
+
+    def test_deleted_events_are_left_alone(self):
+        deleted = self.event(EventModel.Status.OPEN, -180, -60, "PRESENT")
+        deleted.soft_delete()
+        scheduler = StatusTransitionScheduler()
+        # Excluído depois de entrar no índice
+        scheduler.schedule(
+            self.now - timedelta(minutes=180), scheduler.CLOSE, deleted.id
+        )
+
+        applied = scheduler.run_due(self.now)
+
+        self.assertEqual(applied, {scheduler.CLOSE: 0, scheduler.FINISH: 0})
+        self.assertEqual(
+            EventModel.all_objects.get(id=deleted.id).status, EventModel.Status.OPEN
+        )
+
+    def test_advisory_lock_keeps_a_single_scheduler(self):
+        def run_once():
+            output = io.StringIO()
+            try:
+                call_command("run_status_scheduler", "--once", stdout=output)
+            finally:
+                connection.close()
+            return output.getvalue()
+
+        # Cada worker roda em uma thread com a própria conexão (sessão)
+        self.assertTrue(try_advisory_lock(SCHEDULER_LOCK_ID))
+        try:
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                blocked = executor.submit(run_once).result()
+        finally:
+            advisory_unlock(SCHEDULER_LOCK_ID)
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            started = executor.submit(run_once).result()
+
+        self.assertIn("Outro agendador está em execução", blocked)
+        self.assertIn("Agendador de status iniciado", started)
+
+
+class EventRankingTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.students = create_users(3)
+
+    def test_ranking_follows_enrollments_and_cancellations(self):
+        quiet = create_event(self.teacher, name="Calmo")
+        busy = create_event(self.teacher, name="Concorrido")
+
+        for student in self.students:
+            enroll_user(busy.id, student.id)
+        enroll_user(quiet.id, self.students[0].id)
+        unenroll_user(busy.id, self.students[0].id)
+
+        ranking = EventRankingModel.objects.get(event=busy)
+        self.assertEqual(ranking.total_enrollments, 2)
+        self.assertEqual(ranking.enrollments_24h, 2)
+        self.assertEqual(
+            [e.id for e in top_events("total_enrollments")], [busy.id, quiet.id]
+        )
+
+    def test_compaction_decays_windows_and_drops_started_events(self):
+        event = create_event(self.teacher)
+        past = create_event(self.teacher)
+        yesterday = timezone.now() - timedelta(days=1)
+        EventModel.objects.filter(id=past.id).update(start_date=yesterday)
+        EventRankingModel.objects.filter(event=past).update(start_date=yesterday)
+        enroll_user(event.id, self.students[0].id)
+        EventParticipantModel.objects.filter(event=event).update(
+            created_at=timezone.now() - timedelta(days=3)
+        )
+
+        refreshed, removed = compact_rankings()
+
+        ranking = EventRankingModel.objects.get(event=event)
+        self.assertEqual((refreshed, removed), (1, 1))
+        self.assertEqual(ranking.total_enrollments, 1)
+        self.assertEqual(ranking.enrollments_24h, 0)
+        self.assertEqual(ranking.enrollments_7d, 1)
+        self.assertFalse(EventRankingModel.objects.filter(event=past).exists())
+
+
+class BrowseEventsTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+
+    def test_cursor_walks_every_event_once_in_order(self):
+        start = timezone.now() + timedelta(days=2)
+        events = [
+            # Mesmo start_date em pares, para exercitar o desempate por id
+            create_event(
+                self.teacher,
+                start_date=start + timedelta(hours=i // 2),
+                end_date=start + timedelta(hours=i // 2 + 1),
+            )
+            for i in range(7)
+        ]
+
+        seen, cursor = [], None
+        while True:
+            page, next_cursor = browse_events(cursor=cursor, limit=3)
+            seen.extend(event.id for event in page)
+            if not next_cursor:
+                break
+            cursor = decode_cursor(next_cursor)
+
+        expected = sorted(events, key=lambda e: (e.start_date, e.id))
+        self.assertEqual(seen, [event.id for event in expected])
+
+    def test_view_filters_by_city_and_status(self):
+        create_event(self.teacher, name="Em Recife", city="Recife")
+        canceled = create_event(self.teacher, name="Cancelado", city="Recife")
+        EventModel.objects.filter(id=canceled.id).update(
+            status=EventModel.Status.CANCELED
+        )
+        create_event(self.teacher, name="Em Natal", city="Natal")
+
+        response = self.client.get(
+            reverse("browse_events"), {"city": "recife", "status": "OPEN"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [event.name for event in response.context["events"]], ["Em Recife"]
+        )
+
+    def test_view_rejects_tampered_cursor(self):
+        response = self.client.get(reverse("browse_events"), {"cursor": "xyz"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["events"], [])
+        self.assertIn("cursor", response.context["form"].errors)
+
+
+class SearchEventsTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+
+    def test_ranks_name_over_topics_over_description(self):
+        by_description = create_event(
+            self.teacher, name="Encontro", description="Oficina de robótica"
+        )
+        by_name = create_event(self.teacher, name="Robótica na escola")
+        by_topic = create_event(self.teacher, name="Feira", topics=["robótica"])
+        create_event(self.teacher, name="Sarau", description="Poesia")
+
+        page = search_events("Robótica")
+
+        self.assertEqual(
+            [event.id for event in page.object_list],
+            [by_name.id, by_topic.id, by_description.id],
+        )
+
+    def test_matches_inflected_words(self):
+        event = create_event(self.teacher, name="Programação para iniciantes")
+
+        page = search_events("iniciante")
+
+        self.assertEqual([e.id for e in page.object_list], [event.id])
+
+
+class TopicFacetsTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+
+    def test_normalizes_case_whitespace_and_duplicates(self):
+        self.assertEqual(
+            normalize_topics([" IA ", "ia", "Machine   Learning", " "]),
+            ["ia", "machine learning"],
+        )
+
+    def test_counts_topics_within_current_filters(self):
+        create_event(self.teacher, city="Recife", topics=["ia", "python"])
+        create_event(self.teacher, city="Recife", topics=["ia"])
+        create_event(self.teacher, city="Natal", topics=["ia", "python"])
+
+        self.assertEqual(
+            topic_facets(city="Recife", upcoming=True), [("ia", 2), ("python", 1)]
+        )
+        self.assertEqual(
+            topic_facets(city="Recife", topics=["python"], upcoming=True),
+            [("ia", 1), ("python", 1)],
+        )
+
+    def test_facet_endpoint_filters_by_topic(self):
+        create_event(self.teacher, topics=["ia", "python"])
+        create_event(self.teacher, topics=["design"])
+
+        response = self.client.get(reverse("browse_facets"), {"topic": " Python"})
+
+        self.assertEqual(
+            response.json(),
+            {"topics": [{"topic": "ia", "count": 1}, {"topic": "python", "count": 1}]},
+        )
+
+
+@override_settings(CERTIFICATES_ROOT=tempfile.mkdtemp(prefix="certificates-"))
+class CertificateDownloadTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.student = create_users(1)[0]
+        self.event = create_event(self.teacher)
+        EventParticipantModel.objects.create(
+            event=self.event,
+            user=self.student,
+            status=EventParticipantModel.ParticipationStatus.PRESENT,
+        )
+        now = timezone.now()
+        EventModel.objects.filter(id=self.event.id).update(
+            status=EventModel.Status.FINISHED,
+            start_date=now - timedelta(hours=3),
+            end_date=now - timedelta(hours=1),
+        )
+        self.url = reverse("generate_certificate", args=[self.event.id])
+        self.client.force_login(self.student)
+
+    def stored_files(self):
+        return list(event_certificates_dir(self.event.id).glob("*.pdf"))
+
+    def test_renders_once_and_revalidates_with_etag(self):
+        first = self.client.get(self.url)
+        pdf = b"".join(first.streaming_content)
+        stored = self.stored_files()
+
+        again = self.client.get(self.url)
+        not_modified = self.client.get(self.url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertTrue(pdf.startswith(b"%PDF"))
+        self.assertEqual(len(stored), 1)
+        self.assertEqual(b"".join(again.streaming_content), pdf)
+        self.assertEqual(self.stored_files(), stored)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_rendering_leaves_the_reportlab_config_alone(self):
+        before = rl_config.useA85
+
+        pdf = b"".join(self.client.get(self.url).streaming_content)
+
+        self.assertEqual(rl_config.useA85, before)
+        self.assertNotIn(b"ASCII85Decode", pdf)
+
+    def test_serves_byte_ranges(self):
+        pdf = b"".join(self.client.get(self.url).streaming_content)
+
+        partial = self.client.get(self.url, HTTP_RANGE="bytes=0-9")
+        suffix = self.client.get(self.url, HTTP_RANGE="bytes=-5")
+        unsatisfiable = self.client.get(self.url, HTTP_RANGE=f"bytes={len(pdf)}-")
+
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial.content, pdf[:10])
+        self.assertEqual(partial["Content-Range"], f"bytes 0-9/{len(pdf)}")
+        self.assertEqual(suffix.content, pdf[-5:])
+        self.assertEqual(unsatisfiable.status_code, 416)
+
+    def test_name_change_replaces_stored_file(self):
+        first = self.client.get(self.url)
+        old_files = self.stored_files()
+
+        self.student.first_name = "Outro"
+        self.student.save()
+        second = self.client.get(self.url)
+
+        self.assertNotEqual(first["ETag"], second["ETag"])
+        self.assertEqual(len(self.stored_files()), 1)
+        self.assertNotEqual(self.stored_files(), old_files)
+
+    def test_new_version_keeps_files_of_users_with_the_same_id_prefix(self):
+        user_id = uuid.UUID("12345678-0000-4000-8000-000000000001")
+        neighbour_id = uuid.UUID("12345678-ffff-4000-8000-000000000002")
+        neighbour_path = certificate_path(self.event.id, neighbour_id, "aaaa")
+        write_certificate(neighbour_path, b"%PDF vizinho")
+
+        write_certificate(certificate_path(self.event.id, user_id, "bbbb"), b"%PDF")
+        newer = certificate_path(self.event.id, user_id, "cccc")
+        write_certificate(newer, b"%PDF novo")
+
+        self.assertEqual(sorted(self.stored_files()), sorted([neighbour_path, newer]))
+
+    def test_teacher_downloads_zip_with_every_present_participant(self):
+        absent, present = create_users(2, prefix="other")
+        EventParticipantModel.objects.bulk_create(
+            [
+                EventParticipantModel(
+                    event=self.event,
+                    user=absent,
+                    status=EventParticipantModel.ParticipationStatus.ABSENT,
+                ),
+                EventParticipantModel(
+                    event=self.event,
+                    user=present,
+                    status=EventParticipantModel.ParticipationStatus.PRESENT,
+                ),
+            ]
+        )
+        self.client.force_login(self.teacher)
+
+        response = self.client.get(
+            reverse("download_event_certificates", args=[self.event.id])
+        )
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assertEqual(len(archive.namelist()), 2)
+        for name in archive.namelist():
+            self.assertTrue(archive.read(name).startswith(b"%PDF"))
+        self.assertEqual(len(self.stored_files()), 2)
+        self.assertEqual(self.event.issued_certificates.count(), 2)
+
+    def test_zip_download_reuses_stored_pdfs(self):
+        self.client.force_login(self.teacher)
+        url = reverse("download_event_certificates", args=[self.event.id])
+
+        b"".join(self.client.get(url).streaming_content)
+        (stored,) = self.stored_files()
+        rendered_at = stored.stat().st_mtime_ns
+        b"".join(self.client.get(url).streaming_content)
+
+        self.assertEqual(self.stored_files(), [stored])
+        self.assertEqual(stored.stat().st_mtime_ns, rendered_at)
+
+    def test_issues_once_and_skips_eligibility_afterwards(self):
+        self.client.get(self.url)
+        issued = IssuedCertificateModel.objects.get()
+
+        # Sessão, usuário, evento e emissão: a presença não é consultada
+        with self.assertNumQueries(4):
+            b"".join(self.client.get(self.url).streaming_content)
+
+        self.assertEqual(IssuedCertificateModel.objects.get(), issued)
+        self.assertRegex(issued.code, r"^SNSP(-[A-Z2-7]{4}){4}$")
+        self.assertEqual(issued.participant_name, "Usuário 0")
+
+    def test_public_verification_by_code(self):
+        self.client.get(self.url)
+        code = IssuedCertificateModel.objects.get().code
+        self.client.logout()
+        url = reverse("verify_certificate", args=[code])
+
+        first = self.client.get(url)
+        with self.assertNumQueries(0):
+            cached = self.client.get(url)
+        missing = self.client.get(
+            reverse("verify_certificate", args=["SNSP-AAAA-AAAA-AAAA-AAAA"])
+        )
+
+        self.assertContains(first, self.event.name)
+        self.assertContains(cached, code)
+        self.assertEqual(missing.status_code, 404)
+
+
+class AttendanceExportTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.events = [create_event(self.teacher, name=f"Evento {i}") for i in range(2)]
+        students = create_users(3)
+        EventParticipantModel.objects.bulk_create(
+            [
+                EventParticipantModel(event=event, user=student)
+                for event in self.events
+                for student in students
+            ]
+        )
+        self.client.force_login(self.teacher)
+
+    def test_event_csv_lists_its_participants(self):
+        response = self.client.get(
+            reverse("export_event_attendance", args=[self.events[0].id, "csv"])
+        )
+        lines = b"".join(response.streaming_content).decode("utf-8-sig").splitlines()
+
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith("Evento,"))
+        self.assertTrue(all(line.startswith("Evento 0,") for line in lines[1:]))
+
+    def test_teacher_xlsx_covers_every_event(self):
+        response = self.client.get(reverse("export_attendance", args=["xlsx"]))
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(response.streaming_content)))
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+        self.assertIn("[Content_Types].xml", archive.namelist())
+        self.assertEqual(sheet.count("<row>"), 7)
+        self.assertIn("Evento 1", sheet)
+
+    def test_csv_neutralizes_formulas_in_user_data(self):
+        student = create_users(1, prefix="formula")[0]
+        UserModel.objects.filter(id=student.id).update(
+            first_name='=HYPERLINK("http://x.co")', last_name="x"
+        )
+        EventParticipantModel.objects.create(event=self.events[0], user=student)
+
+        csv_response = self.client.get(
+            reverse("export_event_attendance", args=[self.events[0].id, "csv"])
+        )
+        xlsx_response = self.client.get(
+            reverse("export_event_attendance", args=[self.events[0].id, "xlsx"])
+        )
+        content = b"".join(csv_response.streaming_content).decode("utf-8-sig")
+        archive = zipfile.ZipFile(io.BytesIO(b"".join(xlsx_response.streaming_content)))
+        sheet = archive.read("xl/worksheets/sheet1.xml").decode()
+
+        self.assertIn('"\'=HYPERLINK(""http://x.co"") x"', content)
+        self.assertNotIn(',"=HYPERLINK', content)
+        self.assertIn('<t xml:space="preserve">=HYPERLINK(', sheet)
+
+    def test_rejects_other_teachers_and_unknown_formats(self):
+        other = create_users(1, UserModel.Role.TEACHER, "other")[0]
+        self.client.force_login(other)
+        forbidden = self.client.get(
+            reverse("export_event_attendance", args=[self.events[0].id, "csv"])
+        )
+        unknown = self.client.get(reverse("export_attendance", args=["pdf"]))
+
+        self.assertEqual(forbidden.status_code, 403)
+        self.assertEqual(unknown.status_code, 404)
+
+
+class BulkAttendanceTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.event = create_event(self.teacher)
+        self.records = EventParticipantModel.objects.bulk_create(
+            [
+                EventParticipantModel(event=self.event, user=student)
+                for student in create_users(300)
+            ]
+        )
+        self.url = reverse("event_attendance", args=[self.event.id])
+        self.client.force_login(self.teacher)
+
+    def roster(self, present):
+        return {
+            f"status_{record.id}": "PRESENT" if i < present else "ABSENT"
+            for i, record in enumerate(self.records)
+        }
+
+    def test_whole_roster_in_one_submission(self):
+        # Número de consultas independente do tamanho da turma
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, self.roster(present=200))
+
+        present = EventParticipantModel.objects.filter(
+            event=self.event, status=EventParticipantModel.ParticipationStatus.PRESENT
+        )
+        self.assertRedirects(response, self.url)
+        self.assertEqual(present.count(), 200)
+        self.assertEqual(present.values("attended_at").distinct().count(), 1)
+        self.assertFalse(
+            EventParticipantModel.objects.filter(
+                event=self.event, status="ABSENT", attended_at__isnull=False
+            ).exists()
+        )
+
+    def test_only_changed_records_are_written(self):
+        self.client.post(self.url, self.roster(present=300))
+        before = dict(EventParticipantModel.objects.values_list("id", "attended_at"))
+
+        self.client.post(self.url, self.roster(present=299))
+        after = dict(EventParticipantModel.objects.values_list("id", "attended_at"))
+
+        changed = [pk for pk in before if before[pk] != after[pk]]
+        self.assertEqual(changed, [self.records[-1].id])
+
+    def test_success_message_counts_changes(self):
+        def saved_message(present):
+            response = self.client.post(self.url, self.roster(present), follow=True)
+            return [str(message) for message in response.context["messages"]]
+
+        saved_message(0)
+
+        self.assertEqual(saved_message(1), ["Lista de chamada salva (1 alteração)."])
+        self.assertEqual(saved_message(3), ["Lista de chamada salva (2 alterações)."])
+        self.assertEqual(saved_message(3), ["Lista de chamada salva (0 alterações)."])
+
+    def test_finishes_ended_event_and_then_locks_the_roster(self):
+        now = timezone.now()
+        EventModel.objects.filter(id=self.event.id).update(
+            start_date=now - timedelta(hours=3), end_date=now - timedelta(hours=1)
+        )
+
+        self.client.post(self.url, self.roster(present=10))
+        self.client.post(self.url, self.roster(present=0))
+
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.status, EventModel.Status.FINISHED)
+        self.assertEqual(
+            self.event.participants_records.filter(status="PRESENT").count(), 10
+        )
+
+
+class CheckinTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.student = create_users(1)[0]
+        self.event = create_event(self.teacher)
+        self.participation = EventParticipantModel.objects.create(
+            event=self.event, user=self.student
+        )
+        now = timezone.now()
+        EventModel.objects.filter(id=self.event.id).update(
+            start_date=now - timedelta(minutes=10), end_date=now + timedelta(hours=2)
+        )
+        self.url = reverse("event_checkin", args=[checkin_token(self.participation)])
+
+    def post(self, url=None):
+        return self.client.post(url or self.url, HTTP_ACCEPT="application/json")
+
+    def checkin(self, user=None):
+        self.client.force_login(user or self.teacher)
+        return self.post().json()["result"]
+
+    def test_student_sees_qr_code_while_checkin_is_open(self):
+        self.client.force_login(self.student)
+        response = self.client.get(reverse("event_details", args=[self.event.id]))
+
+        self.assertContains(response, "data:image/svg+xml;base64,")
+
+    def test_checks_in_once_with_a_single_statement(self):
+        self.client.force_login(self.teacher)
+        # Sessão, usuário e o UPDATE do check-in
+        with self.assertNumQueries(3):
+            first = self.post().json()
+        second = self.checkin()
+
+        self.participation.refresh_from_db()
+        self.assertEqual(first["result"], CheckinResult.CHECKED_IN)
+        self.assertEqual(first["participant"], "Usuário 0")
+        self.assertEqual(second, CheckinResult.ALREADY_PRESENT)
+        self.assertEqual(
+            self.participation.status, EventParticipantModel.ParticipationStatus.PRESENT
+        )
+        self.assertIsNotNone(self.participation.attended_at)
+
+    def test_rejects_tampered_tokens_other_teachers_and_closed_window(self):
+        other = create_users(1, UserModel.Role.TEACHER, "other")[0]
+        self.client.force_login(self.teacher)
+        tampered = self.post(self.url[:-1] + ("B" if self.url[-1] == "A" else "A"))
+
+        self.assertEqual(tampered.status_code, 400)
+        self.assertEqual(self.checkin(other), CheckinResult.UNAVAILABLE)
+
+        EventModel.objects.filter(id=self.event.id).update(
+            status=EventModel.Status.CANCELED
+        )
+        self.assertEqual(self.checkin(), CheckinResult.UNAVAILABLE)
+
+    def test_get_only_asks_for_confirmation(self):
+        self.client.force_login(self.teacher)
+        # Apenas sessão e usuário: o token é conferido sem acessar o banco
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+
+        self.participation.refresh_from_db()
+        self.assertContains(response, "Confirmar presença")
+        self.assertEqual(
+            self.participation.status, EventParticipantModel.ParticipationStatus.PENDING
+        )
+
+        response = self.client.post(self.url)
+        self.assertContains(response, CheckinResult.CHECKED_IN.label)
+
+    def test_rejects_expired_tokens(self):
+        value = f"{self.event.id.hex}.{self.participation.id.hex}"
+        issued = int(time.time() - CHECKIN_TOKEN_MAX_AGE.total_seconds()) - 60
+        token = signing.Signer(salt=CHECKIN_SALT).sign(
+            f"{value}:{signing.b62_encode(issued)}"
+        )
+        url = reverse("event_checkin", args=[token])
+
+        self.client.force_login(self.teacher)
+        self.assertContains(self.client.get(url), CheckinResult.EXPIRED.label)
+        self.assertEqual(self.post(url).json()["result"], CheckinResult.EXPIRED)
+
+
+@override_settings(CERTIFICATES_ROOT=tempfile.mkdtemp(prefix="sinapse-bench-"))
+class ViewBenchmarkTest(TestCase):
+    """
+    Versão reduzida do `manage.py benchmark_views`: a contagem de consultas
+    é determinística, então nenhuma view pode passar da linha de base.
+    """
+
+    def test_views_stay_within_baseline_query_counts(self):
+        dataset = BenchmarkDataset(teachers=3, students=40, events=10, participants=15)
+        results = run_view_benchmarks(dataset, iterations=3, warmup=1)
+        baseline = load_baseline()
+
+        self.assertEqual(set(results), set(baseline))
+        for name, current in results.items():
+            with self.subTest(view=name):
+                self.assertLessEqual(current["queries"], baseline[name]["queries"])
+
+    def test_reports_query_and_latency_regressions(self):
+        baseline = {"events": {"p50": 5, "p95": 10, "queries": 2}}
+        results = {"events": {"p50": 9, "p95": 20, "queries": 3}}
+
+        regressions = compare_to_baseline(results, baseline, tolerance=1.5)
+
+        self.assertEqual(len(regressions), 2)
+        self.assertEqual(compare_to_baseline(baseline, baseline), [])
+
+
+class SeedDatasetTest(TestCase):
+    def test_seeds_consistent_dataset_and_purges_it(self):
+        call_command(
+            "seed_dataset",
+            users=300,
+            events=30,
+            participations=1500,
+            batch_size=200,
+            stdout=io.StringIO(),
+        )
+
+        seeded = EventModel.objects.filter(user__email__endswith=".sinapse.local")
+        self.assertEqual(seeded.count(), 30)
+        for event in seeded.annotate(enrolled=Count("participants_records")):
+            self.assertEqual(event.participants_count, event.enrolled)
+            if event.participants_limit is not None:
+                self.assertLessEqual(event.enrolled, event.participants_limit)
+        self.assertGreater(
+            EventParticipantModel.objects.filter(event__in=seeded).count(), 1000
+        )
+        # Nada criado no futuro: as janelas do ranking "em alta" ficam realistas
+        now = timezone.now()
+        self.assertFalse(seeded.filter(created_at__gt=now).exists())
+        self.assertFalse(
+            EventParticipantModel.objects.filter(
+                event__in=seeded, created_at__gt=now
+            ).exists()
+        )
+
+        call_command("seed_dataset", purge=True, stdout=io.StringIO())
+        self.assertFalse(
+            UserModel.objects.filter(email__endswith=".sinapse.local").exists()
+        )
+
+
+class SoftDeleteTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, prefix="teacher")[0]
+        self.students = create_users(25)
+        self.event = create_event(self.teacher)
+        for student in self.students:
+            enroll_user(self.event.id, student.id)
+
+    def test_cascades_to_participations_in_batches(self):
+        with self.assertNumQueries(10):
+            # evento, 5 lotes de inscrições + o lote vazio que encerra,
+            # 1 do arquivo, 1 da lista de espera e o ranking
+            self.event.soft_delete(batch_size=5)
+
+        self.assertFalse(EventModel.objects.filter(id=self.event.id).exists())
+        self.assertTrue(EventModel.all_objects.filter(id=self.event.id).exists())
+        self.assertEqual(
+            EventParticipantModel.all_objects.filter(
+                event=self.event, deleted=True, deleted_at__isnull=False
+            ).count(),
+            25,
+        )
+        self.assertFalse(EventRankingModel.objects.filter(event=self.event).exists())
+
+    def test_deleted_rows_are_hidden_from_default_managers(self):
+        self.event.soft_delete()
+
+        self.assertEqual(browse_events()[0], [])
+        self.assertEqual(self.students[0].event_participations.count(), 0)
+        with self.assertRaises(EventModel.DoesNotExist):
+            enroll_user(self.event.id, self.students[0].id)
+
+
+class ArchiveEventsTest(TestCase):
+    def setUp(self):
+        self.teacher = create_users(1, UserModel.Role.TEACHER, "teacher")[0]
+        self.students = create_users(4)
+        self.old_event = self.finished_event(days_ago=300)
+        self.recent_event = self.finished_event(days_ago=10)
+
+    def finished_event(self, days_ago):
+        event = create_event(self.teacher)
+        EventParticipantModel.objects.bulk_create(
+            EventParticipantModel(
+                event=event,
+                user=student,
+                status=EventParticipantModel.ParticipationStatus.PRESENT,
+            )
+            for student in self.students
+        )
+        end_date = timezone.now() - timedelta(days=days_ago)
+        EventModel.objects.filter(id=event.id).update(
+            status=EventModel.Status.FINISHED,
+            start_date=end_date - timedelta(hours=2),
+            end_date=end_date,
+        )
+        return event
+
+    def test_moves_old_participations_to_archive(self):
+        self.assertEqual(list(archive_events(months=6)), [(1, 4)])
+        self.assertEqual(list(archive_events(months=6)), [])
+
+        old_event = EventModel.objects.get(id=self.old_event.id)
+        self.assertIsNotNone(old_event.archived_at)
+        self.assertFalse(
+            EventParticipantModel.objects.filter(event=self.old_event).exists()
+        )
+        self.assertEqual(event_participations(old_event).count(), 4)
+        self.assertEqual(
+            EventParticipantModel.objects.filter(event=self.recent_event).count(), 4
+        )
+
+    def test_archived_participations_stay_readable(self):
+        list(archive_events(months=6))
+        event = EventModel.objects.with_effective_status().get(id=self.old_event.id)
+
+        self.assertIsNotNone(issue_certificate(event, self.students[0]))
+        self.assertEqual(len(list(roster_rows(event=event))), 4)
+        self.assertEqual(len(list(roster_rows(teacher=self.teacher))), 8)
+
+        self.client.force_login(self.students[1])
+        response = self.client.get(reverse("certificates"))
+        self.assertEqual(
+            {event.id for event in response.context["available_certificates"]},
+            {self.old_event.id, self.recent_event.id},
+        )
@@ -4,6 +4,9 @@ from apps.events import views
 
 urlpatterns = [
     path("", views.events, name="events_index"),
+    path("browse", views.browse, name="browse_events"),
+    path("browse/facets", views.browse_facets, name="browse_facets"),
+    path("search", views.search, name="search_events"),
     path("create", views.create_event, name="create_event"),
     path("<uuid:id>", views.event_details, name="event_details"),
     path("<uuid:id>/enroll", views.enroll_event, name="enroll_event"),
@@ -13,10 +16,31 @@ urlpatterns = [
     path("<uuid:id>/edit", views.edit_event, name="edit_event"),
     path("<uuid:id>/cancel", views.cancel_event, name="cancel_event"),
     path("<uuid:id>/attendance", views.event_attendance, name="event_attendance"),
+    path(
+        "<uuid:id>/attendance/export.<str:fmt>",
+        views.export_event_attendance,
+        name="export_event_attendance",
+    ),
+    path(
+        "attendance/export.<str:fmt>",
+        views.export_attendance,
+        name="export_attendance",
+    ),
     path("<uuid:id>/finish", views.finish_event, name="finish_event"),
     path("<uuid:id>/close", views.close_event, name="close_event"),
+    path("checkin/<str:token>", views.event_checkin, name="event_checkin"),
     path("certificates", views.certificates, name="certificates"),
     path(
         "<uuid:id>/certificate", views.generate_certificate, name="generate_certificate"
     ),
+    path(
+        "certificates/verify/<str:code>",
+        views.verify_certificate,
+        name="verify_certificate",
+    ),
+    path(
+        "<uuid:id>/certificates.zip",
+        views.download_event_certificates,
+        name="download_event_certificates",
+    ),
 ]
@@ -1,207 +1,228 @@
-from io import BytesIO
-
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.core import signing
 from django.core.exceptions import PermissionDenied  # ADICIONE ESTE IMPORT
-from django.db import models, transaction
 from django.http import (
+    Http404,
     HttpRequest,
     HttpResponse,
     HttpResponseForbidden,
     HttpResponseNotFound,
+    JsonResponse,
+    StreamingHttpResponse,
 )
 from django.shortcuts import get_object_or_404, redirect
 from django.template import loader
+from django.urls import reverse
 from django.utils import timezone
 from django.utils.text import slugify
 from django.utils.translation import gettext_lazy as _
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER
-from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
-from reportlab.lib.units import cm
-from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer
 
 from apps.authentication.decorators import student_only, teacher_only
 from apps.authentication.models import UserModel
-from apps.events.forms import EventForm
-from apps.events.models import EventModel, EventParticipantModel
+from apps.events.archive import event_participations
+from apps.events.attendance import mark_attendance, parse_attendance
+from apps.events.browse import browse_events, topic_facets
+from apps.events.cache import get_or_refresh, invalidate_events_cache
+from apps.events.certificates import (
+    certificate_filename,
+    ensure_event_certificates,
+    find_issued_certificate,
+    issue_certificate,
+    serve_certificate,
+    store_certificate,
+    stream_certificates_zip,
+)
+from apps.events.checkin import (
+    CheckinResult,
+    check_in,
+    checkin_open,
+    checkin_qr_code,
+    checkin_token,
+    read_checkin_token,
+)
+from apps.events.enrollment import (
+    EnrollmentResult,
+    enroll_user,
+    join_waitlist,
+    leave_waitlist,
+    promote_waitlist,
+    unenroll_user,
+    waitlist_position,
+)
+from apps.events.exports import EXPORT_FORMATS, roster_rows
+from apps.events.forms import EventBrowseForm, EventForm, EventSearchForm
+from apps.events.models import (
+    ArchivedParticipantModel,
+    EventModel,
+    EventParticipantModel,
+)
+from apps.events.rankings import top_events
+from apps.events.search import search_events
+from apps.events.status import auto_finish_event
 
 # =====================================================================
-# FUNÇÕES AUXILIARES
+# LISTAGEM DE EVENTOS
 # =====================================================================
 
 
-def auto_close_event(event_id: int) -> bool:
-    """
-    Fecha automaticamente um evento se:
-    1. O horário de início já passou
-    2. O evento está com status OPEN
-    3. O evento não está cancelado ou finalizado
-
-    Retorna True se o evento foi fechado, False caso contrário
-    """
-    try:
-        with transaction.atomic():
-            event = EventModel.objects.select_for_update().get(id=event_id)
-
-            if event.status != EventModel.Status.OPEN:
-                return False
-
-            if event.start_date > timezone.now():
-                return False
-
-            # Atualizar apenas o status, sem passar pelo formulário
-            EventModel.objects.filter(id=event_id).update(
-                status=EventModel.Status.CLOSED, updated_at=timezone.now()
-            )
-            return True
-
-    except EventModel.DoesNotExist:
-        return False
-    except Exception as e:
-        print(f"Erro ao fechar evento automaticamente {event_id}: {str(e)}")
-        return False
-
-
-def auto_finish_event(event_id: int) -> bool:
-    """
-    Finaliza automaticamente um evento se:
-    1. A data de término já passou
-    2. O evento não está cancelado
-    3. A lista de chamada foi feita (pelo menos um participante com status definido)
-
-    Retorna True se o evento foi finalizado, False caso contrário
-    """
-    try:
-        with transaction.atomic():
-            event = EventModel.objects.select_for_update().get(id=event_id)
-
-            if event.status in [EventModel.Status.FINISHED, EventModel.Status.CANCELED]:
-                return False
-
-            if event.end_date > timezone.now():
-                return False
+def _shared_sections():
+    queryset = EventModel.objects.with_effective_status().select_related("category")
+    upcoming = queryset.filter(start_date__gte=timezone.now())
 
-            # Verificar se há pelo menos um participante com status definido (lista de chamada feita)
-            has_attendance_records = event.participants_records.filter(
-                status__in=["PRESENT", "ABSENT"]
-            ).exists()
+    return {
+        "new": list(upcoming.order_by("-created_at")[:10]),
+        # Lidos do ranking materializado (apps.events.rankings)
+        "popular": top_events("total_enrollments"),
+        "trending": top_events("trending_score"),
+    }
 
-            if not has_attendance_records:
-                return False
 
-            # Atualizar apenas o status, sem passar pelo formulário
-            EventModel.objects.filter(id=event_id).update(
-                status=EventModel.Status.FINISHED, updated_at=timezone.now()
-            )
-            return True
+def _user_sections(user):
+    queryset = EventModel.objects.with_effective_status().select_related("category")
 
-    except EventModel.DoesNotExist:
-        return False
-    except Exception as e:
-        print(f"Erro ao finalizar evento automaticamente {event_id}: {str(e)}")
-        return False
+    if user.role == UserModel.Role.TEACHER:
+        return {
+            # A lista completa fica na navegação paginada (browse?mine=on)
+            "created": list(queryset.filter(user=user).order_by("-created_at")[:10]),
+            "enrolled": [],
+        }
 
+    if user.role == UserModel.Role.STUDENT:
+        return {
+            "created": [],
+            "enrolled": list(queryset.filter(participants=user).order_by("start_date")),
+        }
 
-def update_event_status(event: EventModel) -> EventModel:
-    """
-    Atualiza o status do evento automaticamente baseado nas datas atuais
-    Retorna o evento atualizado
-    """
-    now = timezone.now()
+    return {"created": [], "enrolled": []}
 
-    # Se o evento já está cancelado ou finalizado, não faz nada
-    if event.status in [EventModel.Status.CANCELED, EventModel.Status.FINISHED]:
-        return event
 
-    # Verificar se deve fechar automaticamente
-    if event.status == EventModel.Status.OPEN and event.start_date <= now:
-        was_closed = auto_close_event(event.id)
-        if was_closed:
-            event.refresh_from_db()
+def events(request: HttpRequest):
+    # As transições de status são aplicadas pelo agendador
+    # (manage.py run_status_scheduler); a listagem apenas lê o status.
+    user = request.user if request.user.is_authenticated else None
 
-    # Verificar se deve finalizar automaticamente
-    if event.status == EventModel.Status.CLOSED and event.end_date <= now:
-        was_finished = auto_finish_event(event.id)
-        if was_finished:
-            event.refresh_from_db()
+    # Seções iguais para todos os visitantes (inclusive anônimos)
+    shared = get_or_refresh("events:index:shared", _shared_sections)
+    new, popular, trending = shared["new"], shared["popular"], shared["trending"]
 
-    return event
+    created, enrolled = [], []
+    if user:
+        sections = get_or_refresh(
+            f"events:index:user:{user.id}", lambda: _user_sections(user)
+        )
+        created, enrolled = sections["created"], sections["enrolled"]
 
+    context = {
+        "new": new,
+        "popular": popular,
+        "trending": trending,
+        "created": created,
+        "enrolled": enrolled,
+        "user": user,
+    }
 
-def can_generate_certificates(event: EventModel) -> bool:
-    """
-    Verifica se o evento está em condições de gerar certificados
-    """
-    return (
-        event.status == EventModel.Status.FINISHED
-        and event.end_date <= timezone.now()
-        and event.participants_records.filter(status="PRESENT").exists()
-    )
+    template = loader.get_template("events/index.html")
+    return HttpResponse(template.render(context=context, request=request))
 
 
-def update_events_status_bulk():
-    """
-    Atualiza o status de todos os eventos que precisam ser atualizados
-    """
-    now = timezone.now()
+def _browse_filters(form, user):
+    filters = form.cleaned_data
+    mine = filters["mine"] and user and user.role == UserModel.Role.TEACHER
+
+    return {
+        "category": filters["category"],
+        "city": filters["city"],
+        "state": filters["state"],
+        "topics": filters["topic"],
+        "start_from": filters["start_from"],
+        "start_until": filters["start_until"],
+        # Sem data inicial, mostra apenas eventos futuros (exceto os meus)
+        "upcoming": not mine,
+        "status": filters["status"],
+        "user": user if mine else None,
+    }
 
-    # Eventos que devem ser fechados automaticamente
-    events_to_close = EventModel.objects.filter(
-        status=EventModel.Status.OPEN, start_date__lte=now
-    ).values_list("id", flat=True)
 
-    for event_id in events_to_close:
-        auto_close_event(event_id)
+def browse(request: HttpRequest):
+    user = request.user if request.user.is_authenticated else None
+    form = EventBrowseForm(request.GET)
 
-    # Eventos que devem ser finalizados automaticamente
-    events_to_finish = EventModel.objects.filter(
-        status=EventModel.Status.CLOSED, end_date__lte=now
-    ).values_list("id", flat=True)
+    events, next_cursor, facets = [], None, []
+    if form.is_valid():
+        filters = _browse_filters(form, user)
+        events, next_cursor = browse_events(
+            cursor=form.cleaned_data["cursor"], **filters
+        )
 
-    for event_id in events_to_finish:
-        auto_finish_event(event_id)
+        # Cada faceta alterna o tópico no filtro atual (sem o cursor)
+        selected = filters["topics"]
+        for topic, count in topic_facets(**filters):
+            params = request.GET.copy()
+            params.pop("cursor", None)
+            params.setlist(
+                "topic",
+                (
+                    [t for t in selected if t != topic]
+                    if topic in selected
+                    else [*selected, topic]
+                ),
+            )
+            facets.append(
+                {
+                    "topic": topic,
+                    "count": count,
+                    "selected": topic in selected,
+                    "query": params.urlencode(),
+                }
+            )
 
+    next_query = None
+    if next_cursor:
+        params = request.GET.copy()
+        params["cursor"] = next_cursor
+        next_query = params.urlencode()
 
-# =====================================================================
-# LISTAGEM DE EVENTOS
-# =====================================================================
+    context = {
+        "form": form,
+        "events": events,
+        "facets": facets,
+        "next_query": next_query,
+        "user": user,
+    }
 
+    template = loader.get_template("events/browse.html")
+    return HttpResponse(template.render(context=context, request=request))
 
-def events(request: HttpRequest):
-    # Atualizar status de eventos em lote antes de listar
-    update_events_status_bulk()
 
+def browse_facets(request: HttpRequest):
     user = request.user if request.user.is_authenticated else None
+    form = EventBrowseForm(request.GET)
 
-    new = EventModel.objects.filter(start_date__gte=timezone.now()).order_by(
-        "-created_at"
-    )[:10]
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
 
-    popular = (
-        EventModel.objects.filter(start_date__gte=timezone.now())
-        .annotate(participants_count=models.Count("participants"))
-        .order_by("-participants_count")[:10]
+    facets = topic_facets(**_browse_filters(form, user))
+    return JsonResponse(
+        {"topics": [{"topic": topic, "count": count} for topic, count in facets]}
     )
 
-    created = EventModel.objects.none()
-    if user and getattr(user, "role", None) == UserModel.Role.TEACHER:
-        created = EventModel.objects.filter(user=user).order_by("-created_at")
 
-    enrolled = EventModel.objects.none()
-    if user and getattr(user, "role", None) == UserModel.Role.STUDENT:
-        enrolled = EventModel.objects.filter(participants=user).order_by("start_date")
+def search(request: HttpRequest):
+    form = EventSearchForm(request.GET)
+
+    page = None
+    if form.is_valid() and form.cleaned_data["q"]:
+        page = search_events(form.cleaned_data["q"], form.cleaned_data["page"] or 1)
 
     context = {
-        "new": new,
-        "popular": popular,
-        "created": created,
-        "enrolled": enrolled,
-        "user": user,
+        "form": form,
+        "page": page,
+        "query": form.cleaned_data.get("q", "") if form.is_valid() else "",
+        "user": request.user if request.user.is_authenticated else None,
     }
 
-    template = loader.get_template("events/index.html")
+    template = loader.get_template("events/search.html")
     return HttpResponse(template.render(context=context, request=request))
 
 
@@ -241,16 +262,39 @@ def create_event(request):
 
 
 def event_details(request, id):
-    event = EventModel.objects.filter(id=id).first()
+    event = EventModel.objects.with_effective_status().filter(id=id).first()
 
     if not event:
         return HttpResponseNotFound()
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
-
     context = {"event": event}
 
+    if request.user.is_authenticated and request.user.is_student:
+        participation = (
+            event_participations(event)
+            .filter(user=request.user)
+            .only("id", "event_id", "user_id", "status")
+            .first()
+        )
+        is_enrolled = participation is not None
+        context["participation"] = participation
+        context["is_enrolled"] = is_enrolled
+        context["waitlist_position"] = (
+            None if is_enrolled else waitlist_position(event.id, request.user.id)
+        )
+
+        # QR code apresentado na entrada para o professor confirmar a presença
+        if (
+            is_enrolled
+            and participation.status
+            != EventParticipantModel.ParticipationStatus.PRESENT
+            and checkin_open(event)
+        ):
+            checkin_url = request.build_absolute_uri(
+                reverse("event_checkin", args=[checkin_token(participation)])
+            )
+            context["checkin_qr_code"] = checkin_qr_code(checkin_url)
+
     template = loader.get_template("events/event_details.html")
     return HttpResponse(template.render(context=context, request=request))
 
@@ -258,27 +302,34 @@ def event_details(request, id):
 @login_required(login_url="landing_page")
 @student_only
 def enroll_event(request, id):
-    event = EventModel.objects.filter(id=id).first()
-
-    if not event:
+    try:
+        result = enroll_user(id, request.user.id)
+    except EventModel.DoesNotExist:
         return HttpResponseNotFound()
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
-
-    if event.status != EventModel.Status.OPEN:
+    if result == EnrollmentResult.CLOSED:
         messages.error(request, _("Este evento não está aceitando inscrições."))
-        return redirect("event_details", id=id)
+    elif result == EnrollmentResult.FULL:
+        position = join_waitlist(id, request.user.id)
+        # Uma vaga pode ter sido liberada entre a tentativa e a entrada na fila
+        promote_waitlist(id)
 
-    if event.is_full:
-        messages.error(request, _("Este evento está lotado."))
-        return redirect("event_details", id=id)
-
-    if request.user in event.participants.all():
+        if waitlist_position(id, request.user.id) is None:
+            messages.success(request, _("Inscrição realizada com sucesso!"))
+        else:
+            messages.info(
+                request,
+                _(
+                    "Este evento está lotado. Você entrou na lista de espera "
+                    "na posição %(position)s e será inscrito automaticamente "
+                    "quando uma vaga for liberada."
+                )
+                % {"position": position},
+            )
+    elif result == EnrollmentResult.ALREADY_ENROLLED:
         messages.info(request, _("Você já está inscrito neste evento."))
-
-    event.participants.add(request.user)
-    messages.success(request, _("Inscrição realizada com sucesso!"))
+    else:
+        messages.success(request, _("Inscrição realizada com sucesso!"))
 
     return redirect("event_details", id=id)
 
@@ -291,10 +342,15 @@ def cancel_enrollment(request, id):
     if not event:
         return HttpResponseNotFound()
 
-    if request.user not in event.participants.all():
-        messages.error(request, _("Você não estava inscrito neste evento."))
+    if not unenroll_user(event.id, request.user.id):
+        if leave_waitlist(event.id, request.user.id):
+            messages.success(request, _("Você saiu da lista de espera."))
+        else:
+            messages.error(request, _("Você não estava inscrito neste evento."))
+        return redirect("event_details", id=id)
 
-    event.participants.remove(request.user)
+    # A vaga liberada vai para o primeiro da lista de espera
+    promote_waitlist(event.id)
     messages.success(request, _("Inscrição cancelada com sucesso."))
 
     return redirect("event_details", id=id)
@@ -303,7 +359,7 @@ def cancel_enrollment(request, id):
 @login_required(login_url="landing_page")
 @teacher_only
 def edit_event(request: HttpRequest, id: int):
-    event = EventModel.objects.filter(id=id).first()
+    event = EventModel.objects.with_effective_status().filter(id=id).first()
 
     if not event:
         return HttpResponseNotFound()
@@ -311,8 +367,7 @@ def edit_event(request: HttpRequest, id: int):
     if request.user != event.user:
         raise PermissionDenied("Você não tem permissão para editar este evento.")
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
+    previous_limit = event.participants_limit
 
     if request.method == "POST":
         form = EventForm(request.POST, instance=event)
@@ -342,18 +397,23 @@ def edit_event(request: HttpRequest, id: int):
 
                 if (
                     updated.participants_limit is not None
-                    and updated.participants_limit < event.participants.count()
+                    and updated.participants_limit < event.participants_count
                 ):
                     messages.error(
                         request,
                         f"Não é possível definir o limite para {updated.participants_limit} "
-                        f"porque o evento já tem {event.participants.count()} participantes.",
+                        f"porque o evento já tem {event.participants_count} participantes.",
                     )
                     context = {"form": form, "event": event, "now": timezone.now()}
                     template = loader.get_template("events/edit_event.html")
                     return HttpResponse(template.render(context, request))
 
                 updated.save()
+
+                # Aumento (ou remoção) do limite promove a lista de espera
+                if updated.participants_limit != previous_limit:
+                    promote_waitlist(updated.id)
+
                 messages.success(request, "Evento atualizado com sucesso!")
                 return redirect("event_details", id=updated.id)
 
@@ -372,7 +432,7 @@ def edit_event(request: HttpRequest, id: int):
 @login_required(login_url="landing_page")
 @teacher_only
 def close_event(request, id):
-    event = EventModel.objects.filter(id=id).first()
+    event = EventModel.objects.with_effective_status().filter(id=id).first()
 
     if not event:
         return HttpResponseNotFound()
@@ -382,9 +442,6 @@ def close_event(request, id):
             "Você não tem permissão para fechar as inscrições deste evento."
         )
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
-
     if event.status == EventModel.Status.CLOSED:
         messages.warning(request, "As inscrições deste evento já estão fechadas.")
         return redirect("event_details", id=id)
@@ -401,6 +458,7 @@ def close_event(request, id):
         EventModel.objects.filter(id=id).update(
             status=EventModel.Status.CLOSED, updated_at=timezone.now()
         )
+        invalidate_events_cache()
 
         messages.success(
             request,
@@ -416,7 +474,7 @@ def close_event(request, id):
 @login_required(login_url="landing_page")
 @teacher_only
 def cancel_event(request, id):
-    event = EventModel.objects.filter(id=id).first()
+    event = EventModel.objects.with_effective_status().filter(id=id).first()
 
     if not event:
         return HttpResponseNotFound()
@@ -424,9 +482,6 @@ def cancel_event(request, id):
     if request.user != event.user:
         raise PermissionDenied("Você não tem permissão para cancelar este evento.")
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
-
     if request.method == "POST":
         try:
             if event.status == EventModel.Status.CANCELED:
@@ -437,6 +492,7 @@ def cancel_event(request, id):
             EventModel.objects.filter(id=id).update(
                 status=EventModel.Status.CANCELED, updated_at=timezone.now()
             )
+            invalidate_events_cache()
 
             messages.success(request, "Evento cancelado com sucesso!")
             return redirect("event_details", id=id)
@@ -458,49 +514,50 @@ def cancel_event(request, id):
 @login_required(login_url="landing_page")
 @teacher_only
 def event_attendance(request: HttpRequest, id):
-    event = EventModel.objects.filter(id=id).first()
+    event = EventModel.objects.with_effective_status().filter(id=id).first()
 
     if not event:
         return HttpResponseNotFound("Não foi possível localizar o evento")
 
-    if request.user != event.user:
+    if request.user.id != event.user_id:
         raise PermissionDenied(
             "Você não tem permissão para acessar a lista de chamada deste evento."
         )
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
-
     if request.method == "POST":
-        participant_id = request.POST.get("participant_id")
-        status = request.POST.get("status")
+        if event.status == EventModel.Status.FINISHED:
+            messages.error(request, "Lista de chamada bloqueada - evento finalizado.")
+            return redirect("event_attendance", id=id)
 
-        if participant_id and status in ["PRESENT", "ABSENT"]:
-            try:
-                record = event.participants_records.get(id=participant_id)
-                record.status = status
-                record.save()
-                messages.success(
-                    request, f"Status de {record.user.get_full_name()} atualizado."
-                )
+        # A chamada inteira chega em um único envio
+        statuses = parse_attendance(request.POST)
+        try:
+            changed = mark_attendance(event, statuses)
+            noun = "alteração" if changed == 1 else "alterações"
+            messages.success(request, f"Lista de chamada salva ({changed} {noun}).")
 
-                # Verificar se pode finalizar após marcar presença
-                if (
-                    event.end_date <= timezone.now()
-                    and event.status != EventModel.Status.FINISHED
-                ):
-                    auto_finish_event(event.id)
-                    event.refresh_from_db()
+            # Verificar uma única vez se pode finalizar após a chamada
+            # (o status lido já é o efetivo; aqui persistimos a finalização)
+            if changed and event.end_date <= timezone.now():
+                auto_finish_event(event.id)
 
-            except Exception:
-                messages.error(request, "Erro ao atualizar.")
+        except Exception:
+            messages.error(request, "Erro ao atualizar.")
 
         return redirect("event_attendance", id=id)
 
-    participants = event.participants_records.all()
+    # A lista inteira é exibida, então as contagens saem dela mesma
+    participants = list(
+        event_participations(event)
+        .select_related("user")
+        .order_by("user__first_name", "user__last_name")
+    )
 
-    present_count = participants.filter(status="PRESENT").count()
-    total_count = participants.count()
+    present_count = sum(
+        record.status == EventParticipantModel.ParticipationStatus.PRESENT
+        for record in participants
+    )
+    total_count = len(participants)
 
     context = {
         "event": event,
@@ -516,14 +573,11 @@ def event_attendance(request: HttpRequest, id):
 @login_required(login_url="landing_page")
 @teacher_only
 def finish_event(request: HttpRequest, id: int):
-    event = get_object_or_404(EventModel, id=id)
+    event = get_object_or_404(EventModel.objects.with_effective_status(), id=id)
 
     if request.user != event.user:
         raise PermissionDenied("Você não tem permissão para finalizar este evento.")
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
-
     if event.status == EventModel.Status.FINISHED:
         messages.info(request, "Este evento já está finalizado.")
         return redirect("event_details", id=id)
@@ -534,6 +588,7 @@ def finish_event(request: HttpRequest, id: int):
             EventModel.objects.filter(id=event.id).update(
                 status=EventModel.Status.FINISHED, updated_at=timezone.now()
             )
+            invalidate_events_cache()
 
             messages.success(
                 request, "Evento finalizado com sucesso! As edições foram bloqueadas."
@@ -549,268 +604,168 @@ def finish_event(request: HttpRequest, id: int):
     return HttpResponse(template.render(context, request=request))
 
 
-# =====================================================================
-# NOVA FUNÇÃO — CERTIFICADO VIA PLATYPUS/REPORTLAB (PDF-native)
-# =====================================================================
+def _roster_response(rows, fmt, filename):
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Formato de exportação não suportado")
+
+    stream, content_type = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(stream(rows), content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}.{fmt}"'
+    return response
 
 
 @login_required(login_url="landing_page")
-@student_only
-def generate_certificate(request, id):
+@teacher_only
+def export_event_attendance(request: HttpRequest, id, fmt):
     """
-    Gera um PDF de certificado estilizado usando ReportLab Platypus.
-    Design inspirado no template HTML original, mas desenhado com flowables
-    — roda em Windows/Linux sem dependências externas além do ReportLab.
+    Lista de chamada do evento em CSV ou XLSX, transmitida linha a linha
     """
-    event = get_object_or_404(EventModel, id=id)
+    event = get_object_or_404(
+        EventModel.objects.only("id", "name", "user_id", "archived_at"), id=id
+    )
 
-    # Atualizar status do evento automaticamente
-    event = update_event_status(event)
+    if request.user.id != event.user_id:
+        raise PermissionDenied(
+            "Você não tem permissão para exportar a lista de chamada deste evento."
+        )
 
-    participation = EventParticipantModel.objects.filter(
-        event=event, user=request.user
-    ).first()
+    return _roster_response(
+        roster_rows(event=event), fmt, f"lista_de_chamada_{slugify(event.name)}"
+    )
 
-    if (
-        not participation
-        or participation.status != EventParticipantModel.ParticipationStatus.PRESENT
-    ):
-        messages.error(
-            request,
-            "Você não esteve presente neste evento ou não tem permissão para gerar o certificado.",
-        )
-        return redirect("event_details", id=id)
 
-    # tentar finalizar automaticamente se aplicável
-    if event.status != EventModel.Status.FINISHED:
-        was_finished = auto_finish_event(event.id)
-        if not was_finished:
-            messages.error(
-                request,
-                "O certificado estará disponível após a finalização do evento e confirmação de presença.",
-            )
-            return redirect("event_details", id=id)
-        else:
-            event.refresh_from_db()
+@login_required(login_url="landing_page")
+@teacher_only
+def export_attendance(request: HttpRequest, fmt):
+    """
+    Participantes de todos os eventos do professor em um único arquivo
+    """
+    return _roster_response(
+        roster_rows(teacher=request.user), fmt, "lista_de_chamada_eventos"
+    )
 
-    try:
-        buffer = BytesIO()
-
-        doc = SimpleDocTemplate(
-            buffer,
-            pagesize=landscape(A4),
-            leftMargin=2 * cm,
-            rightMargin=2 * cm,
-            topMargin=2 * cm,
-            bottomMargin=2 * cm,
-            title=f"Certificado - {event.name}",
-        )
 
-        # Styles
-        base_styles = getSampleStyleSheet()
-        title_style = ParagraphStyle(
-            "certificate_title",
-            parent=base_styles["Title"],
-            fontName="Helvetica-Bold",
-            fontSize=28,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor("#4F46E5"),
-            spaceAfter=12,
-        )
+@login_required(login_url="landing_page")
+@teacher_only
+def event_checkin(request: HttpRequest, token):
+    """
+    Destino do QR code do participante, lido pelo professor na entrada.
+    GET apenas confere a assinatura e a validade do token, sem acessar o
+    banco, e pede a confirmação; o POST grava a presença com um único
+    UPDATE condicional. Leitores que fazem vários check-ins seguidos pedem
+    a resposta do POST em JSON.
+    """
+    if request.method == "POST":
+        result, participant_name = check_in(token, request.user.id)
 
-        normal_center = ParagraphStyle(
-            "normal_center",
-            parent=base_styles["BodyText"],
-            fontName="Helvetica",
-            fontSize=16,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor("#374151"),
-            leading=22,
-        )
+        if not request.accepts("text/html"):
+            return JsonResponse(
+                {"result": result, "participant": participant_name},
+                status=400 if result == CheckinResult.INVALID else 200,
+            )
 
-        participant_style = ParagraphStyle(
-            "participant",
-            parent=base_styles["Heading1"],
-            fontName="Helvetica-Bold",
-            fontSize=34,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor("#4F46E5"),
-            leading=36,
-            spaceAfter=6,
-        )
+        context = {
+            "result": CheckinResult(result),
+            "participant_name": participant_name,
+        }
+    else:
+        try:
+            read_checkin_token(token)
+            context = {"token": token}
+        except signing.SignatureExpired:
+            context = {"result": CheckinResult.EXPIRED}
+        except signing.BadSignature:
+            context = {"result": CheckinResult.INVALID}
+
+    template = loader.get_template("events/checkin.html")
+    return HttpResponse(template.render(context, request=request))
 
-        event_style = ParagraphStyle(
-            "event",
-            parent=base_styles["Heading2"],
-            fontName="Helvetica-Bold",
-            fontSize=24,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor("#8B5CF6"),
-            leading=28,
-            spaceAfter=6,
-        )
 
-        details_style = ParagraphStyle(
-            "details",
-            parent=base_styles["BodyText"],
-            fontName="Helvetica",
-            fontSize=14,
-            alignment=TA_CENTER,
-            textColor=colors.HexColor("#4B5563"),
-            leading=20,
-            spaceAfter=6,
-        )
+# =====================================================================
+# CERTIFICADO EM PDF
+# =====================================================================
 
-        # Story setup
-        story = []
-
-        # Header / Title
-        story.append(Spacer(1, 1 * cm))
-        story.append(Paragraph("CERTIFICADO DE PARTICIPAÇÃO", title_style))
-        story.append(Spacer(1, 0.4 * cm))
-
-        story.append(Paragraph("Certificamos que", normal_center))
-        story.append(Spacer(1, 0.2 * cm))
-
-        participant_name = f"{request.user.first_name} {request.user.last_name}"
-        story.append(Paragraph(participant_name, participant_style))
-        story.append(Spacer(1, 0.2 * cm))
-
-        story.append(Paragraph("participou com sucesso do evento", normal_center))
-        story.append(Spacer(1, 0.4 * cm))
-
-        story.append(Paragraph(event.name, event_style))
-        story.append(Spacer(1, 0.3 * cm))
-
-        # Calcular carga horária (diferença entre start_date e end_date)
-        if event.start_date and event.end_date:
-            # Calcular diferença em horas
-            time_difference = event.end_date - event.start_date
-            total_hours = time_difference.total_seconds() / 3600
-            # Arredondar para 1 casa decimal
-            duration_hours = round(total_hours, 1)
-
-            # Formatar datas para exibição
-            start_date_str = event.start_date.strftime("%d/%m/%Y %H:%M")
-            end_date_str = event.end_date.strftime("%d/%m/%Y %H:%M")
-
-            # Verificar se é no mesmo dia
-            if event.start_date.date() == event.end_date.date():
-                date_range_str = f"<b>{event.start_date.strftime('%d/%m/%Y')}</b><br/>"
-                time_range_str = f"Das <b>{event.start_date.strftime('%H:%M')}</b> às <b>{event.end_date.strftime('%H:%M')}</b>"
-            else:
-                date_range_str = (
-                    f"De <b>{event.start_date.strftime('%d/%m/%Y %H:%M')}</b><br/>"
-                )
-                time_range_str = (
-                    f"Até <b>{event.end_date.strftime('%d/%m/%Y %H:%M')}</b>"
-                )
-        else:
-            duration_hours = 0
-            date_range_str = "Data não especificada"
-            time_range_str = ""
-
-        # Event details block
-        details_html = (
-            f"Realizado em <b>{event.city}, {event.state} - {event.country}</b><br/>"
-            f"{date_range_str}"
-            f"{time_range_str}<br/>"
-            f"Carga horária total de <b>{duration_hours} horas</b>"
-        )
-        story.append(Paragraph(details_html, details_style))
-        story.append(Spacer(1, 1.2 * cm))
 
-        # Data de emissão
-        emission_date = timezone.now().strftime("%d/%m/%Y")
-        emission_text = (
-            f"Emitido digitalmente em {emission_date} através da plataforma Sinapse"
-        )
-        story.append(
-            Paragraph(
-                emission_text,
-                ParagraphStyle(
-                    "emission",
-                    parent=base_styles["BodyText"],
-                    fontName="Helvetica-Oblique",
-                    fontSize=12,
-                    alignment=TA_CENTER,
-                    textColor=colors.HexColor("#6B7280"),
-                    leading=16,
-                ),
-            )
-        )
-        story.append(Spacer(1, 0.6 * cm))
+@login_required(login_url="landing_page")
+@student_only
+def generate_certificate(request, id):
+    """
+    Entrega o certificado em PDF do participante presente
+    (renderização em apps.events.certificates).
+    """
+    event = get_object_or_404(EventModel.objects.with_effective_status(), id=id)
 
-        # ID do certificado
-        cert_id = (
-            f"SNSP-{timezone.now().strftime('%Y%m%d')}-"
-            f"{(request.user.first_name[:1] or '').upper()}{(request.user.last_name[:1] or '').upper()}-"
-            f"{(event.name[:3] or '').upper()}"
-        )
-        cert_para = Paragraph(
-            cert_id,
-            ParagraphStyle(
-                "cert_id",
-                parent=base_styles["BodyText"],
-                fontName="Helvetica",
-                fontSize=9,
-                alignment=TA_CENTER,
-                textColor=colors.HexColor("#9CA3AF"),
-            ),
+    # Presença e finalização do evento só são verificadas na primeira
+    # emissão; os downloads seguintes partem do certificado registrado
+    issued = issue_certificate(event, request.user)
+    if issued is None:
+        messages.error(
+            request,
+            "O certificado estará disponível após a finalização do evento e confirmação de presença.",
         )
-        story.append(cert_para)
+        return redirect("event_details", id=id)
 
-        def draw_background(canvas_obj, doc_obj):
-            w, h = landscape(A4)
-            canvas_obj.saveState()
+    try:
+        # Gerado uma única vez por conteúdo; os downloads seguintes apenas
+        # entregam o arquivo gravado
+        path, digest = store_certificate(event, request.user, issued)
 
-            # Background fill
-            canvas_obj.setFillColor(colors.HexColor("#F3F4F6"))
-            canvas_obj.rect(0, 0, w, h, stroke=0, fill=1)
+        filename = certificate_filename(event, request.user)
+        return serve_certificate(request, path, digest, filename)
 
-            # Outer decorative border
-            canvas_obj.setStrokeColor(colors.HexColor("#4F46E5"))
-            canvas_obj.setLineWidth(10)
-            canvas_obj.rect(20, 20, w - 40, h - 40, stroke=1, fill=0)
+    except Exception as e:
+        print(f"Erro ao gerar certificado: {e}")
+        messages.error(request, "Ocorreu um erro ao gerar o certificado.")
+        return redirect("event_details", id=id)
 
-            # Inner subtle border
-            canvas_obj.setStrokeColor(colors.Color(0.545, 0.361, 0.961, alpha=0.18))
-            canvas_obj.setLineWidth(2)
-            canvas_obj.rect(36, 36, w - 72, h - 72, stroke=1, fill=0)
 
-            # Central watermark "SINAPSE"
-            watermark_color = colors.Color(79 / 255, 70 / 255, 229 / 255, alpha=0.06)
-            canvas_obj.setFillColor(watermark_color)
-            canvas_obj.setFont("Helvetica-Bold", 120)
+@login_required(login_url="landing_page")
+@teacher_only
+def download_event_certificates(request, id):
+    """
+    ZIP com os certificados de todos os presentes, gerando os que ainda não
+    existem e transmitindo o arquivo à medida que é montado.
+    """
+    event = get_object_or_404(EventModel.objects.with_effective_status(), id=id)
 
-            canvas_obj.saveState()
-            canvas_obj.translate(w / 2.0, h / 2.0)
-            canvas_obj.rotate(-25)
-            canvas_obj.drawCentredString(0, 0, "SINAPSE")
-            canvas_obj.restoreState()
+    if request.user != event.user:
+        raise PermissionDenied("Você não tem permissão para baixar estes certificados.")
 
-            # Footer ID
-            canvas_obj.setFillColor(colors.HexColor("#D1D5DB"))
-            canvas_obj.setFont("Helvetica", 9)
-            canvas_obj.drawRightString(w - 30, 25, f"Certificado ID: {cert_id}")
+    if event.status != EventModel.Status.FINISHED:
+        messages.error(
+            request, "Os certificados estarão disponíveis após a finalização do evento."
+        )
+        return redirect("event_details", id=id)
 
-            canvas_obj.restoreState()
+    certificates = ensure_event_certificates(event)
+    if not certificates:
+        messages.info(request, "Nenhum participante presente neste evento.")
+        return redirect("event_details", id=id)
 
-        # Build PDF
-        doc.build(story, onFirstPage=draw_background, onLaterPages=draw_background)
+    response = StreamingHttpResponse(
+        stream_certificates_zip(
+            (certificate_filename(event, user), path) for user, path in certificates
+        ),
+        content_type="application/zip",
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="certificados_{slugify(event.name)}.zip"'
+    )
+    return response
 
-        pdf_value = buffer.getvalue()
-        buffer.close()
 
-        filename = f"certificado_{slugify(event.name)}_{slugify(request.user.first_name)}_{slugify(request.user.last_name)}.pdf"
-        response = HttpResponse(pdf_value, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="{filename}"'
-        return response
+def verify_certificate(request, code):
+    """
+    Verificação pública, sem login, pelo código impresso no certificado
+    """
+    certificate = find_issued_certificate(code)
 
-    except Exception as e:
-        print(f"Erro ao gerar certificado: {e}")
-        messages.error(request, "Ocorreu um erro ao gerar o certificado.")
-        return redirect("event_details", id=id)
+    context = {"certificate": certificate, "code": code}
+    template = loader.get_template("certificates/verify.html")
+    return HttpResponse(
+        template.render(context, request=request),
+        status=200 if certificate else 404,
+    )
 
 
 # =====================================================================
@@ -821,19 +776,25 @@ def generate_certificate(request, id):
 @login_required(login_url="landing_page")
 @student_only
 def certificates(request):
-    user_participations = EventParticipantModel.objects.filter(
-        user=request.user
-    ).select_related("event")
-
-    for participation in user_participations:
-        event = participation.event
-        update_event_status(event)
-
-    available_certificates = EventParticipantModel.objects.filter(
-        user=request.user,
-        status=EventParticipantModel.ParticipationStatus.PRESENT,
-        event__status=EventModel.Status.FINISHED,
-    ).select_related("event")
+    present = EventParticipantModel.ParticipationStatus.PRESENT
+
+    # Presenças na tabela quente e no arquivo (eventos antigos) em uma única
+    # consulta; o status efetivo do evento é calculado no próprio SQL
+    attended = (
+        EventParticipantModel.objects.filter(user=request.user, status=present)
+        .values("event_id")
+        .union(
+            ArchivedParticipantModel.objects.filter(
+                user=request.user, status=present
+            ).values("event_id")
+        )
+    )
+    available_certificates = (
+        EventModel.objects.with_effective_status()
+        .filter(id__in=attended, effective_status=EventModel.Status.FINISHED)
+        .select_related("user")
+        .order_by("-start_date")
+    )
 
     context = {"available_certificates": available_certificates}
 
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 from django.utils.translation import gettext_lazy as _
@@ -38,6 +39,8 @@ LOGIN_REDIRECT_URL = "/"
 LOGOUT_REDIRECT_URL = "/"
 
 MIDDLEWARE = [
+    "apps.core.middleware.RequestMetricsMiddleware",
+    "apps.core.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -69,14 +72,114 @@ WSGI_APPLICATION = "config.wsgi.application"
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.postgresql",
-        "NAME": "sinapse",
-        "USER": "postgres",
-        "PASSWORD": "postgres",
-        "HOST": "localhost",
-        "PORT": "5432",
+        "NAME": os.environ.get("DATABASE_NAME", "sinapse"),
+        "USER": os.environ.get("DATABASE_USER", "postgres"),
+        "PASSWORD": os.environ.get("DATABASE_PASSWORD", "postgres"),
+        "HOST": os.environ.get("DATABASE_HOST", "localhost"),
+        "PORT": os.environ.get("DATABASE_PORT", "5432"),
+        # Conexões reaproveitadas são testadas antes do uso
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
+# Pool de conexões do psycopg 3, um por processo e compartilhado entre as
+# threads: as requisições reaproveitam conexões já abertas, cada uma é
+# verificada ao sair do pool (CONN_HEALTH_CHECKS) e reciclada após
+# DATABASE_POOL_MAX_LIFETIME segundos. Acima de DATABASE_POOL_MAX_SIZE, a
+# requisição espera até DATABASE_POOL_TIMEOUT segundos por uma conexão livre.
+# Com DATABASE_POOL=0, volta às conexões persistentes por thread
+# (DATABASE_CONN_MAX_AGE segundos; 0 abre uma conexão por requisição).
+DATABASE_CONN_MAX_AGE = int(os.environ.get("DATABASE_CONN_MAX_AGE", "60"))
+
+if os.environ.get("DATABASE_POOL", "1") == "1":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.environ.get("DATABASE_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.environ.get("DATABASE_POOL_TIMEOUT", "10")),
+            "max_lifetime": float(os.environ.get("DATABASE_POOL_MAX_LIFETIME", "1800")),
+            "max_idle": float(os.environ.get("DATABASE_POOL_MAX_IDLE", "300")),
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = DATABASE_CONN_MAX_AGE
+
+# Réplicas de leitura (apps.core.routers), em DATABASE_REPLICA_HOSTS como
+# "host:porta" separados por vírgula (o host pode ser o diretório do socket).
+# Cada uma vira o alias replica_N com as demais configurações do primário,
+# menos o pool: as réplicas usam conexões persistentes por thread, porque
+# nos testes elas espelham o banco de teste do primário e um pool próprio
+# manteria conexões abertas nele, impedindo sua remoção ao final.
+DATABASE_REPLICAS = []
+for index, address in enumerate(
+    filter(None, os.environ.get("DATABASE_REPLICA_HOSTS", "").split(",")), start=1
+):
+    host, _sep, port = address.strip().partition(":")
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "OPTIONS": {
+            key: value
+            for key, value in DATABASES["default"].get("OPTIONS", {}).items()
+            if key != "pool"
+        },
+        "CONN_MAX_AGE": DATABASE_CONN_MAX_AGE,
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+DATABASE_ROUTERS = ["apps.core.routers.ReplicaRouter"]
+
+# Views somente leitura servidas pelas réplicas (nomes das URLs)
+REPLICA_READ_VIEWS = {
+    "events_index",
+    "browse_events",
+    "browse_facets",
+    "search_events",
+    "event_details",
+    "certificates",
+    "verify_certificate",
+}
+
+# Segundos em que o cliente lê do primário depois de uma escrita
+REPLICA_STICKY_SECONDS = 15
+
+# Em produção com vários workers/nós, use um backend compartilhado
+# (Redis/Memcached) para que a versão e as travas de recálculo sejam globais.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "sinapse",
+    }
+}
+
+# Listagem de eventos: segundos em que uma entrada é considerada fresca e
+# por quanto tempo ela ainda pode ser servida (obsoleta) durante o recálculo.
+EVENTS_CACHE_TTL = 60
+EVENTS_CACHE_STALE_TTL = 600
+
+# PDFs de certificado gerados (apps.events.certificates). Com
+# CERTIFICATES_ACCEL_PREFIX definido (ex.: "/protected/certificates/"), o
+# download é entregue pelo nginx via X-Accel-Redirect a partir de um
+# location `internal` que aponta para CERTIFICATES_ROOT.
+CERTIFICATES_ROOT = BASE_DIR / "media" / "certificates"
+CERTIFICATES_ACCEL_PREFIX = None
+
+# Instrumentação por requisição (apps.core.middleware): acima deste número
+# de consultas em uma única requisição, a view é registrada no log.
+REQUEST_METRICS_QUERY_BUDGET = 30
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "apps": {"handlers": ["console"], "level": "INFO"},
+    },
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         "NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator",
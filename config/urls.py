@@ -2,6 +2,8 @@ from django.contrib import admin
 from django.shortcuts import render
 from django.urls import include, path
 
+from apps.core.views import request_metrics
+
 
 def custom_403_view(request, exception):
     return render(request, "403.html", status=403)
@@ -15,4 +17,5 @@ urlpatterns = [
     path("", include("apps.authentication.urls")),
     path("admin/", admin.site.urls),
     path("events/", include("apps.events.urls")),
+    path("metrics", request_metrics, name="request_metrics"),
 ]